@@ -1,25 +1,53 @@
 import os
-import urllib
+import threading
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sshtunnel import SSHTunnelForwarder
-from database.models import Base
+from database.migrations import ensure_schema
+from database.pool import engine_options, instrument_engine, pool_metrics
+from database.sqlite_backend import SQLITE_PATH, create_sqlite_engine
+from database.tunnel import TunnelManager, bind_engine, ssh_forwarder_factory
 from flask import g
 
 engine = None
 tunnel = None
 SessionLocal = None
+# Warm-up-Thread und erste Requests können gleichzeitig initialisieren
+_init_lock = threading.Lock()
 
 
 def init_db_connection():
     """
-    Initialisiert die Datenbankverbindung, optional über einen SSH-Tunnel
+    Initialisiert die Datenbankverbindung (MySQL, optional über einen
+    SSH-Tunnel, oder SQLite über DB_BACKEND=sqlite)
     """
-    global engine, tunnel, SessionLocal
+    global engine, SessionLocal
 
-    if engine is not None:
-        return
+    with _init_lock:
+        if SessionLocal is not None:
+            return
+
+        backend = os.getenv("DB_BACKEND", "mysql").lower()
+        if backend == "sqlite":
+            print(f"SQLite-Datenbank wird verwendet: {SQLITE_PATH}")
+            new_engine = create_sqlite_engine(SQLITE_PATH)
+        elif backend == "mysql":
+            new_engine = _create_mysql_engine()
+        else:
+            raise ValueError(f"Unbekanntes DB_BACKEND: {backend}")
+        instrument_engine(new_engine)
+
+        # Nur die Schema-Version prüfen; ausstehende Migrationen werden ausgeführt
+        ensure_schema(new_engine)
+
+        # Erst nach erfolgreicher Migration sichtbar machen
+        engine = new_engine
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        print("Datenbank verbunden!")
+
+
+def _create_mysql_engine():
+    global tunnel
 
     db_user = os.getenv("DB_USER")
     db_password = os.getenv("DB_PASSWORD")
@@ -35,16 +63,19 @@ def init_db_connection():
     if ssh_host and ssh_user:
         try:
             print("SSH-Tunnel wird gestartet")
-            tunnel = SSHTunnelForwarder(
-                (ssh_host, int(os.getenv("SSH_PORT", 22))),
-                ssh_username=ssh_user,
-                ssh_pkey=ssh_key_path,
-                ssh_password=ssh_password,
-                remote_bind_address=("127.0.0.1", db_port),
+            tunnel = TunnelManager(
+                ssh_forwarder_factory(
+                    ssh_host,
+                    int(os.getenv("SSH_PORT", 22)),
+                    ssh_user,
+                    ssh_key_path,
+                    ssh_password,
+                    db_port,
+                )
             )
             tunnel.start()
-            connection_port = tunnel.local_bind_port
-            connection_host = "127.0.0.1"
+            # Host und Port setzt bind_engine bei jedem Verbindungsaufbau neu
+            connection_host, connection_port = tunnel.endpoint()
             print("SSH-Tunnel aktiv!")
         except Exception as e:
             print(f"Fehler bei der SSH-Verbindung: {e}")
@@ -53,13 +84,19 @@ def init_db_connection():
         print("Datenbank wird lokal verbunden")
 
     database_url = f"mysql+pymysql://{db_user}:{db_password}@{connection_host}:{connection_port}/{db_name}"
-    engine = create_engine(database_url, echo=False)
+    engine = create_engine(database_url, echo=False, **engine_options())
+    if tunnel is not None:
+        bind_engine(engine, tunnel)
+    return engine
 
-    # Tabellen anlegen, falls sie noch nicht existieren
-    Base.metadata.create_all(bind=engine)
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    print("Datenbank verbunden!")
+def get_pool_metrics() -> dict:
+    """
+    Kennzahlen des Verbindungspools (Auslastung, Wartezeiten, Timeouts)
+    """
+    if engine is None:
+        return {}
+    return pool_metrics(engine)
 
 
 def get_db():
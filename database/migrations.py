@@ -0,0 +1,244 @@
+"""
+Versionierte Schema-Migrationen.
+
+Die aktuelle Version steht in der Tabelle ``schema_version``. Beim Start wird
+nur diese Version gelesen; fehlende Migrationen werden der Reihe nach (je in
+einer eigenen Transaktion) ausgeführt. Migrationen sind eingefroren: sie
+beziehen sich nicht auf den aktuellen Stand der Modelle, sondern beschreiben
+genau die Änderung ihrer Version.
+
+Manuell ausführen: ``python -m database.migrations``
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+    select,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("beschreibung", String(255), nullable=False),
+    Column("angewendetAm", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    beschreibung: str
+    upgrade: Callable[[Connection], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, beschreibung: str):
+    """Registriert eine Vorwärts-Migration (Versionen streng aufsteigend)."""
+
+    def decorator(func: Callable[[Connection], None]):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"Migration {version} ist nicht aufsteigend")
+        MIGRATIONS.append(Migration(version, beschreibung, func))
+        return func
+
+    return decorator
+
+
+def _create_index(conn: Connection, table: str, column: str) -> None:
+    """
+    Legt einen Index auf table.column an, sofern die Spalte nicht schon
+    führende Spalte eines Index ist (MySQL indiziert z.B. Fremdschlüssel
+    automatisch).
+    """
+    existing = inspect(conn).get_indexes(table)
+    if any(index["column_names"][:1] == [column] for index in existing):
+        logger.info(f"Index auf {table}.{column} existiert bereits")
+        return
+    # Eigene Table-Definition, damit die Migration unabhängig von den Modellen bleibt
+    target = Table(table, MetaData(), Column(column, Integer))
+    Index(f"ix_{table}_{column}", target.c[column]).create(conn)
+
+
+# Stand der Modelle vor Einführung der Migrationen (Version 1). Spätere
+# Änderungen an database/models.py gehören in neue Migrationen, nicht hierher.
+_basis = MetaData()
+Table(
+    "Benutzer",
+    _basis,
+    Column("userId", Integer, primary_key=True, autoincrement=True, comment="PK"),
+    Column("smailAdresse", String(255), unique=True, nullable=False),
+    Column("token", String(255), unique=True, nullable=True),
+    Column("status", String(255), unique=True, nullable=False),
+    Column("registrierungsdatum", Date, nullable=False),
+    Column("token_timestamp", DateTime, nullable=True),
+)
+Table(
+    "Textbeitrag",
+    _basis,
+    Column("textId", Integer, primary_key=True, autoincrement=True, comment="PK"),
+    Column("userId", Integer, ForeignKey("Benutzer.userId"), comment="FK"),
+    Column("userPrompt", Text),
+    Column("erzeugtesSkript", Text, nullable=False),
+    Column("titel", String(255), nullable=False),
+    Column("erstelldatum", Date, nullable=False),
+    Column("sprache", String(10), nullable=False),
+    Column("loeschzeitpunkt", Date),
+)
+Table(
+    "Quelldatei",
+    _basis,
+    Column("dateiId", Integer, primary_key=True, autoincrement=True, comment="PK"),
+    Column(
+        "textId",
+        Integer,
+        ForeignKey("Textbeitrag.textId"),
+        nullable=True,
+        comment="FK",
+    ),
+    Column(
+        "userId", Integer, ForeignKey("Benutzer.userId"), nullable=True, comment="FK"
+    ),
+    Column("dateipfad", String(512), nullable=False),
+    Column("mimeType", String(100), nullable=False),
+    Column("dateigroesse", Integer),
+    Column("dateiname", String(255), nullable=False),
+    Column("loeschzeitpunkt", Date),
+)
+Table(
+    "Konvertierungsauftrag",
+    _basis,
+    Column("auftragId", Integer, primary_key=True, autoincrement=True),
+    Column("textId", Integer, ForeignKey("Textbeitrag.textId")),
+    Column("hauptstimmeName", String(50), nullable=True),
+    Column("zweitstimmeName", String(50), nullable=True),
+    Column("hauptstimmeRolle", String(100), nullable=True),
+    Column("zweitstimmeRolle", String(100), nullable=True),
+    Column("gewuenschteDauer", Integer, nullable=False),
+    Column(
+        "status",
+        Enum(
+            "IN_BEARBEITUNG",
+            "ABGESCHLOSSEN",
+            "FEHLGESCHLAGEN",
+            name="auftragsstatus",
+        ),
+        nullable=False,
+    ),
+)
+Table(
+    "Podcast",
+    _basis,
+    Column("podcastId", Integer, primary_key=True, autoincrement=True, comment="PK"),
+    Column(
+        "auftragId",
+        Integer,
+        ForeignKey("Konvertierungsauftrag.auftragId"),
+        unique=True,
+        comment="FK",
+    ),
+    Column("titel", String(255), nullable=False),
+    Column("realdauer", Integer, nullable=False),
+    Column("dateipfadAudio", String(512), nullable=False),
+    Column("erstelldatum", Date, nullable=False),
+    Column("isPublic", Boolean, default=False, nullable=False),
+    Column("loeschzeitpunkt", Date),
+)
+
+
+@migration(1, "Basisschema")
+def _basisschema(conn: Connection) -> None:
+    # Legt nur fehlende Tabellen an; bestehende Datenbanken bleiben unverändert
+    _basis.create_all(conn, checkfirst=True)
+
+
+@migration(2, "Indizes auf häufig gefilterten und sortierten Spalten")
+def _hot_column_indexes(conn: Connection) -> None:
+    for table, column in (
+        ("Textbeitrag", "userId"),
+        ("Konvertierungsauftrag", "textId"),
+        ("Konvertierungsauftrag", "status"),
+        ("Podcast", "erstelldatum"),
+    ):
+        _create_index(conn, table, column)
+
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Aktuelle Schema-Version (0 = noch nie migriert)."""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def migrate(engine: Engine) -> int:
+    """Führt alle ausstehenden Migrationen aus und gibt die neue Version zurück."""
+    with engine.begin() as conn:
+        schema_version.create(conn, checkfirst=True)
+        current = get_schema_version(conn)
+
+    for m in MIGRATIONS:
+        if m.version <= current:
+            continue
+        logger.info(f"Migration {m.version}: {m.beschreibung}")
+        with engine.begin() as conn:
+            m.upgrade(conn)
+            conn.execute(
+                schema_version.insert().values(
+                    version=m.version,
+                    beschreibung=m.beschreibung,
+                    angewendetAm=datetime.now(),
+                )
+            )
+        current = m.version
+    return current
+
+
+def ensure_schema(engine: Engine) -> int:
+    """
+    Prüft beim Start nur die Schema-Version und migriert, falls sie veraltet ist.
+    """
+    with engine.connect() as conn:
+        current = get_schema_version(conn)
+    if current < LATEST_VERSION:
+        current = migrate(engine)
+    elif current > LATEST_VERSION:
+        logger.warning(
+            f"Datenbank-Schema (Version {current}) ist neuer als der Code "
+            f"(Version {LATEST_VERSION})"
+        )
+    return current
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    from database import database
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    database.init_db_connection()
+    print(f"Schema-Version: {migrate(database.engine)}")
@@ -15,6 +15,8 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import declarative_base, relationship
 
+from database.voices import PodcastStimme  # noqa: F401 (Re-Export)
+
 # Basisklasse für die Deklaration von Klassen-Mappings
 Base = declarative_base()
 
@@ -27,20 +29,8 @@ class AuftragsStatus(enum.Enum):
 
 
 # --- Hardcoded Classes (Keine DB-Modelle mehr) ---
-
-
-class PodcastStimme:
-    """
-    Repräsentiert eine Stimme (früher DB-Tabelle, jetzt Hardcoded).
-    """
-
-    def __init__(self, stimmeId, name, geschlecht, tts_voice_de, tts_voice_en, ui_slot):
-        self.stimmeId = stimmeId
-        self.name = name
-        self.geschlecht = geschlecht
-        self.ttsVoice_de = tts_voice_de
-        self.ttsVoice_en = tts_voice_en
-        self.ui_slot = ui_slot
+# PodcastStimme ist in database/voices.py definiert (siehe Import oben), damit die
+# UI die Stimmenliste ohne SQLAlchemy laden kann.
 
 
 # --- 1. Kern-Entitäten ---
@@ -76,7 +66,7 @@ class Textbeitrag(Base):
     textId = Column(Integer, primary_key=True, autoincrement=True, comment="PK")
 
     # Fremdschlüssel
-    userId = Column(Integer, ForeignKey("Benutzer.userId"), comment="FK")
+    userId = Column(Integer, ForeignKey("Benutzer.userId"), index=True, comment="FK")
 
     userPrompt = Column(Text)
     erzeugtesSkript = Column(Text, nullable=False)
@@ -127,7 +117,7 @@ class Konvertierungsauftrag(Base):
     __tablename__ = "Konvertierungsauftrag"
     auftragId = Column(Integer, primary_key=True, autoincrement=True)
 
-    textId = Column(Integer, ForeignKey("Textbeitrag.textId"))
+    textId = Column(Integer, ForeignKey("Textbeitrag.textId"), index=True)
 
     hauptstimmeName = Column(String(50), nullable=True)
     zweitstimmeName = Column(String(50), nullable=True)
@@ -137,7 +127,7 @@ class Konvertierungsauftrag(Base):
     zweitstimmeRolle = Column(String(100), nullable=True)
 
     gewuenschteDauer = Column(Integer, nullable=False)
-    status = Column(Enum(AuftragsStatus), nullable=False)
+    status = Column(Enum(AuftragsStatus), nullable=False, index=True)
 
     # Relationships
     textbeitrag = relationship("Textbeitrag", back_populates="konvertierungsauftraege")
@@ -167,7 +157,7 @@ class Podcast(Base):
     titel = Column(String(255), nullable=False)
     realdauer = Column(Integer, nullable=False)
     dateipfadAudio = Column(String(512), nullable=False)
-    erstelldatum = Column(Date, nullable=False)
+    erstelldatum = Column(Date, nullable=False, index=True)
     isPublic = Column(Boolean, default=False, nullable=False)
     loeschzeitpunkt = Column(Date)
 
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "ja")
+
+
+def engine_options() -> dict:
+    """
+    Pool-Einstellungen für create_engine aus der Umgebung.
+
+    DB_POOL_SIZE / DB_MAX_OVERFLOW: dauerhafte bzw. zusätzliche Verbindungen.
+        Zusammen sollten sie mindestens der Zahl gleichzeitig laufender
+        Gradio-Events entsprechen, die auf die Datenbank zugreifen.
+    DB_POOL_TIMEOUT: Sekunden, die ein Request höchstens auf eine freie
+        Verbindung wartet.
+    DB_POOL_RECYCLE: Verbindungen werden nach so vielen Sekunden erneuert;
+        muss unter dem wait_timeout von MySQL liegen (Standard 8 h).
+    DB_POOL_PRE_PING: prüft Verbindungen vor der Ausgabe (z.B. nach einem
+        abgebrochenen SSH-Tunnel) und ersetzt tote Verbindungen.
+    """
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+class PoolMetrics:
+    """Thread-sichere Zähler für Checkouts, Wartezeiten und Timeouts des Pools."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_in_use = 0
+
+    def record_checkout(self, wait: float, in_use: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.peak_in_use = max(self.peak_in_use, in_use)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "wait_avg_ms": (
+                    1000 * self.wait_total / self.checkouts if self.checkouts else 0.0
+                ),
+                "wait_max_ms": 1000 * self.wait_max,
+                "peak_in_use": self.peak_in_use,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool, der die Wartezeit beim Checkout und die Auslastung misst."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - t0, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # engine.dispose() erzeugt einen neuen Pool; die Metriken bleiben erhalten
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Zählt Verbindungen, die (z.B. per Pre-Ping) als tot verworfen wurden."""
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.record_invalidation()
+
+
+def pool_metrics(engine: Engine) -> dict:
+    """Aktueller Zustand und Zähler des Pools einer Engine."""
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
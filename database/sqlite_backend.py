@@ -0,0 +1,52 @@
+"""
+SQLite als Alternative zu MySQL für Einzelrechner-Installationen und Tests.
+
+Auswahl über ``DB_BACKEND=sqlite``; die Datei liegt unter ``SQLITE_PATH``.
+Jede neue Verbindung wird auf WAL-Modus und passende Pragmas eingestellt,
+damit gleichzeitige Leser nicht vom Schreiber blockiert werden.
+"""
+
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from database.pool import engine_options
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(PROJECT_ROOT, "podcast.db"))
+# Millisekunden, die ein Schreiber auf die Sperre eines anderen wartet
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    # Im WAL-Modus sicher; fsync nur an Checkpoints statt bei jedem Commit
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": SQLITE_BUSY_TIMEOUT,
+    "temp_store": "MEMORY",
+    # Negativ = KiB, also 64 MB Seiten-Cache pro Verbindung
+    "cache_size": -64000,
+}
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def create_sqlite_engine(path: str = SQLITE_PATH) -> Engine:
+    """Engine für eine SQLite-Datei mit WAL und denselben Pool-Einstellungen."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        echo=False,
+        # Verbindungen wandern über den Pool zwischen Gradio-Worker-Threads
+        connect_args={"check_same_thread": False},
+        **engine_options(),
+    )
+    event.listen(engine, "connect", _apply_pragmas)
+    return engine
@@ -0,0 +1,180 @@
+"""
+SSH-Tunnel zur Datenbank mit Keepalive, Überwachung und Neuaufbau.
+
+Der TunnelManager hält einen oder mehrere SSHTunnelForwarder offen. Ein
+Hintergrund-Thread prüft sie regelmäßig und startet ausgefallene Tunnel neu.
+Die Engine fragt den Endpunkt bei jedem neuen Verbindungsaufbau über
+``endpoint()`` ab (siehe ``bind_engine``), daher sind geänderte lokale Ports
+nach einem Neuaufbau sofort wirksam. Mehrere Tunnel werden reihum genutzt,
+damit parallele Abfragen nicht alle über einen SSH-Kanal laufen.
+"""
+
+import itertools
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SSH_KEEPALIVE = float(os.getenv("SSH_KEEPALIVE", 30))
+SSH_TUNNEL_CHECK_INTERVAL = float(os.getenv("SSH_TUNNEL_CHECK_INTERVAL", 15))
+SSH_TUNNEL_COUNT = int(os.getenv("SSH_TUNNEL_COUNT", 1))
+
+LOCAL_HOST = "127.0.0.1"
+
+
+def _is_up(forwarder) -> bool:
+    """True, wenn SSH-Transport und Portweiterleitung funktionieren."""
+    if not forwarder.is_active:
+        return False
+    try:
+        forwarder.check_tunnels()
+    except Exception as e:
+        logger.warning(f"Tunnelprüfung fehlgeschlagen: {e}")
+        return False
+    return all(forwarder.tunnel_is_up.values())
+
+
+class TunnelManager:
+    """Startet, überwacht und erneuert die SSH-Tunnel zur Datenbank."""
+
+    def __init__(
+        self,
+        forwarder_factory: Callable[[], object],
+        count: int = SSH_TUNNEL_COUNT,
+        check_interval: float = SSH_TUNNEL_CHECK_INTERVAL,
+        on_reconnect: Optional[Callable[[], None]] = None,
+    ):
+        self._factory = forwarder_factory
+        self._count = max(1, count)
+        self._check_interval = check_interval
+        self._on_reconnect = on_reconnect
+        self._forwarders: list = []
+        self._healthy: list[bool] = []
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            for _ in range(self._count):
+                forwarder = self._factory()
+                forwarder.start()
+                self._forwarders.append(forwarder)
+                self._healthy.append(True)
+        logger.info(f"{self._count} SSH-Tunnel aktiv")
+        if self._check_interval > 0:
+            self._monitor = threading.Thread(
+                target=self._monitor_loop, name="ssh-tunnel-monitor", daemon=True
+            )
+            self._monitor.start()
+
+    def set_on_reconnect(self, callback: Callable[[], None]) -> None:
+        self._on_reconnect = callback
+
+    def endpoint(self) -> tuple[str, int]:
+        """Lokaler Endpunkt des nächsten (möglichst gesunden) Tunnels."""
+        with self._lock:
+            if not self._forwarders:
+                raise RuntimeError("SSH-Tunnel ist nicht gestartet")
+            candidates = [
+                f for f, healthy in zip(self._forwarders, self._healthy) if healthy
+            ] or self._forwarders
+            forwarder = candidates[next(self._round_robin) % len(candidates)]
+            return LOCAL_HOST, forwarder.local_bind_port
+
+    def check(self) -> int:
+        """
+        Prüft alle Tunnel und startet ausgefallene neu. Gibt die Zahl der
+        neu aufgebauten Tunnel zurück.
+        """
+        with self._lock:
+            forwarders = list(enumerate(self._forwarders))
+
+        reconnected = 0
+        for index, forwarder in forwarders:
+            if _is_up(forwarder):
+                self._set_healthy(index, True)
+                continue
+            self._set_healthy(index, False)
+            logger.warning(f"SSH-Tunnel {index + 1} ist ausgefallen, Neuaufbau")
+            try:
+                forwarder.restart()
+            except Exception as e:
+                logger.error(
+                    f"Neuaufbau von SSH-Tunnel {index + 1} fehlgeschlagen: {e}"
+                )
+                continue
+            self._set_healthy(index, True)
+            reconnected += 1
+
+        if reconnected and self._on_reconnect is not None:
+            # Verbindungen über den alten Tunnel sind tot und werden verworfen
+            self._on_reconnect()
+        return reconnected
+
+    def _set_healthy(self, index: int, healthy: bool) -> None:
+        with self._lock:
+            self._healthy[index] = healthy
+
+    def _monitor_loop(self) -> None:
+        while not self._stop.wait(self._check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Fehler bei der Tunnelüberwachung: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=5)
+        with self._lock:
+            forwarders, self._forwarders, self._healthy = self._forwarders, [], []
+        for forwarder in forwarders:
+            try:
+                forwarder.stop()
+            except Exception as e:
+                logger.warning(f"SSH-Tunnel konnte nicht gestoppt werden: {e}")
+
+
+def bind_engine(engine: Engine, manager: TunnelManager) -> None:
+    """
+    Leitet jeden neuen Verbindungsaufbau der Engine über den aktuellen
+    Tunnel-Endpunkt und leert den Pool nach einem Neuaufbau.
+    """
+
+    @event.listens_for(engine, "do_connect")
+    def _connect_through_tunnel(dialect, conn_rec, cargs, cparams):
+        cparams["host"], cparams["port"] = manager.endpoint()
+
+    manager.set_on_reconnect(engine.dispose)
+
+
+def ssh_forwarder_factory(
+    ssh_host: str,
+    ssh_port: int,
+    ssh_user: str,
+    ssh_key_path: Optional[str],
+    ssh_password: Optional[str],
+    db_port: int,
+) -> Callable[[], object]:
+    """Factory für SSHTunnelForwarder mit Keepalive auf dem SSH-Transport."""
+
+    def factory():
+        from sshtunnel import SSHTunnelForwarder
+
+        return SSHTunnelForwarder(
+            (ssh_host, ssh_port),
+            ssh_username=ssh_user,
+            ssh_pkey=ssh_key_path,
+            ssh_password=ssh_password,
+            remote_bind_address=(LOCAL_HOST, db_port),
+            set_keepalive=SSH_KEEPALIVE,
+        )
+
+    return factory
@@ -1,13 +1,37 @@
-from database.models import PodcastStimme
+class PodcastStimme:
+    """
+    Repräsentiert eine Stimme (früher DB-Tabelle, jetzt Hardcoded).
+    """
+
+    def __init__(self, stimmeId, name, geschlecht, tts_voice_de, tts_voice_en, ui_slot):
+        self.stimmeId = stimmeId
+        self.name = name
+        self.geschlecht = geschlecht
+        self.ttsVoice_de = tts_voice_de
+        self.ttsVoice_en = tts_voice_en
+        self.ui_slot = ui_slot
+
 
 # Zentrale Liste der hardgecodeten Stimmen
 VOICES = [
-    PodcastStimme(1, "Max", "m", "de-DE-Chirp3-HD-Sadachbia", "en-US-Chirp3-HD-Sadachbia", 1),
-    PodcastStimme(2, "Julia", "w", "de-DE-Chirp3-HD-Autonoe", "en-US-Chirp3-HD-Autonoe", 1),
-    PodcastStimme(3, "Felix", "m", "de-DE-Chirp3-HD-Algenib", "en-US-Chirp3-HD-Algenib", 1),
+    PodcastStimme(
+        1, "Max", "m", "de-DE-Chirp3-HD-Sadachbia", "en-US-Chirp3-HD-Sadachbia", 1
+    ),
+    PodcastStimme(
+        2, "Julia", "w", "de-DE-Chirp3-HD-Autonoe", "en-US-Chirp3-HD-Autonoe", 1
+    ),
+    PodcastStimme(
+        3, "Felix", "m", "de-DE-Chirp3-HD-Algenib", "en-US-Chirp3-HD-Algenib", 1
+    ),
     PodcastStimme(4, "Lena", "w", "de-DE-Chirp-HD-O", "en-US-Chirp-HD-O", 1),
-    PodcastStimme(5, "Sarah", "w", "de-DE-Chirp3-HD-Gacrux", "en-US-Chirp3-HD-Gacrux", 2),
-    PodcastStimme(6, "Thomas", "m", "de-DE-Chirp3-HD-Algenib", "en-US-Chirp3-HD-Algenib", 2),
+    PodcastStimme(
+        5, "Sarah", "w", "de-DE-Chirp3-HD-Gacrux", "en-US-Chirp3-HD-Gacrux", 2
+    ),
+    PodcastStimme(
+        6, "Thomas", "m", "de-DE-Chirp3-HD-Algenib", "en-US-Chirp3-HD-Algenib", 2
+    ),
     PodcastStimme(7, "Lukas", "m", "de-DE-Chirp3-HD-Orus", "en-US-Chirp3-HD-Orus", 2),
-    PodcastStimme(8, "Mia", "w", "de-DE-Chirp3-HD-Erinome", "en-US-Chirp3-HD-Erinome", 2),
+    PodcastStimme(
+        8, "Mia", "w", "de-DE-Chirp3-HD-Erinome", "en-US-Chirp3-HD-Erinome", 2
+    ),
 ]
@@ -0,0 +1,401 @@
+"""
+HTTP API for programmatic podcast generation, next to the Gradio UI.
+
+    POST   /api/podcasts            submit a job -> 202 with the job id
+    GET    /api/jobs/{job_id}       status, progress and (when done) the result
+    GET    /api/jobs/{job_id}/audio redirects to the MP3 download
+    DELETE /api/jobs/{job_id}       cancels a queued or running job
+    GET    /api/health              backend readiness (503s on submit while starting)
+    GET    /api/metrics             DB pool, Gradio queue waits and TTS throughput
+
+Submitting only enqueues the job: a bounded pool of worker threads runs
+script generation, TTS and saving through the same controller functions as
+the UI. When API_MAX_PENDING jobs are queued or running, new submissions are
+rejected with 429. Status requests only read the in-memory job store, so
+clients can poll frequently. On server shutdown all unfinished jobs are
+cancelled and the workers are drained, so every job ends with a final status
+and no half-written file stays behind. Configuration:
+
+    PODCAST_API_KEY    required in the X-API-Key header (API disabled if unset)
+    API_WORKERS        concurrent generation jobs (default 2)
+    API_MAX_PENDING    queued + running jobs before 429 (default 32)
+    API_JOB_TTL        seconds finished jobs stay queryable (default 3600)
+    API_USER_ID        user that owns podcasts created via the API (required,
+                       API disabled if unset or not a number)
+    API_MAX_PODCASTS   stored podcasts of that user before submissions get 409
+                       (default 0 = unlimited; independent of the UI limit)
+"""
+
+import hmac
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse
+from pydantic import BaseModel, model_validator
+
+from database.voices import VOICES
+from services.audio_cleanup import wait_for_removals
+from services.cancellation import CancellationToken
+from services.exceptions import OperationCancelledError
+from services.tts_progress import throughput_metrics
+
+from .concurrency import queue_wait_metrics
+from .controller import DURATION_MAP, is_ready, is_starting
+from .media import download_url, media_url
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api"
+API_WORKERS = int(os.getenv("API_WORKERS", 2))
+API_MAX_PENDING = int(os.getenv("API_MAX_PENDING", 32))
+API_JOB_TTL = int(os.getenv("API_JOB_TTL", 3600))
+API_MAX_PODCASTS = int(os.getenv("API_MAX_PODCASTS", 0))
+
+VOICE_NAMES = {v.name for v in VOICES}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await run_in_threadpool(shutdown)
+
+
+router = APIRouter(prefix=API_PREFIX, lifespan=lifespan)
+
+
+class PodcastRequest(BaseModel):
+    thema: Optional[str] = None
+    source_url: Optional[str] = None
+    sprache: Literal["Deutsch", "English"] = "Deutsch"
+    dauer: Literal[tuple(DURATION_MAP)] = "Kurz (~5min)"
+    speaker1: str = "Max"
+    role1: str = "Moderator"
+    speaker2: Optional[str] = None
+    role2: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_input(self):
+        if not (self.thema or "").strip() and not (self.source_url or "").strip():
+            raise ValueError("thema oder source_url ist erforderlich")
+        for speaker in (self.speaker1, self.speaker2):
+            if speaker and speaker != "Keine" and speaker not in VOICE_NAMES:
+                raise ValueError(f"Unbekannte Stimme: {speaker}")
+        return self
+
+
+class Job:
+    def __init__(self, request: PodcastRequest, user_id: int):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.user_id = user_id
+        self.status = "queued"
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.progress: Optional[float] = None
+        self.eta: Optional[float] = None
+        self.error: Optional[str] = None
+        self.result: Optional[dict] = None
+        self.token = CancellationToken()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "eta_seconds": self.eta,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobStore:
+    """Jobs by id; finished jobs expire after ttl seconds."""
+
+    def __init__(self, max_pending: int = API_MAX_PENDING, ttl: int = API_JOB_TTL):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._jobs: dict[str, Job] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def add(self, job: Job) -> bool:
+        """Registers a new job; False if too many jobs are pending."""
+        with self._lock:
+            self._expire()
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            self._jobs[job.id] = job
+            return True
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def start(self, job: Job) -> bool:
+        """Marks a queued job as running; False if it was cancelled meanwhile."""
+        with self._lock:
+            if job.finished is not None:
+                return False
+            if job.token.cancelled:
+                self._pending -= 1
+                job.finished = time.time()
+                job.status = "cancelled"
+                return False
+            job.status = "running"
+            return True
+
+    def cancel_all(self) -> int:
+        """Cancels every queued or running job; returns how many."""
+        with self._lock:
+            unfinished = [j for j in self._jobs.values() if j.finished is None]
+        for job in unfinished:
+            job.token.cancel()
+        return len(unfinished)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def finish(self, job: Job, status: str) -> None:
+        with self._lock:
+            if job.finished is None:
+                self._pending -= 1
+                job.finished = time.time()
+            job.status = status
+
+    def _expire(self) -> None:
+        now = time.time()
+        for job_id in [
+            i
+            for i, j in self._jobs.items()
+            if j.finished is not None and now - j.finished > self.ttl
+        ]:
+            del self._jobs[job_id]
+
+
+jobs = JobStore()
+# Limit check and saving happen together, so parallel jobs cannot exceed it
+_limit_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api-job")
+
+
+def shutdown() -> None:
+    """Cancels unfinished jobs and waits until the workers have stopped."""
+    cancelled = jobs.cancel_all()
+    if cancelled:
+        logger.info(f"Cancelling {cancelled} API job(s) on shutdown")
+    _executor.shutdown(wait=True)
+    # Cancelled jobs hand their partial MP3s to the cleanup thread
+    wait_for_removals()
+
+
+def require_api_key(x_api_key: Optional[str] = Header(None)) -> None:
+    api_key = os.getenv("PODCAST_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=503, detail="API ist nicht konfiguriert")
+    if not x_api_key or not hmac.compare_digest(x_api_key, api_key):
+        raise HTTPException(status_code=401, detail="Ungültiger API-Key")
+
+
+def api_user_id() -> int:
+    """User that owns API podcasts; the API is disabled without a valid one."""
+    try:
+        return int(os.getenv("API_USER_ID", ""))
+    except ValueError:
+        raise HTTPException(
+            status_code=503, detail="API-Benutzer ist nicht konfiguriert"
+        ) from None
+
+
+class PodcastLimitError(Exception):
+    pass
+
+
+def _limit_reached(podcasts: int) -> bool:
+    return API_MAX_PODCASTS > 0 and podcasts >= API_MAX_PODCASTS
+
+
+def _limit_message() -> str:
+    return f"Limit von {API_MAX_PODCASTS} API-Podcasts erreicht"
+
+
+def _check_limit(user_id: int) -> None:
+    """Raises PodcastLimitError if the API user has no quota left."""
+    from .controller import count_podcasts_for_user
+
+    if API_MAX_PODCASTS > 0 and _limit_reached(count_podcasts_for_user(user_id)):
+        raise PodcastLimitError(_limit_message())
+
+
+def run_job(job: Job) -> None:
+    """Generates script, audio and DB entry for one job (worker thread)."""
+    from .controller import (
+        generate_audio_only,
+        generate_script,
+        process_source_input,
+        save_generated_podcast,
+    )
+
+    if not jobs.start(job):
+        return
+    req = job.request
+    thema = (req.thema or "").strip()
+
+    def on_progress(p):
+        job.progress = p.fraction
+        job.eta = p.eta
+
+    try:
+        # Before any LLM/TTS cost; checked again when saving
+        _check_limit(job.user_id)
+        source_text = ""
+        if req.source_url:
+            source_text, source_title = process_source_input(None, req.source_url)
+            thema = thema or source_title or "Podcast"
+
+        script = generate_script(
+            thema=thema,
+            dauer=req.dauer,
+            sprache=req.sprache,
+            speaker1=req.speaker1,
+            role1=req.role1,
+            speaker2=req.speaker2,
+            role2=req.role2,
+            source_text=source_text,
+            cancel_token=job.token,
+        )
+        audio_obj = generate_audio_only(
+            script_text=script,
+            sprache=req.sprache,
+            speaker1=req.speaker1,
+            speaker2=req.speaker2,
+            on_progress=on_progress,
+            cancel_token=job.token,
+        )
+        with _limit_lock:
+            _check_limit(job.user_id)
+            audio_path, podcast = save_generated_podcast(
+                script_text=script,
+                thema=thema,
+                dauer=req.dauer,
+                sprache=req.sprache,
+                speaker1=req.speaker1,
+                speaker2=req.speaker2,
+                audio_obj=audio_obj,
+                user_id=job.user_id,
+                role1=req.role1,
+                role2=req.role2,
+                cancel_token=job.token,
+            )
+    except OperationCancelledError:
+        jobs.finish(job, "cancelled")
+        return
+    except Exception as e:
+        logger.error(f"API job {job.id} failed: {e}", exc_info=True)
+        job.error = str(e)
+        jobs.finish(job, "failed")
+        return
+
+    job.result = {
+        "podcast_id": podcast["id"],
+        "titel": podcast["titel"],
+        "dauer": podcast["dauer"],
+        "audio_url": media_url(audio_path),
+        "download_url": download_url(audio_path, podcast["titel"], podcast["datum"]),
+    }
+    job.progress = 1.0
+    job.eta = 0.0
+    jobs.finish(job, "done")
+
+
+def _get_job(job_id: str) -> Job:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job nicht gefunden")
+    return job
+
+
+@router.get("/health")
+async def health() -> dict:
+    """Readiness for load balancers (no API key required)."""
+    return {"ready": is_ready(), "starting": is_starting()}
+
+
+@router.get("/metrics", dependencies=[Depends(require_api_key)])
+async def metrics() -> dict:
+    """Operational counters of the running server (all since process start)."""
+    pool = {}
+    if is_ready():
+        # Only after the warm-up: the database module pulls in SQLAlchemy
+        from database.database import get_pool_metrics
+
+        pool = get_pool_metrics()
+    return {
+        "db_pool": pool,
+        "queue_wait": queue_wait_metrics(),
+        "tts": throughput_metrics(),
+    }
+
+
+@router.post("/podcasts", status_code=202, dependencies=[Depends(require_api_key)])
+async def submit_podcast(request: PodcastRequest) -> dict:
+    """Queues a generation job and returns immediately."""
+    from .controller import count_podcasts_for_user
+
+    if is_starting():
+        raise HTTPException(
+            status_code=503,
+            detail="Server wird gestartet",
+            headers={"Retry-After": "5"},
+        )
+    user_id = api_user_id()
+    if API_MAX_PODCASTS > 0:
+        # Queued jobs count as well, they will all be saved for this user
+        existing = await run_in_threadpool(count_podcasts_for_user, user_id)
+        if _limit_reached(existing + jobs.pending()):
+            raise HTTPException(status_code=409, detail=_limit_message())
+
+    job = Job(request, user_id)
+    if not jobs.add(job):
+        raise HTTPException(
+            status_code=429,
+            detail="Zu viele laufende Jobs, bitte später erneut versuchen",
+            headers={"Retry-After": "30"},
+        )
+    _executor.submit(run_job, job)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{API_PREFIX}/jobs/{job.id}",
+    }
+
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_api_key)])
+async def job_status(job_id: str) -> dict:
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/audio", dependencies=[Depends(require_api_key)])
+async def job_audio(job_id: str) -> RedirectResponse:
+    """Redirects to /media (Range support, Content-Disposition)."""
+    job = _get_job(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job ist {job.status}")
+    return RedirectResponse(job.result["download_url"], status_code=303)
+
+
+@router.delete("/jobs/{job_id}", dependencies=[Depends(require_api_key)])
+async def cancel_job(job_id: str) -> dict:
+    job = _get_job(job_id)
+    if job.finished is None:
+        job.token.cancel()
+    return job.to_dict()
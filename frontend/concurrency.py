@@ -0,0 +1,168 @@
+"""
+Concurrency limits per event class for the Gradio queue.
+
+Every event listener belongs to one class (navigation, login, library,
+source, script, audio). Events of a class share a concurrency_id, so a few
+long audio jobs only occupy the audio slots and never block login or page
+navigation. Limits come from the environment:
+
+    GRADIO_LIMIT_<CLASS>     concurrent events of the class (e.g. GRADIO_LIMIT_AUDIO=2)
+    GRADIO_QUEUE_MAX_SIZE    events waiting in total before new ones are rejected
+    GRADIO_MAX_THREADS       worker threads shared by all classes
+
+The time an event waited in the queue is recorded per class (see
+queue_wait_metrics()).
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import gradio as gr
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMITS = {
+    "navigation": 8,
+    "login": 4,
+    "library": 4,
+    "source": 2,
+    "script": 3,
+    "audio": 2,
+}
+QUEUE_MAX_SIZE = int(os.getenv("GRADIO_QUEUE_MAX_SIZE", 64))
+MAX_THREADS = int(os.getenv("GRADIO_MAX_THREADS", 40))
+
+
+def concurrency_limit(event_class: str) -> int:
+    env = os.getenv(f"GRADIO_LIMIT_{event_class.upper()}")
+    return int(env) if env else DEFAULT_LIMITS[event_class]
+
+
+class _WaitStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+_wait_stats: dict[str, _WaitStats] = {}
+_wait_lock = threading.Lock()
+
+
+def _record_wait(event_class: str, wait: float) -> None:
+    with _wait_lock:
+        stats = _wait_stats.setdefault(event_class, _WaitStats())
+        stats.count += 1
+        stats.total += wait
+        stats.max = max(stats.max, wait)
+    if wait > 1.0:
+        logger.info(f"{event_class}: event waited {wait:.1f}s in the queue")
+
+
+def queue_wait_metrics() -> dict[str, dict[str, float]]:
+    """Average and maximum queue wait (seconds) per event class."""
+    with _wait_lock:
+        return {
+            event_class: {
+                "events": stats.count,
+                "wait_avg": stats.total / stats.count if stats.count else 0.0,
+                "wait_max": stats.max,
+            }
+            for event_class, stats in _wait_stats.items()
+        }
+
+
+def _current_queue():
+    # Gradio keeps the running Blocks in a context variable inside event handlers
+    from gradio.context import LocalContext
+
+    blocks = LocalContext.blocks.get(None)
+    return getattr(blocks, "_queue", None)
+
+
+def _queue_wait() -> Optional[float]:
+    """Seconds the current event spent in the queue (None outside the queue)."""
+    from gradio.context import LocalContext
+
+    queue = _current_queue()
+    event_id = LocalContext.event_id.get(None)
+    if queue is None or event_id is None:
+        return None
+    enqueued = queue.event_analytics.get(event_id, {}).get("time")
+    return time.time() - enqueued if enqueued else None
+
+
+def backlog(event_class: str) -> Optional[int]:
+    """
+    Number of events of a class already waiting for a slot, or None if a
+    slot is free (or the queue is not available).
+    """
+    queue = _current_queue()
+    if queue is None:
+        return None
+    event_queue = queue.event_queue_per_concurrency_id.get(event_class)
+    if event_queue is None:
+        return None
+    waiting = len(event_queue.queue)
+    if not waiting and event_queue.current_concurrency < concurrency_limit(event_class):
+        return None
+    return waiting
+
+
+def notify_if_busy(event_class: str) -> None:
+    """Tells the user that the next step has to wait for other users' jobs."""
+    waiting = backlog(event_class)
+    if waiting is not None:
+        gr.Info(
+            "Der Server ist gerade ausgelastet – deine Anfrage wartet auf einen "
+            f"freien Platz ({waiting} weitere in der Warteschlange)."
+        )
+
+
+def _measured(event_class: str, fn: Callable) -> Callable:
+    """Wraps fn so that its queue wait is recorded (generators stay generators)."""
+
+    def record():
+        wait = _queue_wait()
+        if wait is not None:
+            _record_wait(event_class, wait)
+
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            record()
+            yield from fn(*args, **kwargs)
+
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        record()
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def queued(event_class: str, fn: Callable) -> dict:
+    """
+    Keyword arguments for an event listener of the given class:
+    ``btn.click(**queued("audio", handlers.run_audio_gen), inputs=..., ...)``
+    """
+    return {
+        "fn": _measured(event_class, fn),
+        "concurrency_limit": concurrency_limit(event_class),
+        "concurrency_id": event_class,
+    }
+
+
+def configure_queue(demo: gr.Blocks) -> gr.Blocks:
+    """Enables the queue with a bounded size (full queue -> 'Queue is full')."""
+    # Must be set before queue(): it sizes the queue's worker slots
+    demo.max_threads = MAX_THREADS
+    return demo.queue(max_size=QUEUE_MAX_SIZE)
@@ -1,42 +1,112 @@
 import os
 import logging
-from typing import Optional, Tuple, Dict, Any, List
-
-from interfaces.iservices import IWorkflow
-from services.login_service import process_login_request, process_verify_login
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, Dict, Any, List
+
+# Only lightweight imports here: the UI imports this module at startup.
+# Services pulling in SQLAlchemy, Flask, passlib, PyPDF2 or lxml are imported
+# on the code path that needs them (see startup_benchmark.py).
+from database.voices import VOICES
 from services.exceptions import AuthenticationError
-from services.input_processing import build_source_text
+
+if TYPE_CHECKING:
+    from interfaces.iservices import IWorkflow
 
 logger = logging.getLogger(__name__)
 
 # Use Interface for typing
-_workflow: Optional[IWorkflow] = None
+_workflow: Optional["IWorkflow"] = None
+_workflow_lock = threading.Lock()
+_ready = threading.Event()
+_warmup_done = threading.Event()
+_warmup_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
 
 DURATION_MAP = {"Kurz (~5min)": 5, "Mittel (~15min)": 15, "Lang (~30min)": 30}
+MAX_PODCASTS_PER_USER = 10
+PODCAST_PAGE_SIZE = int(os.getenv("PODCAST_PAGE_SIZE", 10))
+# How long a request waits for a running warm-up before it is turned away
+BACKEND_STARTUP_WAIT = float(os.getenv("BACKEND_STARTUP_WAIT", 15))
 
 
-def get_workflow() -> IWorkflow:
+def get_workflow() -> "IWorkflow":
     """
     Returns a singleton instance of the Workflow.
     Uses lazy loading to import the concrete implementation only when needed.
     """
     global _workflow
     if _workflow is None:
-        from services.workflow import PodcastWorkflow
-        from services.llm_service import LLMService
-        from services.tts_service import GoogleTTSService
-
-        # Dependency Injection (Modularity)
-        llm = LLMService()
-        tts = GoogleTTSService()
-        _workflow = PodcastWorkflow(llm_service=llm, tts_service=tts)
+        # Warm-up thread and first requests may race; build the clients only once
+        with _workflow_lock:
+            if _workflow is None:
+                from services.workflow import PodcastWorkflow
+                from services.llm_service import LLMService
+                from services.tts_service import GoogleTTSService
+
+                # Dependency Injection (Modularity)
+                llm = LLMService()
+                tts = GoogleTTSService()
+                _workflow = PodcastWorkflow(llm_service=llm, tts_service=tts)
     return _workflow
 
 
+def _warm_up() -> None:
+    t0 = time.perf_counter()
+    try:
+        from database.database import init_db_connection
+
+        init_db_connection()
+        get_workflow()
+        _ready.set()
+        logger.info(f"Backend ready after {time.perf_counter() - t0:.2f}s")
+    except Exception as e:
+        # Requests retry the initialization lazily via get_workflow()/get_db()
+        logger.error(f"Backend warm-up failed: {e}", exc_info=True)
+    finally:
+        _warmup_done.set()
+
+
+def start_warm_up() -> threading.Thread:
+    """
+    Initializes DB connection, LLM and TTS clients in a background thread,
+    so the UI can be served before they are ready.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=_warm_up, name="backend-warm-up", daemon=True
+            )
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def is_ready() -> bool:
+    """True once the warm-up has initialized all backend clients."""
+    return _ready.is_set()
+
+
+def is_starting() -> bool:
+    """True while the warm-up thread is still initializing the backend."""
+    return _warmup_thread is not None and not _warmup_done.is_set()
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """Blocks until the warm-up is finished (or timeout); returns is_ready()."""
+    if _warmup_thread is not None:
+        _warmup_done.wait(timeout)
+    return is_ready()
+
+
 def get_available_voices() -> Tuple[List[str], List[str]]:
-    """Returns primary and secondary voice options."""
-    workflow = get_workflow()
-    return workflow.get_voices_for_ui()
+    """
+    Returns primary and secondary voice options from the static voice catalog,
+    without initializing the workflow (the UI is built at import time).
+    """
+    primary = [v.name for v in VOICES if v.ui_slot == 1]
+    secondary = [v.name for v in VOICES if v.ui_slot == 2]
+    return primary, secondary
 
 
 def generate_script(
@@ -48,6 +118,7 @@ def generate_script(
     speaker2: Optional[str],
     role2: Optional[str],
     source_text: str,
+    cancel_token=None,
 ) -> str:
     """
     Generates a podcast script based on the given parameters.
@@ -78,19 +149,50 @@ def generate_script(
         hauptstimme=speaker1,
         zweitstimme=speaker2,
         source_text=source_text,
+        cancel_token=cancel_token,
     )
 
 
 def generate_audio_only(
-    script_text: str, sprache: str, speaker1: str, speaker2: Optional[str]
+    script_text: str,
+    sprache: str,
+    speaker1: str,
+    speaker2: Optional[str],
+    on_progress: Optional[Callable] = None,
+    cancel_token=None,
+    speculative_key=None,
 ):
-    """Wrapper to generate audio object"""
+    """Wrapper to generate audio object (on_progress: see services.tts_progress)"""
     workflow = get_workflow()
     if not speaker2 or speaker2 == "Keine" or speaker2 == speaker1:
         speaker2 = None
 
     # Calls the new 'obj' step
-    return workflow.generate_audio_obj_step(script_text, sprache, speaker1, speaker2)
+    return workflow.generate_audio_obj_step(
+        script_text,
+        sprache,
+        speaker1,
+        speaker2,
+        on_progress=on_progress,
+        cancel_token=cancel_token,
+        speculative_key=speculative_key,
+    )
+
+
+def presynthesize_script(
+    user_key, script_text: str, sprache: str, speaker1: str, speaker2: Optional[str]
+) -> int:
+    """Starts speculative TTS for a displayed script (no-op unless enabled)."""
+    if not speaker2 or speaker2 == "Keine" or speaker2 == speaker1:
+        speaker2 = None
+    try:
+        return get_workflow().presynthesize_audio(
+            user_key, script_text, sprache, speaker1, speaker2
+        )
+    except Exception as e:
+        # Only an optimization; the real generation runs without it
+        logger.warning(f"Speculative TTS failed to start: {e}")
+        return 0
 
 
 def save_generated_podcast(
@@ -104,11 +206,12 @@ def save_generated_podcast(
     user_id,
     role1,
     role2,
+    cancel_token=None,
 ):
     """Wrapper to save file and metadata."""
     workflow = get_workflow()
 
-    audio_path = workflow.save_audio_file(audio_obj)
+    audio_path = workflow.save_audio_file(audio_obj, cancel_token=cancel_token)
 
     if not speaker2 or speaker2 == "Keine" or speaker2 == speaker1:
         speaker2 = None
@@ -178,10 +281,35 @@ def generate_audio(
 
 
 # --- Podcast Management ---
-def get_podcasts_for_user(user_id: Optional[int]) -> List[Dict[str, Any]]:
-    """Returns list of podcasts for a user."""
+class PodcastPage(list):
+    """Podcast cards shown so far, plus whether older podcasts exist."""
+
+    def __init__(self, podcasts=(), has_more: bool = False):
+        super().__init__(podcasts)
+        self.has_more = has_more
+
+
+def get_podcasts_for_user(
+    user_id: Optional[int], before_id: Optional[int] = None
+) -> PodcastPage:
+    """
+    Returns one page of a user's podcasts (newest first). Pass the smallest
+    podcast id already shown as before_id to get the next page.
+    """
     workflow = get_workflow()
-    return workflow.get_podcasts_data(user_id=user_id)
+    # One extra row tells whether another page exists, without a COUNT
+    podcasts = workflow.get_podcasts_data(
+        user_id=user_id, before_id=before_id, limit=PODCAST_PAGE_SIZE + 1
+    )
+    return PodcastPage(
+        podcasts[:PODCAST_PAGE_SIZE], has_more=len(podcasts) > PODCAST_PAGE_SIZE
+    )
+
+
+def count_podcasts_for_user(user_id: Optional[int]) -> int:
+    """Returns the number of podcasts a user has (for the limit check)."""
+    workflow = get_workflow()
+    return workflow.count_podcasts(user_id=user_id)
 
 
 def delete_podcast(podcast_id: int, user_id: int) -> bool:
@@ -213,6 +341,8 @@ def request_login_code(email: str) -> Tuple[bool, str]:
     if not validate_smail_email(email):
         return False, "### Bitte eine gültige Smail-Adresse eingeben!"
 
+    from services.login_service import process_login_request
+
     try:
         process_login_request(email)
         return (
@@ -230,6 +360,8 @@ def verify_login_code(email: str, code: str) -> Tuple[bool, Optional[Dict], str]
     """
     Verifies a login code.
     """
+    from services.login_service import process_verify_login
+
     try:
         user_data = process_verify_login(email, code)
         return True, user_data, f"Erfolgreich eingeloggt als {user_data['email']}!"
@@ -248,7 +380,9 @@ def get_user_display_name(user_data: Optional[Dict]) -> str:
 
 
 def process_source_input(
-    file_path: Optional[str], url: Optional[str]
+    file_paths: Optional[List[str] | str], urls: Optional[str]
 ) -> Tuple[str, str]:
-    """Processes file upload and URL to extract source text and title."""
-    return build_source_text(file_path, url)
+    """Processes uploaded files and URLs to extract one merged source text and title."""
+    from services.input_processing import build_source_text
+
+    return build_source_text(file_paths, urls)
@@ -0,0 +1,93 @@
+"""
+Serves the generated MP3 files from Output/ directly.
+
+Gradio copies every file it renders (e.g. a DownloadButton value) into its
+upload cache. Podcast cards therefore only link to ``/media/<file>``; the
+file is read when the user actually clicks. FileResponse answers Range
+requests, so the browser can seek and resume. The result page's player is a
+plain <audio> element on the same route, so no MP3 goes through Gradio's
+file handling at all.
+
+Downloads get their friendly name (``Podcast-<Thema>-<Datum>.mp3``) from a
+Content-Disposition header, so every MP3 exists exactly once on disk.
+"""
+
+import html
+import os
+from datetime import date
+from typing import Optional, Union
+from urllib.parse import quote, urlencode
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from services.audio_cleanup import OUTPUT_DIR, download_copy_name, is_inside_output
+
+MEDIA_PREFIX = "/media"
+# Dateinamen enthalten eine UUID und ändern sich nie
+CACHE_CONTROL = "private, max-age=86400, immutable"
+
+router = APIRouter()
+
+
+def media_url(audio_path: Optional[str]) -> Optional[str]:
+    """URL under which a podcast file from Output/ is served (None if unknown)."""
+    if not audio_path:
+        return None
+    return f"{MEDIA_PREFIX}/{quote(os.path.basename(audio_path))}"
+
+
+def download_url(
+    audio_path: Optional[str], titel: str, datum: Union[date, str]
+) -> Optional[str]:
+    """URL that downloads the podcast under a readable file name."""
+    url = media_url(audio_path)
+    if url is None:
+        return None
+    if isinstance(datum, str):
+        datum = date.fromisoformat(datum)
+    return f"{url}?{urlencode({'download': download_copy_name(titel, datum)})}"
+
+
+def audio_player_html(audio_path: Optional[str], autoplay: bool = True) -> str:
+    """<audio> element that streams the podcast from /media (empty if unknown)."""
+    url = media_url(audio_path)
+    if url is None:
+        return ""
+    autoplay_attr = " autoplay" if autoplay else ""
+    return (
+        f'<audio controls preload="metadata"{autoplay_attr} '
+        f'src="{html.escape(url)}" style="width: 100%"></audio>'
+    )
+
+
+def resolve_media_path(filename: str) -> str:
+    """Absolute path of a file in Output/; raises 404 for anything else."""
+    path = os.path.join(OUTPUT_DIR, filename)
+    if (
+        os.path.basename(filename) != filename
+        or not is_inside_output(path)
+        or not os.path.isfile(path)
+    ):
+        raise HTTPException(status_code=404, detail="Datei nicht gefunden")
+    return path
+
+
+@router.get(MEDIA_PREFIX + "/{filename}")
+def get_media(filename: str, download: Optional[str] = None) -> FileResponse:
+    """Streams the file; with ?download=<name> as attachment under that name."""
+    path = resolve_media_path(filename)
+    if download:
+        name = os.path.basename(download)
+        if not name.lower().endswith(".mp3"):
+            name += ".mp3"
+        # Starlette sets Content-Disposition: attachment (RFC 5987 for umlauts)
+        return FileResponse(
+            path,
+            media_type="audio/mpeg",
+            filename=name,
+            headers={"Cache-Control": CACHE_CONTROL},
+        )
+    return FileResponse(
+        path, media_type="audio/mpeg", headers={"Cache-Control": CACHE_CONTROL}
+    )
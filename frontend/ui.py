@@ -19,12 +19,17 @@ try:
 except ImportError:
     import ui_handlers as handlers
 
-from .controller import (
-    get_absolute_audio_path,
-    get_available_voices,
+from .controller import get_available_voices
+from .concurrency import concurrency_limit, configure_queue, queued
+from .media import download_url
+
+# Remove files Gradio cached for uploads etc. (interval, max age in seconds)
+CACHE_CLEANUP = (
+    int(os.getenv("GRADIO_CACHE_CLEANUP_INTERVAL", 3600)),
+    int(os.getenv("GRADIO_CACHE_MAX_AGE", 86400)),
 )
 
-# Get available voices on startup
+# Voices come from the static catalog; importing the UI initializes no backend
 available_voices_primary, available_voices_secondary = get_available_voices()
 available_voices_secondary_with_none = available_voices_secondary + ["Keine"]
 
@@ -32,6 +37,7 @@ with gr.Blocks(
     css=css_content,
     theme=gr.themes.Soft(primary_hue="indigo"),
     title="KI Podcast Generator",
+    delete_cache=CACHE_CLEANUP,
 ) as demo:
     # --- Global State ---
     current_user_state = gr.BrowserState(
@@ -149,7 +155,7 @@ with gr.Blocks(
                     )
 
                 dropdown_speaker2.change(
-                    fn=handlers.get_matching_role,
+                    **queued("navigation", handlers.get_matching_role),
                     inputs=[dropdown_speaker2, dropdown_role1],
                     outputs=dropdown_role2,
                 )
@@ -164,15 +170,25 @@ with gr.Blocks(
                 # Upload Felder
                 with gr.Row():
                     file_upload = gr.File(
-                        label="PDF/TXT hochladen",
-                        file_types=[".pdf", ".txt", ".md"],
+                        label="Dokumente hochladen (PDF, DOCX, EPUB, HTML, TXT, MD)",
+                        file_types=[
+                            ".pdf",
+                            ".docx",
+                            ".epub",
+                            ".html",
+                            ".htm",
+                            ".txt",
+                            ".md",
+                        ],
+                        file_count="multiple",
                         type="filepath",
                         scale=1,
                     )
                     source_url = gr.Textbox(
-                        label="Quelle / URL (optional)",
+                        label="Quellen / URLs (optional, eine pro Zeile)",
                         placeholder="https://...",
-                        max_lines=1,
+                        lines=1,
+                        max_lines=5,
                         scale=1,
                         elem_id="source_url_input",
                     )
@@ -187,19 +203,19 @@ with gr.Blocks(
                 )
 
                 file_upload.change(
-                    fn=handlers.toggle_quelle_button,
+                    **queued("navigation", handlers.toggle_quelle_button),
                     inputs=[file_upload, source_url],
                     outputs=btn_quelle,
                 )
 
                 source_url.change(
-                    fn=handlers.toggle_quelle_button,
+                    **queued("navigation", handlers.toggle_quelle_button),
                     inputs=[file_upload, source_url],
                     outputs=btn_quelle,
                 )
 
                 btn_quelle.click(
-                    fn=handlers.show_source_preview,
+                    **queued("source", handlers.show_source_preview),
                     inputs=[file_upload, source_url, textbox_thema],
                     outputs=[source_preview, textbox_thema],
                 )
@@ -216,12 +232,23 @@ with gr.Blocks(
 
         # Render Single Card
         def create_podcast_card(p, user_data):
-            """Renders a single podcast card with layout and events."""
-            with gr.Group(elem_classes="podcast-card"):
-                with gr.Row(variant="panel"):
+            """
+            Renders a single podcast card with layout and events. gr.render
+            runs this again for every card and registers its listeners anew on
+            each update; the keys (podcast id) only let the browser match the
+            components to the existing ones, so cards are updated in place
+            instead of being recreated.
+            """
+            podcast_id = p.get("id")
+
+            def key(name):
+                return ("podcast", podcast_id, name)
+
+            with gr.Group(elem_classes="podcast-card", key=key("card")):
+                with gr.Row(variant="panel", key=key("row")):
                     # Meta Data Column
-                    with gr.Column(scale=4):
-                        gr.Markdown(f"### 🎙️ {p['titel']}")
+                    with gr.Column(scale=4, key=key("meta")):
+                        gr.Markdown(f"### 🎙️ {p['titel']}", key=key("titel"))
 
                         formatted_date = handlers.format_podcast_date(p["datum"])
                         metadata_lines = [
@@ -233,26 +260,28 @@ with gr.Blocks(
                         if p.get("rollen"):
                             metadata_lines.append(f"**Rollen:** {p['rollen']}")
 
-                        gr.Markdown("\n\n".join(metadata_lines))
+                        gr.Markdown("\n\n".join(metadata_lines), key=key("details"))
 
                     # Action Buttons Column
-                    with gr.Column(scale=1):
-                        audio_full_path = get_absolute_audio_path(p["path"])
-                        with gr.Row(equal_height=True):
+                    with gr.Column(scale=1, key=key("actions")):
+                        with gr.Row(equal_height=True, key=key("buttons")):
                             btn_play_home = gr.Button(
                                 "▶ Play",
                                 variant="primary",
                                 size="sm",
                                 scale=1,
                                 elem_classes="btn-play podcast-btn",
+                                key=key("play"),
                             )
 
-                            btn_download_home = gr.DownloadButton(
+                            # Only a link; the file is read when it is clicked
+                            gr.Button(
                                 "⤓ Download",
-                                value=audio_full_path,
+                                link=download_url(p["path"], p["titel"], p["datum"]),
                                 size="sm",
                                 scale=1,
                                 elem_classes="btn-download podcast-btn",
+                                key=key("download"),
                             )
 
                             btn_delete_home = gr.Button(
@@ -261,40 +290,63 @@ with gr.Blocks(
                                 size="sm",
                                 scale=1,
                                 elem_classes="btn-delete podcast-btn",
+                                key=key("delete"),
                             )
                             btn_share_home = gr.Button(
                                 "📤 Teilen",
                                 size="sm",
                                 scale=1,
                                 elem_classes="btn-share podcast-btn",
+                                key=key("share"),
                             )
 
                         # --- Card Events ---
                         btn_play_home.click(
-                            fn=handlers.on_play_click,
-                            inputs=[gr.State(p["path"]), gr.State(p["titel"])],
+                            **queued(
+                                "navigation",
+                                lambda path=p["path"], titel=p[
+                                    "titel"
+                                ]: handlers.on_play_click(path, titel),
+                            ),
+                            inputs=[],
                             outputs=pages + [audio_player, player_title_display],
                             show_progress="hidden",
+                            key=key("play-click"),
                         )
 
-                        podcast_id = p.get("id")
                         btn_delete_home.click(
-                            fn=lambda pid=podcast_id,
-                            ud=user_data: handlers.delete_podcast_handler(pid, ud),
-                            inputs=[],
+                            **queued(
+                                "library",
+                                lambda podcasts, pid=podcast_id,
+                                ud=user_data: handlers.delete_podcast_handler(
+                                    pid, ud, podcasts
+                                ),
+                            ),
+                            inputs=[podcast_list_state],
                             outputs=[podcast_list_state],
                             show_progress="hidden",
+                            key=key("delete-click"),
                         )
 
                         btn_share_home.click(
-                            fn=lambda pod_data=p: handlers.handle_share_click(pod_data),
+                            **queued(
+                                "navigation",
+                                lambda pod_data=p: handlers.handle_share_click(
+                                    pod_data
+                                ),
+                            ),
                             inputs=[],
                             outputs=pages + [share_podcast_title, share_link_input],
                             show_progress="hidden",
+                            key=key("share-click"),
                         )
 
         # --- Main List Renderer ---
-        @gr.render(inputs=[podcast_list_state, current_user_state])
+        @gr.render(
+            inputs=[podcast_list_state, current_user_state],
+            concurrency_limit=concurrency_limit("navigation"),
+            concurrency_id="navigation",
+        )
         def render_home_podcasts_list(podcasts, user_data):
             if not podcasts:
                 gr.Markdown(
@@ -305,6 +357,17 @@ with gr.Blocks(
             for p in podcasts:
                 create_podcast_card(p, user_data)
 
+            # Next page via keyset pagination (older than the last card)
+            if handlers.has_more_podcasts(podcasts):
+                btn_load_more = gr.Button("Mehr laden", size="sm", key="load-more")
+                btn_load_more.click(
+                    **queued("library", handlers.load_more_podcasts),
+                    inputs=[podcast_list_state, current_user_state],
+                    outputs=[podcast_list_state, btn_load_more],
+                    show_progress="hidden",
+                    key="load-more-click",
+                )
+
     # --- Skript Bearbeiten ---
     with gr.Column(visible=False) as skript_bearbeiten:
         gr.Image(
@@ -350,12 +413,11 @@ with gr.Blocks(
         player_title_display = gr.Markdown(
             "## 🎙️ Unbekannter Podcast", elem_id="player_title_header"
         )
-        audio_player = gr.Audio(label="Podcast", type="filepath")
+        # Streams from /media (Range requests), nothing is copied into Gradio's cache
+        audio_player = gr.HTML("")
 
         with gr.Row(scale=2):
-            btn_download_finish = gr.DownloadButton(
-                "⤓ Download", size="md", visible=False
-            )
+            btn_download_finish = gr.Button("⤓ Download", size="md", visible=False)
             btn_delete_finish = gr.Button(
                 "🗑️ Löschen", variant="stop", size="md", visible=False
             )
@@ -378,6 +440,8 @@ with gr.Blocks(
                 "Podcast wird generiert, das kann einen Moment dauern."
             )
         )
+        # Fortschritt der Sprachsynthese (gr.Progress aus run_audio_gen)
+        podcast_progress = gr.Markdown(min_height=60)
         btn_cancel_podcast = gr.Button("Abbrechen", variant="secondary")
 
     # --- Login Page ---
@@ -577,31 +641,37 @@ with gr.Blocks(
 
     # --- Events ---
     btn_goto_nutzungs.click(
-        fn=lambda: handlers.navigate("nutzungs_page"),
+        **queued("navigation", lambda: handlers.navigate("nutzungs_page")),
         outputs=pages,
         show_progress="hidden",
     )
     btn_back_from_nutzungs.click(
-        fn=lambda: handlers.navigate("home"), outputs=pages, show_progress="hidden"
+        **queued("navigation", lambda: handlers.navigate("home")),
+        outputs=pages,
+        show_progress="hidden",
     )
 
     btn_goto_uber.click(
-        fn=lambda: handlers.navigate("uber_page"), outputs=pages, show_progress="hidden"
+        **queued("navigation", lambda: handlers.navigate("uber_page")),
+        outputs=pages,
+        show_progress="hidden",
     )
     btn_back_from_uber.click(
-        fn=lambda: handlers.navigate("home"), outputs=pages, show_progress="hidden"
+        **queued("navigation", lambda: handlers.navigate("home")),
+        outputs=pages,
+        show_progress="hidden",
     )
 
     # Share page events
     btn_cancel_share.click(
-        fn=handlers.go_back_to_home,
+        **queued("library", handlers.go_back_to_home),
         inputs=[current_user_state],
         outputs=pages + [podcast_list_state],
         show_progress="hidden",
     )
 
     btn_copy_link.click(
-        fn=handlers.copy_share_link,
+        **queued("navigation", handlers.copy_share_link),
         inputs=[share_link_input],
         outputs=[share_status_msg],
         js="(link) => { if (link) { navigator.clipboard.writeText(link); } }",
@@ -609,14 +679,14 @@ with gr.Blocks(
     )
 
     share_link_toggle.change(
-        fn=handlers.toggle_link_visibility,
+        **queued("navigation", handlers.toggle_link_visibility),
         inputs=[share_link_toggle],
         outputs=[share_status_msg],
         show_progress="hidden",
     )
 
     btn_goto_login.click(
-        fn=handlers.handle_login_click,
+        **queued("navigation", handlers.handle_login_click),
         inputs=[current_user_state],
         outputs=[current_user_state, btn_goto_login]
         + pages
@@ -632,20 +702,20 @@ with gr.Blocks(
     )
 
     btn_request_code.click(
-        fn=handlers.handle_login_request,
+        **queued("login", handlers.handle_login_request),
         inputs=[login_email_input],
         outputs=[login_status_msg, code_input_group],
         show_progress="hidden",
     )
     btn_verify_code.click(
-        fn=handlers.handle_code_verify,
+        **queued("login", handlers.handle_code_verify),
         inputs=[login_email_input, login_code_input],
         outputs=[login_status_msg, current_user_state, btn_goto_login]
         + pages
         + [btn_quelle],
         show_progress="hidden",
     ).then(
-        fn=handlers.refresh_podcasts_for_user,
+        **queued("library", handlers.refresh_podcasts_for_user),
         inputs=[current_user_state],
         outputs=[podcast_list_state],
         show_progress="hidden",
@@ -653,12 +723,12 @@ with gr.Blocks(
 
     # Skript generieren + Cancel
     skript_task = btn_skript_generieren.click(
-        fn=handlers.validate_and_show_loading,
+        **queued("library", handlers.validate_and_show_loading),
         inputs=[textbox_thema, source_url, file_upload, current_user_state],
         outputs=pages,
         show_progress="hidden",
     ).then(
-        fn=handlers.generate_script_wrapper,
+        **queued("script", handlers.generate_script_wrapper),
         inputs=[
             textbox_thema,
             dropdown_dauer,
@@ -676,8 +746,27 @@ with gr.Blocks(
         show_progress="hidden",
     )
 
+    # Vorab-Synthese, während das Skript geprüft und bearbeitet wird
+    presynthesis_inputs = [
+        text,
+        dropdown_sprache,
+        dropdown_speaker1,
+        dropdown_speaker2,
+        current_user_state,
+    ]
+    skript_task.then(
+        **queued("script", handlers.start_presynthesis),
+        inputs=presynthesis_inputs,
+        show_progress="hidden",
+    )
+    text.blur(
+        **queued("script", handlers.start_presynthesis),
+        inputs=presynthesis_inputs,
+        show_progress="hidden",
+    )
+
     btn_cancel_skript.click(
-        fn=lambda: handlers.navigate("home"),
+        **queued("navigation", handlers.cancel_script_job),
         inputs=None,
         outputs=pages,
         cancels=skript_task,
@@ -685,15 +774,17 @@ with gr.Blocks(
     )
 
     btn_zuruck_skript.click(
-        fn=lambda: handlers.navigate("home"), outputs=pages, show_progress="hidden"
+        **queued("navigation", lambda: handlers.navigate("home")),
+        outputs=pages,
+        show_progress="hidden",
     )
 
     podcast_task = btn_podcast_generieren.click(
-        fn=lambda: handlers.navigate("loading podcast"),
+        **queued("navigation", handlers.show_podcast_loading),
         outputs=pages,
         show_progress="hidden",
     ).success(
-        fn=handlers.run_audio_gen,
+        **queued("audio", handlers.run_audio_gen),
         inputs=[
             text,
             textbox_thema,
@@ -715,11 +806,12 @@ with gr.Blocks(
             btn_share_finish,
             btn_delete_finish,
         ],
-        show_progress="hidden",
+        show_progress="full",
+        show_progress_on=[podcast_progress],
     )
 
     btn_cancel_podcast.click(
-        fn=lambda: handlers.navigate("skript bearbeiten"),
+        **queued("navigation", handlers.cancel_podcast_job),
         inputs=None,
         outputs=pages,
         cancels=podcast_task,
@@ -727,28 +819,32 @@ with gr.Blocks(
     )
 
     btn_delete_finish.click(
-        fn=handlers.handle_delete_finish,
+        **queued("library", handlers.handle_delete_finish),
         inputs=[current_podcast_state, current_user_state],
         outputs=[podcast_list_state],
         show_progress="hidden",
-    ).then(fn=lambda: handlers.navigate("home"), outputs=pages, show_progress="hidden")
+    ).then(
+        **queued("navigation", lambda: handlers.navigate("home")),
+        outputs=pages,
+        show_progress="hidden",
+    )
 
     btn_share_finish.click(
-        fn=handlers.handle_share_click,
+        **queued("navigation", handlers.handle_share_click),
         inputs=[current_podcast_state],
         outputs=pages + [share_podcast_title, share_link_input],
         show_progress="hidden",
     )
 
     btn_zuruck_audio.click(
-        fn=handlers.navigate_home_and_refresh_podcasts,
+        **queued("library", handlers.navigate_home_and_refresh_podcasts),
         inputs=[current_user_state],
         outputs=pages + [podcast_list_state],
         show_progress="hidden",
     )
 
     demo.load(
-        fn=handlers.refresh_podcasts_for_user,
+        **queued("library", handlers.refresh_podcasts_for_user),
         inputs=[current_user_state],
         outputs=[podcast_list_state],
         show_progress="hidden",
@@ -756,4 +852,4 @@ with gr.Blocks(
 
 
 if __name__ == "__main__":
-    demo.queue().launch()
+    configure_queue(demo).launch()
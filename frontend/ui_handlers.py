@@ -1,8 +1,6 @@
 import gradio as gr
 import sys
 import os
-import shutil
-import re
 from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -10,15 +8,27 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 from .controller import (
     generate_script,
     get_podcasts_for_user,
+    count_podcasts_for_user,
+    MAX_PODCASTS_PER_USER,
+    PodcastPage,
+    BACKEND_STARTUP_WAIT,
+    is_starting,
+    wait_until_ready,
     delete_podcast,
-    get_absolute_audio_path,
     request_login_code,
     verify_login_code,
     get_user_display_name,
     process_source_input,
     generate_audio_only,
+    presynthesize_script,
     save_generated_podcast,
 )
+from .media import audio_player_html, download_url
+from .concurrency import notify_if_busy
+from services import cancellation
+from services.cancellation import CancellationToken
+from services.exceptions import OperationCancelledError
+from services.tts_progress import format_eta
 
 # Page names must match the order of pages in ui.py
 PAGE_NAMES = [
@@ -110,14 +120,29 @@ def navigate(target):
 def on_play_click(audio_path, podcast_title):
     """Startet den Audio-Player mit dem richtigen File."""
     nav_updates = navigate("audio player")
-    full_path = get_absolute_audio_path(audio_path)
     title_md = f"<div style='text-align: center; margin-bottom: 20px;'><h2>🎙️ {podcast_title}</h2></div>"
     return nav_updates + (
-        gr.update(value=full_path, autoplay=True),
+        gr.update(value=audio_player_html(audio_path)),
         gr.update(value=title_md),
     )
 
 
+def wait_for_backend() -> bool:
+    """
+    Lets requests that arrive during the startup warm-up wait for it instead
+    of blocking in the lazy imports or the database initialization; False if
+    it is still not done. Every handler that reaches the backend calls it.
+    """
+    if not is_starting():
+        return True
+    gr.Info("Der Server wird gerade gestartet – deine Anfrage startet gleich.")
+    wait_until_ready(BACKEND_STARTUP_WAIT)
+    if is_starting():
+        gr.Warning("Der Server startet noch. Bitte versuche es gleich noch einmal.")
+        return False
+    return True
+
+
 def generate_script_wrapper(
     thema,
     dauer,
@@ -130,27 +155,30 @@ def generate_script_wrapper(
     source_url,
     file_upload,
     user_data=None,
+    request: gr.Request = None,
 ):
     """
     Generates a podcast script from validated input.
     """
+    if not wait_for_backend():
+        return ("",) + navigate("home") + (gr.update(),)
+
     # Double check limit
     if user_data:
         user_id = user_data["id"]
-        podcasts = get_podcasts_for_user(user_id)
-        if len(podcasts) >= 10:
-            gr.Warning("Limit erreicht: Maximal 10 Podcasts.")
+        if count_podcasts_for_user(user_id) >= MAX_PODCASTS_PER_USER:
+            gr.Warning(f"Limit erreicht: Maximal {MAX_PODCASTS_PER_USER} Podcasts.")
             return ("",) + navigate("home") + (gr.update(),)
 
     has_thema = thema and thema.strip()
     has_source_url = source_url and source_url.strip()
-    has_file = file_upload is not None
+    has_file = bool(file_upload)
 
     if not (has_thema or has_source_url or has_file):
         return ("",) + navigate("home") + (gr.update(),)
 
     has_url = source_url and source_url.strip()
-    has_file = file_upload is not None
+    has_file = bool(file_upload)
 
     thema_update = gr.update()
 
@@ -169,6 +197,7 @@ def generate_script_wrapper(
             if not has_thema:
                 return ("",) + navigate("home") + (gr.update(),)
 
+    session, token = _start_job(request)
     try:
         script_text = generate_script(
             thema=thema,
@@ -179,28 +208,35 @@ def generate_script_wrapper(
             speaker2=speaker2,
             role2=role2,
             source_text=source_text,
+            cancel_token=token,
         )
         return (script_text,) + navigate("skript bearbeiten") + (thema_update,)
+    except OperationCancelledError:
+        return ("",) + navigate("home") + (gr.update(),)
     except Exception as e:
         gr.Warning(f"Fehler bei der Skript-Generierung: {str(e)}")
         return ("",) + navigate("home") + (gr.update(),)
+    finally:
+        _end_job(session, token)
 
 
 def validate_and_show_loading(thema, source_url, file_upload, user_data):
     """Validates input before showing loading page. Returns navigation updates or warning."""
+    if not wait_for_backend():
+        return navigate("home")
+
     # Check podcast limit
     user_id = user_data["id"] if user_data else None
-    if user_id:
-        podcasts = get_podcasts_for_user(user_id)
-        if len(podcasts) >= 10:
-            gr.Warning(
-                "Du hast das Limit von 10 Podcasts erreicht. Bitte lösche alte Podcasts."
-            )
-            return navigate("home")
+    if user_id and count_podcasts_for_user(user_id) >= MAX_PODCASTS_PER_USER:
+        gr.Warning(
+            f"Du hast das Limit von {MAX_PODCASTS_PER_USER} Podcasts erreicht. "
+            "Bitte lösche alte Podcasts."
+        )
+        return navigate("home")
 
     has_thema = thema and thema.strip()
     has_url = source_url and source_url.strip()
-    has_file = file_upload is not None
+    has_file = bool(file_upload)
 
     if not (has_thema or has_url or has_file):
         gr.Warning(
@@ -208,18 +244,95 @@ def validate_and_show_loading(thema, source_url, file_upload, user_data):
         )
         return navigate("home")
 
+    notify_if_busy("script")
     return navigate("loading script")
 
 
-def run_audio_gen(script_text, thema, dauer, sprache, s1, s2, r1, r2, user_data):
+def show_podcast_loading():
+    """Shows the loading page before the audio generation is queued."""
+    notify_if_busy("audio")
+    return navigate("loading podcast")
+
+
+def tts_progress_reporter(progress):
+    """Forwards TTS progress (chunks, ETA) to a gr.Progress bar."""
+
+    def report(p):
+        progress(
+            p.fraction,
+            desc=f"Abschnitt {p.done_chunks} von {p.total_chunks} · {format_eta(p.eta)}",
+        )
+
+    return report
+
+
+def run_audio_gen(
+    script_text,
+    thema,
+    dauer,
+    sprache,
+    s1,
+    s2,
+    r1,
+    r2,
+    user_data,
+    request: gr.Request = None,
+    progress=gr.Progress(),
+):
     """Podcast aus dem Skript bauen, Player starten und Liste aktualisieren."""
+    if not wait_for_backend():
+        yield navigate("skript bearbeiten") + tuple(gr.update() for _ in range(7))
+        return
+
     user_id = user_data["id"] if user_data else 1
+    session, token = _start_job(request)
+    try:
+        yield from _run_audio_gen(
+            script_text,
+            thema,
+            dauer,
+            sprache,
+            s1,
+            s2,
+            r1,
+            r2,
+            user_id,
+            progress,
+            token,
+            _speculative_key(user_data, request),
+        )
+    finally:
+        _end_job(session, token)
+
 
+def _run_audio_gen(
+    script_text,
+    thema,
+    dauer,
+    sprache,
+    s1,
+    s2,
+    r1,
+    r2,
+    user_id,
+    progress,
+    token,
+    speculative_key,
+):
     # GENERATE IN MEMORY
     try:
         audio_obj = generate_audio_only(
-            script_text=script_text, sprache=sprache, speaker1=s1, speaker2=s2
+            script_text=script_text,
+            sprache=sprache,
+            speaker1=s1,
+            speaker2=s2,
+            on_progress=tts_progress_reporter(progress),
+            cancel_token=token,
+            speculative_key=speculative_key,
         )
+    except OperationCancelledError:
+        yield tuple([gr.update() for _ in range(16)])
+        return
     except Exception as e:
         gr.Error(f"Fehler bei Generierung des Podcasts! {str(e)}")
         yield tuple([gr.update() for _ in range(16)])
@@ -241,56 +354,129 @@ def run_audio_gen(script_text, thema, dauer, sprache, s1, s2, r1, r2, user_data)
             user_id=user_id,
             role1=r1,
             role2=r2,
+            cancel_token=token,
         )
+    except OperationCancelledError:
+        yield tuple([gr.update() for _ in range(16)])
+        return
     except Exception as e:
         gr.Error(f"Fehler beim Speichern! {str(e)}")
         yield tuple([gr.update() for _ in range(16)])
         return
 
-    # Create user download file
-    try:
-        safe_thema = re.sub(r'[\\/*?:"<>|]', "", thema).replace(" ", "_")
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        download_filename = f"Podcast-{safe_thema}-{date_str}.mp3"
-
-        abs_audio_path = get_absolute_audio_path(audio_path)
-        output_dir = os.path.dirname(abs_audio_path)
-        download_path = os.path.join(output_dir, download_filename)
-
-        shutil.copy2(abs_audio_path, download_path)
-    except Exception as e:
-        print(f"Error creating download file: {e}")
-        download_path = get_absolute_audio_path(audio_path)
+    # Friendly file name via Content-Disposition, no copy of the MP3
+    download_link = download_url(audio_path, thema, datetime.now().date())
 
     # refresh and navigate
     updated_data = get_podcasts_for_user(user_id=user_id)
     nav_updates = navigate("audio player")
-    full_path = get_absolute_audio_path(audio_path)
     title_md = f"<div style='text-align: center; margin-bottom: 20px;'><h2>🎙️ {thema}</h2></div>"
 
     yield nav_updates + (
-        gr.update(value=full_path, autoplay=True),
+        gr.update(value=audio_player_html(audio_path)),
         updated_data,
         gr.update(value=title_md),
         podcast_data,  # current_podcast_state
-        gr.update(value=download_path, visible=True),  # btn_download_finish
+        gr.update(link=download_link, visible=True),  # btn_download_finish
         gr.update(visible=True),  # btn_share_finish
         gr.update(visible=True),  # btn_delete_finish
     )
 
 
-def delete_podcast_handler(podcast_id: int, user_data):
-    """Handles podcast deletion and returns updated list."""
+def start_presynthesis(
+    script_text, sprache, s1, s2, user_data, request: gr.Request = None
+):
+    """
+    Starts synthesizing the displayed script in the background, so that
+    "Podcast Generieren" only has to finish the rest (opt-in, SPECULATIVE_TTS).
+    """
+    key = _speculative_key(user_data, request)
+    if key is not None and script_text and script_text.strip():
+        presynthesize_script(key, script_text, sprache, s1, s2)
+
+
+def _speculative_key(user_data, request):
+    # Budget per user; guests are keyed by their Gradio session
+    if user_data:
+        return ("user", user_data["id"])
+    session = getattr(request, "session_hash", None)
+    return ("session", session) if session else None
+
+
+def _start_job(request):
+    """Cancellation token for the session's running job (see _cancel_job)."""
+    session = getattr(request, "session_hash", None)
+    if session is None:
+        return None, CancellationToken()
+    return session, cancellation.register(session)
+
+
+def _end_job(session, token):
+    if session is not None:
+        cancellation.release(session, token)
+
+
+def _cancel_job(request, target):
+    # The worker stops before its next LLM attempt or TTS chunk
+    session = getattr(request, "session_hash", None)
+    if session is not None:
+        cancellation.cancel(session)
+    return navigate(target)
+
+
+def cancel_script_job(request: gr.Request = None):
+    """Stops the session's script generation and returns home."""
+    return _cancel_job(request, "home")
+
+
+def cancel_podcast_job(request: gr.Request = None):
+    """Stops the session's audio generation and returns to the script."""
+    return _cancel_job(request, "skript bearbeiten")
+
+
+def delete_podcast_handler(podcast_id: int, user_data, podcasts=None):
+    """
+    Handles podcast deletion and returns updated list. With the currently
+    shown list, only the deleted card is removed (loaded pages are kept).
+    """
+    if not wait_for_backend():
+        return gr.update()
     if not user_data:
         return get_podcasts_for_user(user_id=None)
 
     user_id = user_data["id"]
-    delete_podcast(podcast_id, user_id)
-    return get_podcasts_for_user(user_id=user_id)
+    deleted = delete_podcast(podcast_id, user_id)
+    if podcasts is None:
+        return get_podcasts_for_user(user_id=user_id)
+    if not deleted:
+        return gr.update()
+    return PodcastPage(
+        [p for p in podcasts if p["id"] != podcast_id],
+        has_more=has_more_podcasts(podcasts),
+    )
+
+
+def has_more_podcasts(podcasts) -> bool:
+    """True if the last loaded page reported older podcasts."""
+    return getattr(podcasts, "has_more", False)
+
+
+def load_more_podcasts(podcasts, user_data):
+    """Appends the next page (keyset: older than the last shown podcast)."""
+    if not user_data or not podcasts:
+        return gr.update(), gr.update(visible=False)
+    if not wait_for_backend():
+        return gr.update(), gr.update()
+    more = get_podcasts_for_user(user_data["id"], before_id=podcasts[-1]["id"])
+    if not more:
+        return PodcastPage(podcasts), gr.update(visible=False)
+    return PodcastPage(podcasts + more, has_more=more.has_more), gr.update()
 
 
 def handle_login_request(email):
     """Handles login code request."""
+    if not wait_for_backend():
+        return gr.update(), gr.update()
     success, message = request_login_code(email)
     if success:
         return gr.update(value=message, visible=True), gr.update(visible=True)
@@ -299,11 +485,13 @@ def handle_login_request(email):
 
 def handle_code_verify(email, code):
     """Handles login code verification."""
-    success, user_data, message = verify_login_code(email, code)
-
     # Check how many pages exist in navigate() to prevent errors
     num_pages = len(PAGE_NAMES)
 
+    if not wait_for_backend():
+        return tuple(gr.update() for _ in range(num_pages + 4))
+    success, user_data, message = verify_login_code(email, code)
+
     if success:
         short_name = get_user_display_name(user_data)
         msg = gr.update(value=message, visible=True)
@@ -340,12 +528,16 @@ def handle_login_click(current_user):
 
 def refresh_podcasts_for_user(user_data):
     """Refreshes podcast list for the current user."""
+    if not wait_for_backend():
+        return gr.update()
     user_id = user_data["id"] if user_data else None
     return get_podcasts_for_user(user_id=user_id)
 
 
 def navigate_home_and_refresh_podcasts(user_data):
     """Navigates to home page and refreshes podcast list."""
+    if not wait_for_backend():
+        return navigate("home") + (gr.update(),)
     user_id = user_data["id"] if user_data else None
     podcast_list = get_podcasts_for_user(user_id=user_id)
     return navigate("home") + (podcast_list,)
@@ -399,14 +591,16 @@ def show_source_preview(file_path, url, current_thema):
 
 
 def toggle_quelle_button(file_obj, url_text):
-    """Show button if either file is uploaded or URL is entered."""
-    has_file = file_obj is not None
+    """Show button if at least one file is uploaded or a URL is entered."""
+    has_file = bool(file_obj)
     has_url = url_text and url_text.strip()
     return gr.update(visible=has_file or has_url)
 
 
 def handle_delete_finish(podcast_data, user_data):
     """Deletes podcast from completion page."""
+    if not wait_for_backend():
+        return gr.update()
     if not podcast_data or not user_data:
         return get_podcasts_for_user(user_data["id"] if user_data else None)
     pid = podcast_data.get("id")
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
 from pydub import AudioSegment
 
@@ -8,8 +8,13 @@ from database.models import PodcastStimme
 
 class ILLMService(ABC):
     @abstractmethod
-    def generate_script(self, prompt: str, config: dict) -> str:
-        """Erzeugt ein Skript basierend auf dem Prompt."""
+    def generate_script(
+        self, prompt: str, config: dict, cancel_token: Any = None
+    ) -> str:
+        """
+        Erzeugt ein Skript basierend auf dem Prompt. Ein abgebrochenes
+        cancel_token (services.cancellation) beendet Retries vorzeitig.
+        """
         pass
 
 
@@ -25,9 +30,15 @@ class ITTSService(ABC):
         sprache: str,
         primary_voice: PodcastStimme,
         secondary_voice: PodcastStimme,
+        on_progress: Callable[[Any], None] | None = None,
+        cancel_token: Any = None,
+        presynthesized: Callable[[str], AudioSegment | None] | None = None,
     ) -> AudioSegment | None:
         """
         Muss von der Unterklasse implementiert werden.
+        on_progress erhält nach jedem Chunk ein services.tts_progress.TTSProgress;
+        ein abgebrochenes cancel_token beendet die Synthese vor dem nächsten Chunk;
+        presynthesized liefert vorab erzeugtes Audio je Block-Schlüssel (oder None).
         """
         pass
 
@@ -53,19 +64,39 @@ class IWorkflow(ABC):
         hauptstimme: str,
         zweitstimme: str | None,
         source_text: str | None = None,
+        cancel_token: Any = None,
     ) -> str:
         """Generiert das Podcast-Skript."""
         pass
 
     @abstractmethod
     def generate_audio_obj_step(
-        self, script_text: str, sprache: str, hauptstimme: str, zweitstimme: str | None
+        self,
+        script_text: str,
+        sprache: str,
+        hauptstimme: str,
+        zweitstimme: str | None,
+        on_progress: Callable[[Any], None] | None = None,
+        cancel_token: Any = None,
+        speculative_key: Any = None,
     ) -> Any:
         """Generiert das Audio-Objekt (z.B. Pydub AudioSegment), ohne es zu speichern."""
         pass
 
     @abstractmethod
-    def save_audio_file(self, audio_segment: Any) -> str:
+    def presynthesize_audio(
+        self,
+        user_key: Any,
+        script_text: str,
+        sprache: str,
+        hauptstimme: str,
+        zweitstimme: str | None,
+    ) -> int:
+        """Synthetisiert das Skript spekulativ vorab (opt-in); Anzahl neuer Blöcke."""
+        pass
+
+    @abstractmethod
+    def save_audio_file(self, audio_segment: Any, cancel_token: Any = None) -> str:
         """Speichert ein Audio-Objekt als Datei und gibt den Pfad zurück."""
         pass
 
@@ -103,8 +134,15 @@ class IWorkflow(ABC):
         pass
 
     @abstractmethod
-    def get_podcasts_data(self, user_id: int | None) -> List[Dict[str, Any]]:
-        """Gibt eine Liste von Podcasts für einen Benutzer zurück."""
+    def get_podcasts_data(
+        self, user_id: int | None, before_id: int | None = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Gibt eine Seite der Podcasts eines Benutzers zurück (neueste zuerst)."""
+        pass
+
+    @abstractmethod
+    def count_podcasts(self, user_id: int | None) -> int:
+        """Gibt die Anzahl der Podcasts eines Benutzers zurück."""
         pass
 
     @abstractmethod
@@ -1,6 +1,9 @@
 import logging
 import sys
 import os
+import time
+
+import uvicorn
 from dotenv import load_dotenv
 
 # --------------------------------------------------
@@ -11,11 +14,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger("MAIN_SCRIPT")
 
+# Zeitbudget vom Prozessstart bis zur ausgelieferten UI (ohne Backend-Warm-up)
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", 5))
+
+
+def create_app(demo):
+    """
+    FastAPI-App mit der Gradio-UI unter "/", den MP3-Dateien unter /media
+    und der REST-API für Batch-Generierung unter /api.
+    """
+    import gradio as gr
+    from fastapi import FastAPI
+
+    from frontend.api import router as api_router
+    from frontend.media import router as media_router
+
+    app = FastAPI()
+    app.include_router(media_router)
+    app.include_router(api_router)
+    return gr.mount_gradio_app(
+        app, demo, path="/", favicon_path="frontend/logo/logo.ico"
+    )
+
 
 def main():
     """
     Starts the Podcast Generator UI.
     """
+    t0 = time.perf_counter()
     # Load .env file explicitly
     env_path = os.path.join(os.path.dirname(__file__), ".env")
     load_dotenv(env_path)
@@ -26,9 +52,22 @@ def main():
         if project_root not in sys.path:
             sys.path.insert(0, project_root)
 
+        # DB, LLM und TTS starten im Hintergrund, die UI braucht sie nicht
+        from frontend.controller import start_warm_up
+
+        start_warm_up()
+
         # Import Demo after path setup
         from frontend.ui import demo
 
+        cold_start = time.perf_counter() - t0
+        logger.info(f"UI built in {cold_start:.2f}s")
+        if cold_start > STARTUP_BUDGET_SECONDS:
+            logger.warning(
+                f"Cold start took {cold_start:.2f}s "
+                f"(budget {STARTUP_BUDGET_SECONDS:.0f}s)"
+            )
+
         logger.info("Starting Gradio UI...")
         print("Starting Podcast Generator UI...")
 
@@ -36,12 +75,11 @@ def main():
         server_name = os.getenv("HOST", "127.0.0.1")
         server_port = int(os.getenv("PORT", "7860"))
 
-        demo.queue()
-        demo.launch(
-            favicon_path="frontend/logo/logo.ico",
-            server_name=server_name,
-            server_port=server_port,
-        )
+        # Begrenzte Warteschlange; Limits je Event-Klasse in frontend/concurrency.py
+        from frontend.concurrency import configure_queue
+
+        configure_queue(demo)
+        uvicorn.run(create_app(demo), host=server_name, port=server_port)
 
     except Exception as e:
         logger.error(f"Failed to start UI: {e}", exc_info=True)
@@ -1,4 +1,5 @@
 from .base_repo import BaseRepo
+from .unit_of_work import UnitOfWork
 from .user_repo import UserRepo
 from .job_repo import JobRepo
 from .podcast_repo import PodcastRepo
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from .unit_of_work import UnitOfWork
 
 
 class BaseRepo:
@@ -27,6 +27,14 @@ class BaseRepo:
         self.db.refresh(obj)
         return obj
 
+    def add_all(self, objs):
+        """
+        Fügt mehrere Objekte mit einem einzigen Commit hinzu (z.B. für Importe)
+        """
+        with UnitOfWork(self.db) as uow:
+            uow.stage(*objs)
+        return objs
+
     def delete(self, obj):
         """
         Löscht ein Objekt
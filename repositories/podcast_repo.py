@@ -1,4 +1,6 @@
-from database.models import Podcast, Textbeitrag, Konvertierungsauftrag
+from sqlalchemy import delete, func, select, update
+
+from database.models import Podcast, Quelldatei, Textbeitrag, Konvertierungsauftrag
 from .base_repo import BaseRepo
 
 
@@ -18,12 +20,120 @@ class PodcastRepo(BaseRepo):
             .all()
         )
 
+    def count_by_user_id(self, user_id) -> int:
+        """
+        Zählt die Podcasts eines Benutzers per COUNT(*) (ohne Objekte zu laden)
+        """
+        return (
+            self.db.query(func.count(Podcast.podcastId))
+            .join(
+                Konvertierungsauftrag,
+                Podcast.auftragId == Konvertierungsauftrag.auftragId,
+            )
+            .join(Textbeitrag, Konvertierungsauftrag.textId == Textbeitrag.textId)
+            .filter(Textbeitrag.userId == user_id)
+            .scalar()
+        )
+
+    def get_cards_by_user_id(self, user_id, limit: int = 10, before_id: int = None):
+        """
+        Liefert die Daten für die Podcast-Karten eines Benutzers (neueste zuerst)
+        in einer einzigen Abfrage: nur die benötigten Spalten, Sortierung und
+        LIMIT in SQL, ohne Nachladen von Auftrag und Textbeitrag pro Zeile.
+
+        Weitere Seiten per Keyset-Pagination: before_id ist die kleinste
+        podcastId der vorherigen Seite, es wird also nie per OFFSET gezählt.
+        """
+        query = (
+            self.db.query(
+                Podcast.podcastId,
+                Podcast.titel,
+                Podcast.realdauer,
+                Podcast.erstelldatum,
+                Podcast.dateipfadAudio,
+                Konvertierungsauftrag.hauptstimmeName,
+                Konvertierungsauftrag.hauptstimmeRolle,
+                Konvertierungsauftrag.zweitstimmeName,
+                Konvertierungsauftrag.zweitstimmeRolle,
+                Textbeitrag.sprache,
+            )
+            .join(
+                Konvertierungsauftrag,
+                Podcast.auftragId == Konvertierungsauftrag.auftragId,
+            )
+            .join(Textbeitrag, Konvertierungsauftrag.textId == Textbeitrag.textId)
+            .filter(Textbeitrag.userId == user_id)
+        )
+        if before_id is not None:
+            query = query.filter(Podcast.podcastId < before_id)
+        return query.order_by(Podcast.podcastId.desc()).limit(limit).all()
+
     def get_all_sorted_by_date_desc(self):
         """
         Liefert alle Podcasts nach Erstelldatum absteigend sortiert
         """
         return self.db.query(Podcast).order_by(Podcast.erstelldatum.desc()).all()
 
+    def delete_owned(self, podcast_id: int, user_id: int):
+        """
+        Löscht einen Podcast nur, wenn er dem Benutzer gehört, samt seinem
+        Auftrag. Der Textbeitrag wird nur mitgelöscht, wenn kein anderer
+        Auftrag mehr auf ihn verweist. Eine Abfrage prüft den Besitz und
+        liefert die IDs; gelöscht wird danach per ID in der Transaktion der
+        Session.
+        Liefert (dateipfadAudio, titel, erstelldatum, ...) oder None.
+        """
+        owned = (
+            self.db.query(
+                Podcast.dateipfadAudio,
+                Podcast.titel,
+                Podcast.erstelldatum,
+                Podcast.auftragId,
+                Textbeitrag.textId,
+            )
+            .join(
+                Konvertierungsauftrag,
+                Podcast.auftragId == Konvertierungsauftrag.auftragId,
+            )
+            .join(Textbeitrag, Konvertierungsauftrag.textId == Textbeitrag.textId)
+            .filter(Podcast.podcastId == podcast_id, Textbeitrag.userId == user_id)
+            .first()
+        )
+        if owned is None:
+            return None
+
+        result = self.db.execute(
+            delete(Podcast)
+            .where(Podcast.podcastId == podcast_id)
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            return None
+        self.db.execute(
+            delete(Konvertierungsauftrag)
+            .where(Konvertierungsauftrag.auftragId == owned.auftragId)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Weitere Aufträge auf demselben Text behalten ihn (und ihre Quellen)
+        unused = ~(
+            select(Konvertierungsauftrag.auftragId)
+            .where(Konvertierungsauftrag.textId == owned.textId)
+            .exists()
+        )
+        self.db.execute(
+            update(Quelldatei)
+            .where(Quelldatei.textId == owned.textId, unused)
+            .values(textId=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            delete(Textbeitrag)
+            .where(Textbeitrag.textId == owned.textId, unused)
+            .execution_options(synchronize_session=False)
+        )
+        return owned
+
     def delete_by_id(self, podcast_id: int):
         """
         Löscht einen Podcast anhand seiner ID
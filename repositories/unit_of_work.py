@@ -0,0 +1,43 @@
+class UnitOfWork:
+    """
+    Sammelt mehrere Objekte und schreibt sie mit genau einem Commit.
+
+    with UnitOfWork(session) as uow:
+        uow.stage(text, job, podcast)
+        uow.flush()  # optional, falls IDs schon vor dem Commit gebraucht werden
+
+    Beim Verlassen ohne Fehler wird committet, sonst zurückgerollt. Nach dem
+    Commit bleiben die Objekte geladen (kein erneutes SELECT pro Objekt).
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.session.rollback()
+        elif not self._committed:
+            self.commit()
+        return False
+
+    def stage(self, *objs):
+        """Merkt Objekte für den nächsten Flush/Commit vor (ohne Roundtrip)."""
+        self.session.add_all(objs)
+        return objs[0] if len(objs) == 1 else objs
+
+    def flush(self):
+        """Schreibt alle vorgemerkten Objekte in einem Flush, z.B. um IDs zu erhalten."""
+        self.session.flush()
+
+    def commit(self):
+        expire_on_commit = self.session.expire_on_commit
+        self.session.expire_on_commit = False
+        try:
+            self.session.commit()
+        finally:
+            self.session.expire_on_commit = expire_on_commit
+        self._committed = True
@@ -0,0 +1,86 @@
+import logging
+import os
+import queue
+import re
+import threading
+from datetime import date
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "Output")
+
+_removals: "queue.Queue[str]" = queue.Queue()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def download_copy_name(titel: str, datum: date) -> str:
+    """
+    Lesbarer Dateiname für Downloads (per Content-Disposition). Ältere
+    Versionen legten unter diesem Namen eine Kopie neben der MP3 an.
+    """
+    safe_thema = re.sub(r'[\\/*?:"<>|]', "", titel or "").replace(" ", "_")
+    return f"Podcast-{safe_thema}-{datum.strftime('%Y-%m-%d')}.mp3"
+
+
+def podcast_files(audio_path: str, titel: str, datum: date) -> list[str]:
+    """Alle Dateien eines Podcasts (MP3 und ggf. Download-Kopie älterer Versionen)."""
+    if not audio_path:
+        return []
+    if not os.path.isabs(audio_path):
+        audio_path = os.path.join(PROJECT_ROOT, audio_path)
+    copy_path = os.path.join(
+        os.path.dirname(audio_path), download_copy_name(titel, datum)
+    )
+    return [audio_path, copy_path]
+
+
+def is_inside_output(path: str) -> bool:
+    """True, wenn path (nach Auflösen von Symlinks) in Output/ liegt."""
+    output = os.path.realpath(OUTPUT_DIR)
+    try:
+        return os.path.commonpath([os.path.realpath(path), output]) == output
+    except ValueError:  # anderes Laufwerk (Windows)
+        return False
+
+
+def _remove_worker() -> None:
+    while True:
+        path = _removals.get()
+        try:
+            if not is_inside_output(path):
+                logger.warning(
+                    f"Datei außerhalb von Output wird nicht gelöscht: {path}"
+                )
+            else:
+                os.remove(path)
+                logger.info(f"Audiodatei gelöscht: {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Audiodatei konnte nicht gelöscht werden ({path}): {e}")
+        finally:
+            _removals.task_done()
+
+
+def schedule_removal(paths: list[str]) -> None:
+    """
+    Übergibt Dateien an einen Hintergrund-Thread zum Löschen, damit der
+    Request nicht auf das Dateisystem warten muss.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(
+                target=_remove_worker, name="audio-cleanup", daemon=True
+            )
+            _worker.start()
+    for path in paths:
+        _removals.put(path)
+
+
+def wait_for_removals() -> None:
+    """Blockiert, bis alle eingereihten Dateien verarbeitet sind."""
+    _removals.join()
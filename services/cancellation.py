@@ -0,0 +1,70 @@
+"""
+Kooperativer Abbruch laufender Generierungen.
+
+Gradio beendet beim Abbrechen nur das Event; der Worker-Thread liefe weiter
+und würde z.B. alle restlichen TTS-Chunks synthetisieren. Deshalb bekommt
+jeder Job ein CancellationToken, das LLM-, TTS- und Export-Schritt zwischen
+ihren Teilschritten prüfen. Der Abbrechen-Button setzt das Token der Sitzung
+(register/cancel/release, Schlüssel ist der Gradio-Session-Hash).
+"""
+
+import threading
+from typing import Optional
+
+from .exceptions import OperationCancelledError
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelledError("Vorgang wurde abgebrochen")
+
+    def sleep(self, seconds: float) -> None:
+        """Wartet (z.B. Retry-Backoff), endet aber sofort beim Abbruch."""
+        if self._event.wait(seconds):
+            raise OperationCancelledError("Vorgang wurde abgebrochen")
+
+
+def check(token: Optional[CancellationToken]) -> None:
+    """raise_if_cancelled für optionale Tokens."""
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+_tokens: dict[str, CancellationToken] = {}
+_tokens_lock = threading.Lock()
+
+
+def register(key: str) -> CancellationToken:
+    """Neues Token für den Job einer Sitzung (ersetzt ein vorheriges)."""
+    token = CancellationToken()
+    with _tokens_lock:
+        _tokens[key] = token
+    return token
+
+
+def cancel(key: str) -> bool:
+    """Bricht den laufenden Job der Sitzung ab; False, wenn keiner läuft."""
+    with _tokens_lock:
+        token = _tokens.pop(key, None)
+    if token is None:
+        return False
+    token.cancel()
+    return True
+
+
+def release(key: str, token: CancellationToken) -> None:
+    """Entfernt das Token nach Jobende (nur, wenn es noch das aktuelle ist)."""
+    with _tokens_lock:
+        if _tokens.get(key) is token:
+            del _tokens[key]
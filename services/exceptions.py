@@ -8,3 +8,19 @@ class LLMServiceError(Exception):
 
 class AuthenticationError(Exception):
     pass
+
+
+class SourceFetchError(Exception):
+    pass
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class ExtractionTimeoutError(ExtractionError):
+    pass
+
+
+class OperationCancelledError(Exception):
+    pass
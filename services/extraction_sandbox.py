@@ -0,0 +1,261 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from .exceptions import ExtractionError, ExtractionTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Grenzen pro Dokument bzw. Worker-Prozess (0 = kein Limit)
+EXTRACTION_MEMORY_MB = int(os.getenv("EXTRACTION_MEMORY_MB", 512))
+EXTRACTION_CPU_SECONDS = int(os.getenv("EXTRACTION_CPU_SECONDS", 30))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", 60))
+# Nach so vielen Aufträgen wird ein Worker durch einen frischen ersetzt
+EXTRACTION_MAX_JOBS_PER_WORKER = int(os.getenv("EXTRACTION_MAX_JOBS_PER_WORKER", 50))
+# So lange darf ein Worker nach "stop" noch nachliefern, bevor er beendet wird
+STOP_GRACE_SECONDS = 2.0
+
+
+def _address_space_bytes() -> Optional[int]:
+    """Current virtual memory size of this process (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _apply_limits(memory_mb: int, cpu_seconds: int) -> None:
+    """
+    Sets soft rlimits for the next job. The memory limit is headroom on top of
+    what the worker already maps (interpreter + imports), the CPU limit counts
+    from the CPU time used so far; exceeding it kills the worker (SIGXCPU).
+    """
+    try:
+        import resource
+    except ImportError:  # Windows: nur der Wall-Clock-Timeout greift
+        return
+
+    if memory_mb:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = (_address_space_bytes() or 0) + memory_mb * 1024 * 1024
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    if cpu_seconds:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        limit = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _stop_requested(conn) -> bool:
+    while conn.poll():
+        if conn.recv()[0] == "stop":
+            return True
+    return False
+
+
+def _worker_main(conn, memory_mb: int, cpu_seconds: int) -> None:
+    """
+    Worker loop. Receives ("job", func, args) and answers with one
+    ("item", value) per yielded value (or one for a plain return value),
+    followed by ("done", None) or ("error", message). Between two items the
+    worker checks for a ("stop",) message from the parent.
+    """
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message[0] != "job":
+            continue  # verspätetes "stop" eines bereits beendeten Auftrags
+        _, func, args = message
+        try:
+            _apply_limits(memory_mb, cpu_seconds)
+            result = func(*args)
+            if isinstance(result, Iterator):
+                try:
+                    for item in result:
+                        conn.send(("item", item))
+                        if _stop_requested(conn):
+                            break
+                finally:
+                    result.close()
+            else:
+                conn.send(("item", result))
+            conn.send(("done", None))
+        except (EOFError, OSError, BrokenPipeError):
+            return
+        except BaseException as e:
+            try:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+            except (OSError, BrokenPipeError):
+                return
+
+
+class _Worker:
+    """Ein Extraktions-Prozess samt Pipe zum Elternprozess."""
+
+    def __init__(self, ctx, memory_mb: int, cpu_seconds: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, memory_mb, cpu_seconds),
+            name="extraction-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.broken = False
+
+    def receive(self, deadline: float) -> tuple[str, Any]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self.conn.poll(remaining):
+            self.broken = True
+            raise ExtractionTimeoutError("Extraktion hat das Zeitlimit überschritten")
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.broken = True
+            raise ExtractionError(
+                f"Extraktions-Prozess beendet (Exit-Code {self.process.exitcode}), "
+                "vermutlich Speicher- oder CPU-Limit erreicht"
+            )
+
+    def stop(self) -> None:
+        """Asks the worker to abandon the current job and drains its output."""
+        try:
+            self.conn.send(("stop",))
+            deadline = time.monotonic() + STOP_GRACE_SECONDS
+            while self.receive(deadline)[0] == "item":
+                pass
+        except (ExtractionError, OSError):
+            self.broken = True
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    Pool von ressourcenbegrenzten Prozessen für das Parsen hochgeladener
+    Dokumente. Jeder Auftrag läuft mit Speicher- und CPU-rlimit und einem
+    Wall-Clock-Timeout; Ergebnisse werden über eine Pipe gestreamt. Hängende
+    oder abgestürzte Worker werden beendet und durch neue ersetzt, sodass ein
+    bösartiges PDF den Server-Prozess nicht beeinträchtigt.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        memory_mb: int = EXTRACTION_MEMORY_MB,
+        cpu_seconds: int = EXTRACTION_CPU_SECONDS,
+        timeout: float = EXTRACTION_TIMEOUT,
+        max_jobs_per_worker: int = EXTRACTION_MAX_JOBS_PER_WORKER,
+    ):
+        self.workers = workers
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+
+    @contextmanager
+    def _checkout(self) -> Iterator[_Worker]:
+        self._slots.acquire()
+        worker = None
+        try:
+            with self._lock:
+                while self._idle and worker is None:
+                    candidate = self._idle.pop()
+                    if candidate.process.is_alive():
+                        worker = candidate
+                    else:
+                        candidate.kill()
+            if worker is None:
+                worker = _Worker(self._ctx, self.memory_mb, self.cpu_seconds)
+            yield worker
+        finally:
+            if worker is not None:
+                self._release(worker)
+            self._slots.release()
+
+    def _release(self, worker: _Worker) -> None:
+        worker.jobs += 1
+        if (
+            worker.broken
+            or worker.jobs >= self.max_jobs_per_worker
+            or not worker.process.is_alive()
+        ):
+            worker.kill()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def stream(
+        self, func: Callable, *args, timeout: Optional[float] = None
+    ) -> Iterator:
+        """
+        Runs func(*args) in a sandboxed worker and yields its results as they
+        arrive. func may be a generator; closing the returned iterator early
+        stops the worker after its current item. The timeout (seconds) covers
+        the whole job. Raises ExtractionTimeoutError or ExtractionError.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        with self._checkout() as worker:
+            worker.conn.send(("job", func, args))
+            finished = False
+            try:
+                while True:
+                    kind, payload = worker.receive(deadline)
+                    if kind == "item":
+                        yield payload
+                        continue
+                    finished = True
+                    if kind == "error":
+                        worker.broken = True
+                        raise ExtractionError(payload)
+                    return
+            finally:
+                if not finished and not worker.broken:
+                    worker.stop()
+
+    def run(self, func: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Runs a plain (non-generator) func(*args) in a sandboxed worker."""
+        results = list(self.stream(func, *args, timeout=timeout))
+        return results[0] if results else None
+
+    def submit(self, func: Callable, *args, timeout: Optional[float] = None) -> Future:
+        """Like run(), but returns a Future (one dispatcher thread per worker)."""
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="sandbox"
+                )
+        return self._dispatcher.submit(self.run, func, *args, timeout=timeout)
+
+    def close(self) -> None:
+        """Terminates all idle workers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.shutdown(wait=False, cancel_futures=True)
+        for worker in idle:
+            worker.kill()
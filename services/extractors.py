@@ -0,0 +1,263 @@
+import logging
+import posixpath
+import re
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+from urllib.parse import unquote
+
+from lxml import etree
+from PyPDF2 import PdfReader
+
+from .html_extraction import HtmlStreamParser, body_text, document_to_text
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+EPUB_MIME = "application/epub+zip"
+HTML_MIME = "text/html"
+MARKDOWN_MIME = "text/markdown"
+TEXT_MIME = "text/plain"
+
+# Größe der Blöcke, die ein Extraktor höchstens auf einmal liest bzw. liefert
+TEXT_BLOCK_CHARS = 64 * 1024
+# HTML braucht für die Hauptinhalt-Erkennung den ganzen Baum; mehr wird nicht geparst
+MAX_MARKUP_BYTES = 5 * 1024 * 1024
+SNIFF_BYTES = 2048
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+_OPF_NS = "{http://www.idpf.org/2007/opf}"
+_HTML_MAGIC_RE = re.compile(rb"<!doctype html|<html[\s>]|<body[\s>]")
+
+Extractor = Callable[[str], Iterator[str]]
+
+_EXTRACTORS: dict[str, Extractor] = {}
+_EXTENSIONS: dict[str, str] = {}
+
+
+def register_extractor(mime: str, *extensions: str):
+    """
+    Registers a generator that yields the text of a file in chunks.
+    Chunks are concatenated as-is, so extractors add their own line breaks.
+    """
+
+    def decorator(func: Extractor) -> Extractor:
+        _EXTRACTORS[mime] = func
+        for ext in extensions:
+            _EXTENSIONS[ext] = mime
+        return func
+
+    return decorator
+
+
+def _sniff_zip(file_path: str) -> Optional[str]:
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            names = set(zf.namelist())
+            if "mimetype" in names:
+                with zf.open("mimetype") as f:
+                    if f.read(64).strip() == EPUB_MIME.encode():
+                        return EPUB_MIME
+            if "word/document.xml" in names:
+                return DOCX_MIME
+    except zipfile.BadZipFile:
+        pass
+    return None
+
+
+def sniff_mime(file_path: str) -> Optional[str]:
+    """
+    Determines the MIME type from the file's magic bytes, falling back to
+    the extension. Returns None for binary formats without an extractor.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+
+    if head.startswith(b"%PDF-"):
+        return PDF_MIME
+    if head.startswith(b"PK\x03\x04"):
+        return _sniff_zip(file_path)
+    if b"\x00" in head:
+        return None
+    if _HTML_MAGIC_RE.search(head.lower()):
+        return HTML_MIME
+    return _EXTENSIONS.get(Path(file_path).suffix.lower(), TEXT_MIME)
+
+
+def iter_text(file_path: str, mime: Optional[str] = None) -> Iterator[str]:
+    """Sandbox task: yields the text of a file chunk by chunk."""
+    mime = mime or sniff_mime(file_path)
+    extractor = _EXTRACTORS.get(mime)
+    if extractor is None:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {mime or 'binär'}")
+    yield from extractor(file_path)
+
+
+def _batched(lines: Iterable[str], size: int = TEXT_BLOCK_CHARS) -> Iterator[str]:
+    """Groups many short lines into chunks of roughly size characters."""
+    buffer: list[str] = []
+    length = 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _safe_xml_parser() -> etree.XMLParser:
+    # Keine externen Entities/DTDs aus hochgeladenen Dateien auflösen
+    return etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+def _parse_markup(chunks: Iterable[bytes]) -> Optional[etree._Element]:
+    parser = HtmlStreamParser()
+    received = 0
+    for chunk in chunks:
+        parser.feed(chunk[: MAX_MARKUP_BYTES - received])
+        received += len(chunk)
+        if received >= MAX_MARKUP_BYTES:
+            logger.warning(f"HTML-Datei nach {MAX_MARKUP_BYTES} Bytes gekürzt")
+            break
+    return parser.close()
+
+
+def iter_pdf_pages(
+    reader: PdfReader, start: int, stop: int
+) -> Iterator[Tuple[int, str, float]]:
+    """Yields (page_index, text, seconds) for the pages [start, stop)."""
+    for index in range(start, stop):
+        t0 = time.perf_counter()
+        try:
+            text = reader.pages[index].extract_text() or ""
+        except Exception as e:
+            logger.warning(f"PDF-Seite {index + 1} nicht lesbar: {e}")
+            text = ""
+        yield index, text, time.perf_counter() - t0
+
+
+@register_extractor(PDF_MIME, ".pdf")
+def _pdf_text(file_path: str) -> Iterator[str]:
+    reader = PdfReader(file_path)
+    for _, text, _ in iter_pdf_pages(reader, 0, len(reader.pages)):
+        if text:
+            yield text + "\n"
+
+
+@register_extractor(TEXT_MIME, ".txt")
+def _plain_text(file_path: str) -> Iterator[str]:
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        yield from iter(lambda: f.read(TEXT_BLOCK_CHARS), "")
+
+
+_MD_RULES = [
+    (re.compile(r"!\[[^\]]*\]\([^)]*\)"), ""),  # Bilder
+    (re.compile(r"\[([^\]]*)\]\([^)]*\)"), r"\1"),  # Links -> Linktext
+    (re.compile(r"<[^>]+>"), ""),  # Inline-HTML
+    (re.compile(r"^\s{0,3}(#{1,6}|>+|[-*+]|\d+[.)])\s+"), ""),  # Überschrift, Liste
+    (re.compile(r"\*\*|__|`|(?<!\w)[*_](?=\S)|(?<=\S)[*_](?!\w)"), ""),  # Betonung
+]
+_MD_FENCE_RE = re.compile(r"^\s{0,3}(```|~~~)")
+_MD_RULE_RE = re.compile(r"^\s{0,3}([-*_]\s*){3,}$")
+
+
+def _markdown_lines(lines: Iterable[str]) -> Iterator[str]:
+    in_code = in_front_matter = False
+    for number, line in enumerate(lines):
+        stripped = line.strip()
+        if number == 0 and stripped == "---":
+            in_front_matter = True
+            continue
+        if in_front_matter:
+            in_front_matter = stripped not in ("---", "...")
+            continue
+        if _MD_FENCE_RE.match(line):
+            in_code = not in_code
+            continue
+        if in_code or _MD_RULE_RE.match(stripped):
+            continue
+        for pattern, replacement in _MD_RULES:
+            line = pattern.sub(replacement, line)
+        yield line.rstrip() + "\n"
+
+
+@register_extractor(MARKDOWN_MIME, ".md", ".markdown")
+def _markdown_text(file_path: str) -> Iterator[str]:
+    """Markdown ohne Syntax, Codeblöcke und Front-Matter."""
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        lines = iter(lambda: f.readline(TEXT_BLOCK_CHARS), "")
+        yield from _batched(_markdown_lines(lines))
+
+
+@register_extractor(HTML_MIME, ".html", ".htm")
+def _html_text(file_path: str) -> Iterator[str]:
+    """Hauptinhalt einer gespeicherten Webseite (wie beim URL-Import)."""
+    with open(file_path, "rb") as f:
+        root = _parse_markup(iter(lambda: f.read(TEXT_BLOCK_CHARS), b""))
+    text, _ = document_to_text(root)
+    if text:
+        yield text + "\n"
+
+
+def _docx_paragraphs(stream) -> Iterator[str]:
+    context = etree.iterparse(
+        stream,
+        events=("end",),
+        tag=f"{_WORD_NS}p",
+        resolve_entities=False,
+        no_network=True,
+    )
+    for _, paragraph in context:
+        text = "".join(t.text or "" for t in paragraph.iter(f"{_WORD_NS}t"))
+        # Bereits gelesene Absätze freigeben, damit der Baum nicht wächst
+        paragraph.clear(keep_tail=True)
+        while paragraph.getprevious() is not None:
+            del paragraph.getparent()[0]
+        if text.strip():
+            yield text + "\n"
+
+
+@register_extractor(DOCX_MIME, ".docx")
+def _docx_text(file_path: str) -> Iterator[str]:
+    """Absätze aus word/document.xml, gestreamt aus dem ZIP-Archiv."""
+    with zipfile.ZipFile(file_path) as zf, zf.open("word/document.xml") as f:
+        yield from _batched(_docx_paragraphs(f))
+
+
+def _epub_spine(zf: zipfile.ZipFile) -> list[str]:
+    """Returns the archive paths of the book's content documents in reading order."""
+    container = etree.fromstring(zf.read("META-INF/container.xml"), _safe_xml_parser())
+    rootfile = container.find(f".//{_CONTAINER_NS}rootfile")
+    if rootfile is None:
+        return []
+    opf_path = rootfile.get("full-path", "")
+    opf = etree.fromstring(zf.read(opf_path), _safe_xml_parser())
+    manifest = {item.get("id"): item.get("href") for item in opf.iter(f"{_OPF_NS}item")}
+    base = posixpath.dirname(opf_path)
+    spine = []
+    for itemref in opf.iter(f"{_OPF_NS}itemref"):
+        href = manifest.get(itemref.get("idref"))
+        if href:
+            spine.append(posixpath.normpath(posixpath.join(base, unquote(href))))
+    return spine
+
+
+@register_extractor(EPUB_MIME, ".epub")
+def _epub_text(file_path: str) -> Iterator[str]:
+    """Kapitel in Lesereihenfolge (Spine), eines nach dem anderen."""
+    with zipfile.ZipFile(file_path) as zf:
+        for name in _epub_spine(zf):
+            try:
+                with zf.open(name) as f:
+                    root = _parse_markup(iter(lambda: f.read(TEXT_BLOCK_CHARS), b""))
+            except KeyError:
+                logger.warning(f"EPUB-Kapitel fehlt: {name}")
+                continue
+            text = body_text(root) if root is not None else ""
+            if text:
+                yield text + "\n\n"
@@ -0,0 +1,245 @@
+import re
+from typing import Optional, Tuple
+
+from lxml import etree
+
+# Elemente, die nie Haupttext enthalten
+DROP_TAGS = [
+    "script",
+    "style",
+    "noscript",
+    "nav",
+    "footer",
+    "header",
+    "aside",
+    "form",
+    "iframe",
+    "svg",
+    "button",
+    "template",
+    "select",
+]
+BLOCK_TAGS = {
+    "p",
+    "div",
+    "section",
+    "article",
+    "main",
+    "li",
+    "ul",
+    "ol",
+    "br",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "pre",
+    "blockquote",
+    "table",
+    "tr",
+    "td",
+    "th",
+    "dd",
+    "dt",
+    "figcaption",
+}
+PARAGRAPH_TAGS = {"p", "pre", "blockquote", "td", "li", "dd"}
+
+_NEGATIVE_RE = re.compile(
+    r"comment|footer|sidebar|nav|menu|cookie|consent|banner|social|share|"
+    r"advert|promo|related|breadcrumb|popup|modal|newsletter|subscribe",
+    re.I,
+)
+_POSITIVE_RE = re.compile(r"article|content|main|post|text|body|entry|story", re.I)
+
+MIN_PARAGRAPH_CHARS = 25
+MIN_MAIN_CONTENT_CHARS = 250
+
+
+class HtmlStreamParser:
+    """
+    Inkrementeller HTML-Parser auf Basis von lxml.
+    Chunks werden beim Download direkt eingespeist, sodass nie der gesamte
+    Body als String im Speicher liegen muss.
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        self._parser = etree.HTMLParser(
+            encoding=encoding, remove_comments=True, remove_pis=True
+        )
+        self._fed = False
+
+    def feed(self, chunk: bytes) -> None:
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+
+    def close(self) -> Optional[etree._Element]:
+        if not self._fed:
+            return None
+        try:
+            return self._parser.close()
+        except etree.XMLSyntaxError:
+            return None
+
+
+def _class_weight(el: etree._Element) -> int:
+    attrs = f"{el.get('class', '')} {el.get('id', '')}"
+    weight = 0
+    if _NEGATIVE_RE.search(attrs):
+        weight -= 25
+    if _POSITIVE_RE.search(attrs):
+        weight += 25
+    return weight
+
+
+def _text_length(el: etree._Element) -> int:
+    return len(" ".join("".join(el.itertext()).split()))
+
+
+def _link_density(el: etree._Element) -> float:
+    total = _text_length(el)
+    if not total:
+        return 0.0
+    links = sum(_text_length(a) for a in el.iter("a"))
+    return links / total
+
+
+def _remove_boilerplate(root: etree._Element) -> None:
+    etree.strip_elements(root, *DROP_TAGS, with_tail=False)
+    for el in list(root.iter()):
+        if not isinstance(el.tag, str) or el.tag in ("html", "body"):
+            continue
+        attrs = f"{el.get('class', '')} {el.get('id', '')}"
+        if _NEGATIVE_RE.search(attrs) and not _POSITIVE_RE.search(attrs):
+            _drop_keep_tail(el)
+
+
+def _drop_keep_tail(el: etree._Element) -> None:
+    """Entfernt ein Element, behält aber den nachfolgenden Text (tail)."""
+    parent = el.getparent()
+    if parent is None:
+        return
+    if el.tail:
+        previous = el.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + el.tail
+        else:
+            parent.text = (parent.text or "") + el.tail
+    parent.remove(el)
+
+
+def _block_text(el: etree._Element) -> str:
+    """Text eines Elements mit Zeilenumbrüchen an Block-Grenzen."""
+    parts: list[str] = []
+
+    def walk(node):
+        if not isinstance(node.tag, str):
+            return
+        is_block = node.tag in BLOCK_TAGS
+        if is_block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if is_block:
+            parts.append("\n")
+
+    walk(el)
+    lines = (" ".join(line.split()) for line in "".join(parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _best_candidate(body: etree._Element) -> Optional[etree._Element]:
+    """Readability-artige Bewertung: Absätze vergeben Punkte an ihre Container."""
+    scores: dict[etree._Element, float] = {}
+    for para in body.iter(*PARAGRAPH_TAGS):
+        length = _text_length(para)
+        if length < MIN_PARAGRAPH_CHARS:
+            continue
+        text = "".join(para.itertext())
+        score = 1 + text.count(",") + min(length / 100, 3)
+        parent = para.getparent()
+        grandparent = parent.getparent() if parent is not None else None
+        for node, share in ((parent, 1.0), (grandparent, 0.5)):
+            if node is None:
+                continue
+            if node not in scores:
+                scores[node] = _class_weight(node)
+            scores[node] += score * share
+
+    if not scores:
+        return None
+    return max(scores, key=lambda node: scores[node] * (1 - _link_density(node)))
+
+
+def extract_main_content(root: etree._Element) -> str:
+    """
+    Extrahiert den Hauptinhalt einer Seite (ohne Navigation, Footer, Werbung).
+    Fällt auf den gesamten bereinigten Body zurück, wenn kein klarer
+    Hauptinhalt gefunden wird.
+    """
+    body = root.find(".//body")
+    if body is None:
+        body = root
+    _remove_boilerplate(body)
+
+    for candidate in (
+        body.find(".//article"),
+        body.find(".//main"),
+        body.find(".//*[@role='main']"),
+        _best_candidate(body),
+    ):
+        if candidate is not None:
+            text = _block_text(candidate)
+            if len(text) >= MIN_MAIN_CONTENT_CHARS:
+                return text
+    return _block_text(body)
+
+
+def body_text(root: etree._Element) -> str:
+    """
+    Gesamter Text des Bodys ohne Skripte, Navigation u.ä., aber ohne
+    Hauptinhalt-Heuristik (z.B. für EPUB-Kapitel, die nur Fließtext enthalten).
+    """
+    body = root.find(".//body")
+    if body is None:
+        body = root
+    etree.strip_elements(body, *DROP_TAGS, with_tail=False)
+    return _block_text(body)
+
+
+def extract_title(root: etree._Element, default: str = "Webseite") -> str:
+    for xpath in (
+        "//meta[@property='og:title']/@content",
+        "//title//text()",
+        "//h1//text()",
+    ):
+        values = [v.strip() for v in root.xpath(xpath) if v and v.strip()]
+        if values:
+            return " ".join(values[0].split())
+    return default
+
+
+def document_to_text(root: Optional[etree._Element]) -> Tuple[str, str]:
+    """Returns (main_text, title) for a parsed HTML document."""
+    if root is None:
+        return "", "Webseite"
+    title = extract_title(root)
+    return extract_main_content(root).strip(), title
+
+
+def html_to_text(
+    markup: str | bytes, encoding: Optional[str] = None
+) -> Tuple[str, str]:
+    """Parses a complete HTML document and returns (main_text, title)."""
+    if isinstance(markup, str):
+        markup, encoding = markup.encode("utf-8"), "utf-8"
+    parser = HtmlStreamParser(encoding)
+    parser.feed(markup)
+    return document_to_text(parser.close())
@@ -1,78 +1,652 @@
+import logging
 import os
-import requests
-from typing import Tuple, Optional
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from typing import Iterable, Iterator, Tuple, Optional
 from pathlib import Path
 from PyPDF2 import PdfReader
-from bs4 import BeautifulSoup
+
+from .exceptions import ExtractionError
+from .extraction_sandbox import SandboxPool
+from .extractors import PDF_MIME, iter_pdf_pages, iter_text, sniff_mime
+from .source_cache import CachedSource, SourceCache, hash_file
+from .url_fetcher import FetchResult, UrlFetcher
+
+logger = logging.getLogger(__name__)
+
+# Maximale Länge des Quelltexts, der an das LLM geht
+MAX_SOURCE_CHARS = 12000
+
+# So viel Rohtext wird höchstens extrahiert, bevor der Verdichter übernimmt
+CONDENSE_INPUT_CHARS = 20 * MAX_SOURCE_CHARS
+CHARS_PER_TOKEN = 4
+
+# Parallele Extraktion (mehrere Dateien bzw. Seitenbereiche großer PDFs)
+EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PROBE_PAGES = 8
+PARALLEL_PDF_MIN_PAGES = 40
+PDF_PAGES_PER_TASK = 16
+
+# Parameter für die extraktive Vorverdichtung
+MIN_SENTENCE_WORDS = 4
+DUPLICATE_SIMILARITY = 0.8
+MAX_VOCABULARY = 20000
+WRAPPED_LINE_MIN_CHARS = 40
+
+# Cache für extrahierte Quellen (Dateien per Inhalts-Hash, URLs per ETag/Last-Modified)
+SOURCE_CACHE_ENTRIES = int(os.getenv("SOURCE_CACHE_ENTRIES", 128))
+SOURCE_CACHE_MAX_CHARS = int(os.getenv("SOURCE_CACHE_MAX_CHARS", 20_000_000))
+# So lange gilt eine gecachte URL ohne erneuten (bedingten) Request als frisch
+URL_FRESHNESS_SECONDS = 300
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[\"„»(\[]?[A-ZÄÖÜ0-9])")
+_TOKEN_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+_sandbox: Optional[SandboxPool] = None
+_sandbox_lock = threading.Lock()
+source_cache = SourceCache(SOURCE_CACHE_ENTRIES, SOURCE_CACHE_MAX_CHARS)
+url_fetcher = UrlFetcher()
+
+
+def _get_sandbox() -> SandboxPool:
+    """
+    Lazily creates the shared pool of resource-limited worker processes.
+    PDFs are only ever parsed there, never in the server process.
+    """
+    global _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = SandboxPool(workers=EXTRACTION_WORKERS)
+    return _sandbox
+
+
+def _extract_pdf_range(
+    file_path: str, start: int, stop: int
+) -> list[Tuple[int, str, float]]:
+    """Sandbox task: extracts a page range in one go."""
+    return list(iter_pdf_pages(PdfReader(file_path), start, stop))
+
+
+def _stream_pdf_pages(file_path: str) -> Iterator:
+    """
+    Sandbox task: yields the page count first, then (page_index, text, seconds)
+    page by page until the parent closes the stream.
+    """
+    reader = PdfReader(file_path)
+    n_pages = len(reader.pages)
+    yield n_pages
+    yield from iter_pdf_pages(reader, 0, n_pages)
+
+
+def _collect_text(chunks: Iterator[str], max_chars: int) -> str:
+    """
+    Concatenates extractor chunks until the budget is filled, then closes the
+    stream so the sandbox worker stops reading. A timeout or limit violation
+    keeps the text collected so far.
+    """
+    parts: list[str] = []
+    used = 0
+    try:
+        for chunk in chunks:
+            parts.append(chunk[: max_chars - used])
+            used += len(parts[-1])
+            if used >= max_chars:
+                break
+    except ExtractionError as e:
+        logger.warning(f"Extraktion abgebrochen: {e}")
+        if not parts:
+            raise
+    finally:
+        chunks.close()
+    return "".join(parts).strip()
+
+
+def _take(iterator: Iterator, n: int) -> list:
+    return [item for _, item in zip(range(n), iterator)]
+
+
+def _iter_pdf_pages_parallel(
+    file_path: str, start: int, stop: int, deadline: float
+) -> Iterator[Tuple[int, str, float]]:
+    """
+    Extracts page ranges in the sandbox pool and yields pages in document order.
+    Only a small window of ranges is in flight, so stopping early wastes little work.
+    All ranges share the document's wall-clock deadline (time.monotonic()).
+    """
+    sandbox = _get_sandbox()
+
+    def submit(s: int, e: int):
+        timeout = max(deadline - time.monotonic(), 0.001)
+        return sandbox.submit(_extract_pdf_range, file_path, s, e, timeout=timeout)
+
+    ranges = iter(
+        (s, min(s + PDF_PAGES_PER_TASK, stop))
+        for s in range(start, stop, PDF_PAGES_PER_TASK)
+    )
+    in_flight = [submit(s, e) for s, e in _take(ranges, 2 * EXTRACTION_WORKERS)]
+    try:
+        while in_flight:
+            future = in_flight.pop(0)
+            for s, e in _take(ranges, 1):
+                in_flight.append(submit(s, e))
+            yield from future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
 
 
-def extract_text_from_file(file_path: str) -> Tuple[str, str]:
-    """Reads text from PDF or TXT files and returns (text, title)."""
+def _collect_pages(
+    records: Iterable[Tuple[int, str, float]],
+    parts: list[str],
+    timings: list[Tuple[int, int, float]],
+    max_chars: int,
+    used: int,
+) -> int:
+    """Appends page texts until the budget is filled; returns the used chars."""
+    for index, text, seconds in records:
+        timings.append((index + 1, len(text), seconds))
+        if text:
+            parts.append(text[: max_chars - used])
+            used += len(parts[-1]) + 1
+        if used >= max_chars:
+            break
+    return used
+
+
+def extract_pdf_text(
+    file_path: str, max_chars: int = CONDENSE_INPUT_CHARS, parallel: bool = True
+) -> Tuple[str, list[Tuple[int, int, float]]]:
+    """
+    Streaming PDF extraction that stops as soon as max_chars are collected.
+
+    The PDF is parsed in a sandboxed worker process that streams the pages
+    back one by one; closing the stream stops the worker. If the character
+    budget still needs many more pages of a large PDF after the first pages,
+    the rest is extracted in page ranges across several workers.
+
+    A timeout or a worker killed by its memory/CPU limit ends the extraction;
+    the text collected up to that point is kept.
+
+    Returns (text, timings) with timings as (page_number, chars, seconds).
+    """
+    sandbox = _get_sandbox()
+    deadline = time.monotonic() + sandbox.timeout
+    parts: list[str] = []
+    timings: list[Tuple[int, int, float]] = []
+    used = 0
+    t0 = time.perf_counter()
+
+    stream = sandbox.stream(_stream_pdf_pages, file_path)
+    records = stream
+    try:
+        n_pages = next(stream, 0)
+        probe = min(n_pages, PDF_PROBE_PAGES)
+        used = _collect_pages(_take(stream, probe), parts, timings, max_chars, 0)
+
+        if used < max_chars and probe < n_pages:
+            chars_per_page = max(used / probe, 1.0)
+            pages_needed = (max_chars - used) / chars_per_page
+            remaining = n_pages - probe
+            if parallel and min(pages_needed, remaining) >= PARALLEL_PDF_MIN_PAGES:
+                stream.close()
+                records = _iter_pdf_pages_parallel(file_path, probe, n_pages, deadline)
+            used = _collect_pages(records, parts, timings, max_chars, used)
+    except ExtractionError as e:
+        logger.warning(f"PDF-Extraktion abgebrochen ({file_path}): {e}")
+        if not parts:
+            raise
+    finally:
+        records.close()
+        stream.close()
+
+    logger.info(
+        f"PDF extrahiert: {len(timings)}/{n_pages} Seiten, {used} Zeichen "
+        f"in {time.perf_counter() - t0:.2f}s"
+    )
+    for page, chars, seconds in timings:
+        logger.debug(f"PDF-Seite {page}: {chars} Zeichen in {seconds * 1000:.1f}ms")
+    return "\n".join(parts).strip(), timings
+
+
+def extract_text_from_file(
+    file_path: str,
+    max_chars: int = CONDENSE_INPUT_CHARS,
+    max_tokens: Optional[int] = None,
+    parallel: bool = True,
+) -> Tuple[str, str]:
+    """
+    Reads text from PDF, DOCX, EPUB, HTML, Markdown or TXT files and returns
+    (text, title). The format is sniffed from the file's magic bytes and the
+    matching extractor streams the text from the sandbox; reading stops once
+    the character (or estimated token) budget is filled.
+    With parallel=False a large PDF occupies a single worker instead of
+    being split into page ranges.
+    """
     if not file_path:
         return "", ""
 
-    # Check extension
-    path_obj = Path(file_path)
-    ext = path_obj.suffix.lower()
-    title = path_obj.stem.replace("_", " ").title()
+    if max_tokens is not None:
+        max_chars = min(max_chars, max_tokens * CHARS_PER_TOKEN)
 
-    if ext == ".pdf":
-        try:
-            reader = PdfReader(file_path)
-            parts = []
-            for page in reader.pages:
-                parts.append(page.extract_text() or "")
-            return "\n".join(parts).strip(), title
-        except Exception as e:
-            print(f"Error reading PDF: {e}")
-            return "", title
+    title = _file_title(file_path)
 
-    # Default to text file
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read().strip(), title
+        mime = sniff_mime(file_path)
+        if mime is None:
+            print(f"Unsupported file format: {file_path}")
+            return "", title
+        if mime == PDF_MIME:
+            text, _ = extract_pdf_text(file_path, max_chars, parallel=parallel)
+            return text, title
+        chunks = _get_sandbox().stream(iter_text, file_path, mime)
+        return _collect_text(chunks, max_chars), title
     except Exception as e:
         print(f"Error reading file: {e}")
         return "", title
 
 
+def _conditional_headers(cached: Optional[CachedSource]) -> dict:
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _to_cache_entry(
+    result: FetchResult, cached: Optional[CachedSource]
+) -> CachedSource:
+    if cached and result.status_code == 304:
+        logger.info(f"URL unverändert (304), nutze Cache: {result.url}")
+        return cached._replace(fetched_at=time.time())
+    return CachedSource(
+        text=result.text,
+        title=result.title or "Webseite",
+        etag=result.etag,
+        last_modified=result.last_modified,
+        fetched_at=time.time(),
+    )
+
+
+def fetch_texts_from_urls(urls: list[str]) -> list[Tuple[str, str]]:
+    """
+    Scrapes several URLs concurrently and returns (text, title) per URL.
+    Fresh cache entries are reused directly, stale ones are revalidated
+    with a conditional GET. Failed URLs yield ("", "").
+    """
+    results: list[Tuple[str, str]] = [("", "")] * len(urls)
+    pending = []
+    for i, url in enumerate(urls):
+        cached = source_cache.get(f"url:{url}")
+        if cached and time.time() - cached.fetched_at < URL_FRESHNESS_SECONDS:
+            results[i] = (cached.text, cached.title)
+        else:
+            pending.append((i, url, cached))
+
+    responses = url_fetcher.fetch_many(
+        [(url, _conditional_headers(cached)) for _, url, cached in pending]
+    )
+    for (i, url, cached), response in zip(pending, responses):
+        if isinstance(response, Exception):
+            print(f"Error fetching URL: {response}")
+            continue
+        try:
+            entry = _to_cache_entry(response, cached)
+        except Exception as e:
+            print(f"Error parsing URL: {e}")
+            continue
+        source_cache.put(f"url:{url}", entry)
+        results[i] = (entry.text, entry.title)
+    return results
+
+
 def fetch_text_from_url(url: str) -> Tuple[str, str]:
     """Scrapes text from a given URL and returns (text, title)."""
     if not url:
         return "", ""
+    return fetch_texts_from_urls([url])[0]
+
+
+def _file_cache_key(file_path: str, max_chars: int) -> str:
+    return f"file:{hash_file(file_path)}:{max_chars}"
+
+
+def _file_title(file_path: str) -> str:
+    return Path(file_path).stem.replace("_", " ").title()
+
+
+def extract_text_from_file_cached(
+    file_path: str, max_chars: int = CONDENSE_INPUT_CHARS
+) -> Tuple[str, str]:
+    """
+    extract_text_from_file with a cache keyed by the file's content hash,
+    so repeated uploads of the same document are only parsed once.
+    """
+    if not file_path:
+        return "", ""
     try:
-        r = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-    except Exception as e:
-        print(f"Error fetching URL: {e}")
+        key = _file_cache_key(file_path, max_chars)
+    except OSError as e:
+        print(f"Error reading file: {e}")
         return "", ""
 
-    soup = BeautifulSoup(r.text, "html.parser")
-    # Extract title
-    page_title = (
-        soup.title.string.strip() if soup.title and soup.title.string else "Webseite"
+    cached = source_cache.get(key)
+    if cached:
+        return cached.text, _file_title(file_path)
+
+    text, title = extract_text_from_file(file_path, max_chars=max_chars)
+    if text:
+        source_cache.put(key, CachedSource(text=text, title=title))
+    return text, title
+
+
+def extract_texts_from_files(
+    file_paths: list[str], max_chars: int = CONDENSE_INPUT_CHARS
+) -> list[Tuple[str, str]]:
+    """
+    Extracts several files in parallel, one sandbox worker per file (cache
+    hits are answered directly). A single file may still use page-parallel
+    extraction across several workers.
+    """
+    if len(file_paths) == 1:
+        return [extract_text_from_file_cached(file_paths[0], max_chars)]
+
+    results: list[Tuple[str, str]] = [("", "")] * len(file_paths)
+    pending = []
+    for i, path in enumerate(file_paths):
+        try:
+            key = _file_cache_key(path, max_chars)
+        except OSError as e:
+            print(f"Error reading file: {e}")
+            continue
+        cached = source_cache.get(key)
+        if cached:
+            results[i] = (cached.text, _file_title(path))
+        else:
+            pending.append((i, key, path))
+
+    # Die Threads warten nur auf die Sandbox-Worker, geparst wird dort
+    with ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS) as executor:
+        futures = [
+            (
+                i,
+                key,
+                executor.submit(extract_text_from_file, path, max_chars, None, False),
+            )
+            for i, key, path in pending
+        ]
+        for i, key, future in futures:
+            try:
+                text, title = future.result()
+            except Exception as e:
+                print(f"Error reading file: {e}")
+                continue
+            if text:
+                source_cache.put(key, CachedSource(text=text, title=title))
+            results[i] = (text, title)
+    return results
+
+
+def parse_urls(url_text) -> list[str]:
+    """Splits user input (string or list) into a de-duplicated list of URLs."""
+    if not url_text:
+        return []
+    if isinstance(url_text, str):
+        url_text = re.split(r"[\s,;]+", url_text)
+    return list(dict.fromkeys(u.strip() for u in url_text if u and u.strip()))
+
+
+def _as_file_list(file_paths) -> list[str]:
+    if not file_paths:
+        return []
+    if isinstance(file_paths, (str, os.PathLike)):
+        file_paths = [file_paths]
+    return list(dict.fromkeys(str(p) for p in file_paths if p))
+
+
+def _join_wrapped_lines(paragraph: str) -> list[str]:
+    """
+    Fügt umbrochene Zeilen (z.B. aus PDFs) wieder zusammen.
+    Kurze Zeilen ohne Satzzeichen (Überschriften, Menüpunkte) bleiben eigene Blöcke.
+    """
+    blocks: list[str] = []
+    for line in paragraph.splitlines():
+        line = " ".join(line.split())
+        if not line:
+            continue
+        prev = blocks[-1] if blocks else ""
+        if prev and len(prev) >= WRAPPED_LINE_MIN_CHARS and prev[-1] not in ".!?:":
+            blocks[-1] = f"{prev} {line}"
+        else:
+            blocks.append(line)
+    return blocks
+
+
+def split_sentences(text: str) -> list[tuple[int, str]]:
+    """Splits text into (paragraph_index, sentence) pairs."""
+    sentences = []
+    blocks = [
+        block
+        for paragraph in re.split(r"\n\s*\n", text)
+        for block in _join_wrapped_lines(paragraph)
+    ]
+    for p_idx, block in enumerate(blocks):
+        for sentence in _SENTENCE_SPLIT_RE.split(block):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append((p_idx, sentence))
+    return sentences
+
+
+def _tfidf_terms(
+    sentences: list[str],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Baut die TF-IDF-Matrix im COO-Format (rows, cols, values).
+    Die Matrix wird nie dicht aufgebaut, damit auch 300-Seiten-PDFs
+    mit wenig Speicher auskommen.
+    """
+    vocab: dict[str, int] = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for token in _TOKEN_RE.findall(sentence.lower()):
+            idx = vocab.get(token)
+            if idx is None:
+                if len(vocab) >= MAX_VOCABULARY:
+                    continue
+                idx = vocab[token] = len(vocab)
+            rows.append(i)
+            cols.append(idx)
+
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0), 0
+
+    n_terms = len(vocab)
+    # Doppelte (Satz, Term)-Paare zu Termfrequenzen zusammenfassen
+    keys = np.asarray(rows, dtype=np.int64) * n_terms + np.asarray(cols)
+    keys, counts = np.unique(keys, return_counts=True)
+    rows_arr, cols_arr = np.divmod(keys, n_terms)
+
+    doc_freq = np.bincount(cols_arr, minlength=n_terms)
+    idf = np.log((1 + len(sentences)) / (1 + doc_freq)) + 1.0
+    values = (1.0 + np.log(counts)) * idf[cols_arr]
+
+    # Zeilen L2-normieren
+    norms = np.sqrt(np.bincount(rows_arr, weights=values**2, minlength=len(sentences)))
+    values = values / norms[rows_arr]
+    return rows_arr, cols_arr, values, n_terms
+
+
+def rank_sentences(sentences: list[str]) -> np.ndarray:
+    """
+    Bewertet Sätze nach Kosinus-Ähnlichkeit zum TF-IDF-Zentroid des Dokuments.
+    Kurze Fragmente (Navigation, Menüpunkte) erhalten den Score 0.
+    """
+    n = len(sentences)
+    rows, cols, values, n_terms = _tfidf_terms(sentences)
+    if n_terms == 0:
+        return np.zeros(n)
+
+    centroid = np.bincount(cols, weights=values, minlength=n_terms)
+    centroid /= np.linalg.norm(centroid) or 1.0
+    scores = np.bincount(rows, weights=values * centroid[cols], minlength=n)
+
+    word_counts = np.fromiter(
+        (len(s.split()) for s in sentences), dtype=np.int64, count=n
     )
+    scores[word_counts < MIN_SENTENCE_WORDS] = 0.0
+    return scores
+
+
+def _drop_near_duplicates(
+    sentences: list[str], candidates: np.ndarray, threshold: float
+) -> list[int]:
+    """Entfernt Kandidaten, die einem besser bewerteten Kandidaten fast gleichen."""
+    rows, cols, values, n_terms = _tfidf_terms([sentences[i] for i in candidates])
+    if n_terms == 0:
+        return candidates.tolist()
+
+    matrix = np.zeros((len(candidates), n_terms))
+    matrix[rows, cols] = values
+    similarity = matrix @ matrix.T
+
+    kept: list[int] = []
+    for pos in range(len(candidates)):
+        if kept and similarity[pos, kept].max() >= threshold:
+            continue
+        kept.append(pos)
+    return [int(candidates[pos]) for pos in kept]
+
+
+def condense_text(text: str, max_chars: int = MAX_SOURCE_CHARS) -> str:
+    """
+    Extraktive Vorverdichtung: wählt die zentralsten Sätze eines Textes aus,
+    bis das Zeichenbudget gefüllt ist, und gibt sie in Originalreihenfolge zurück.
+    Texte innerhalb des Budgets werden unverändert zurückgegeben.
+    """
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return text
+
+    sentences_with_para = split_sentences(text)
+    if len(sentences_with_para) < 2:
+        return text[:max_chars]
+
+    paragraphs = [p for p, _ in sentences_with_para]
+    sentences = [s for _, s in sentences_with_para]
+    lengths = np.fromiter((len(s) + 1 for s in sentences), dtype=np.int64)
+
+    scores = rank_sentences(sentences)
+    order = np.argsort(-scores, kind="stable")
+    order = order[scores[order] > 0]
+
+    # Nur so viele Kandidaten vergleichen, wie grob ins Budget passen (mit Reserve)
+    fits = np.cumsum(lengths[order]) <= 3 * max_chars
+    candidates = order[: max(int(fits.sum()), 1)]
+    candidates = _drop_near_duplicates(sentences, candidates, DUPLICATE_SIMILARITY)
+
+    selected, used = [], 0
+    for idx in candidates:
+        if used + lengths[idx] > max_chars:
+            continue
+        selected.append(idx)
+        used += lengths[idx]
+
+    if not selected:
+        return text[:max_chars]
+
+    selected.sort()
+    parts = [sentences[selected[0]]]
+    for prev, idx in zip(selected, selected[1:]):
+        parts.append("\n" if paragraphs[idx] != paragraphs[prev] else " ")
+        parts.append(sentences[idx])
+
+    logger.info(
+        f"Quelle verdichtet: {len(text)} -> {used} Zeichen "
+        f"({len(selected)}/{len(sentences)} Sätze)"
+    )
+    return "".join(parts)
+
+
+def _allocate_budget(lengths: list[int], budget: int) -> list[int]:
+    """
+    Verteilt das Zeichenbudget fair auf die Quellen: kurze Quellen bekommen
+    ihre volle Länge, der Rest wird gleichmäßig auf die langen aufgeteilt.
+    """
+    shares = [0] * len(lengths)
+    remaining = budget
+    open_sources = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    while open_sources:
+        fair_share = remaining // len(open_sources)
+        i = open_sources.pop(0)
+        shares[i] = min(lengths[i], fair_share)
+        remaining -= shares[i]
+    return shares
+
+
+def merge_sources(
+    sources: list[Tuple[str, str, str]], max_chars: int = MAX_SOURCE_CHARS
+) -> str:
+    """
+    Merges (label, title, text) sources into one budgeted text.
+    Every source is condensed to its share of the budget and prefixed with
+    an attribution header, so the LLM knows where each passage comes from.
+    """
+    sources = [(label, title, text) for label, title, text in sources if text]
+    if not sources:
+        return ""
+    if len(sources) == 1:
+        return condense_text(sources[0][2], max_chars)
+
+    headers = [
+        f"[Quelle {n}: {title or label} ({label})]\n"
+        for n, (label, title, _) in enumerate(sources, start=1)
+    ]
+    budget = max_chars - sum(len(h) + 2 for h in headers)
+    shares = _allocate_budget([len(text) for _, _, text in sources], budget)
+
+    parts = []
+    for header, (_, _, text), share in zip(headers, sources, shares):
+        if share > 0:
+            parts.append(header + condense_text(text, share))
+    return "\n\n".join(parts)
 
-    # Clean up scripts and styles
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
 
-    text = soup.get_text("\n")
-    # Clean up whitespace
-    text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
-    return text.strip(), page_title
+def build_source_text(file_paths, urls) -> Tuple[str, str]:
+    """
+    Orchestrator: ingests any number of files and URLs concurrently and merges
+    them into one budgeted source text. Returns (text, title).
 
+    URLs are fetched in the shared async HTTP client while the files are
+    extracted in the process pool, so ingestion takes about as long as the
+    slowest source.
+    """
+    files = _as_file_list(file_paths)
+    url_list = parse_urls(urls)
 
-def build_source_text(file_path, url) -> Tuple[str, str]:
-    """Orchestrator: decides whether to use file or URL. Returns (text, title)."""
-    file_text, file_title = extract_text_from_file(file_path) if file_path else ("", "")
-    url_text, url_title = fetch_text_from_url(url.strip()) if url else ("", "")
+    if files and url_list:
+        # URLs im Hintergrund laden, während die Dateien extrahiert werden
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            urls_future = executor.submit(fetch_texts_from_urls, url_list)
+            file_results = extract_texts_from_files(files)
+            url_results = urls_future.result()
+    else:
+        file_results = extract_texts_from_files(files) if files else []
+        url_results = fetch_texts_from_urls(url_list) if url_list else []
 
-    # Prioritize file if both are present
-    combined_text = file_text if file_text else url_text
+    sources = [
+        (Path(path).name, title, text)
+        for path, (text, title) in zip(files, file_results)
+    ] + [(url, title, text) for url, (text, title) in zip(url_list, url_results)]
 
-    # Prioritize file title if present
-    combined_title = file_title if file_title else url_title
+    # Prioritize file titles over URL titles
+    combined_title = next((title for _, title, text in sources if text), "")
 
-    # Limit character count to prevent crashing the LLM
-    return (combined_text or "")[:12000], combined_title
+    return merge_sources(sources, MAX_SOURCE_CHARS), combined_title
@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 
 from interfaces.iservices import ILLMService
 
+from .cancellation import CancellationToken, check
 from .exceptions import LLMServiceError
 
 load_dotenv()
@@ -192,7 +193,9 @@ class LLMService(ILLMService):
         )
 
     # Anfrage an Google Gemini
-    def _ask_gemini(self, prompt: str) -> str:
+    def _ask_gemini(
+        self, prompt: str, cancel_token: CancellationToken | None = None
+    ) -> str:
         """
         Führt den REST-Call zu Gemini aus und gibt den generierten Text zurück.
 
@@ -207,21 +210,24 @@ class LLMService(ILLMService):
         4) Erfolg: Text aus candidates[0].content.parts[0].text zurückgeben
         Parameter:
         - prompt: Der vollständige Prompt-Text (System + User), der an Gemini gesendet wird
+        - cancel_token: optional; vor jedem Versuch geprüft, beendet auch die Retry-Pause
 
         Rückgabe:
         - String mit dem von Gemini generierten Antworttext
 
         Exceptions:
         - LLMServiceError: Wenn der Aufruf fehlschlägt oder die Antwort nicht verarbeitet werden kann
+        - OperationCancelledError: Wenn der Job abgebrochen wurde
         """
         body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
 
         for attempt in range(self.MAX_ATTEMPTS):
+            check(cancel_token)
             try:
                 response = requests.post(self.url, json=body, timeout=self.TIMEOUT)
             except requests.RequestException as e:
                 if attempt < self.MAX_ATTEMPTS - 1:
-                    time.sleep(1)
+                    self._retry_pause(cancel_token)
                     continue
                 raise LLMServiceError(
                     f"Gemini ist nicht erreichbar (Internet/Server-Problem): {e}"
@@ -229,7 +235,7 @@ class LLMService(ILLMService):
 
             if response.status_code in self.RETRY_STATUS_CODES:
                 if attempt < self.MAX_ATTEMPTS - 1:
-                    time.sleep(1)
+                    self._retry_pause(cancel_token)
                     continue
                 raise LLMServiceError(
                     f"Gemini API-Fehler nach Retry: HTTP {response.status_code} - {response.text}"
@@ -250,6 +256,14 @@ class LLMService(ILLMService):
 
         raise LLMServiceError("Gemini-Aufruf ist unerwartet beendet.")
 
+    @staticmethod
+    def _retry_pause(cancel_token: CancellationToken | None) -> None:
+        """Kurze Pause vor dem nächsten Versuch (endet sofort beim Abbruch)."""
+        if cancel_token is None:
+            time.sleep(1)
+        else:
+            cancel_token.sleep(1)
+
     # Dummy
     def _dummy_output(self, thema: str, config: dict):
         """
@@ -268,7 +282,9 @@ class LLMService(ILLMService):
         )
 
     # PUBLIC METHOD
-    def generate_script(self, thema: str, config: dict) -> str:
+    def generate_script(
+        self, thema: str, config: dict, cancel_token: CancellationToken | None = None
+    ) -> str:
         """
         Öffentliche API des Services: erzeugt ein Podcast-Skript.
 
@@ -281,6 +297,8 @@ class LLMService(ILLMService):
         Parameter:
         - thema: Thema des Podcasts
         - config: Konfiguration (dauer, source_text, Sprecher etc.)
+        - cancel_token: optional, bricht zwischen den Versuchen ab
+          (OperationCancelledError, kein Dummy-Fallback)
 
         Rückgabe:
         - Generierter Skript-Text (String)
@@ -291,7 +309,7 @@ class LLMService(ILLMService):
         prompt = self._system_prompt(config) + "\n" + self._user_prompt(thema, config)
 
         try:
-            return self._ask_gemini(prompt)
+            return self._ask_gemini(prompt, cancel_token=cancel_token)
         except LLMServiceError as e:
             # Fallback: lieber Dummy als kompletter Crash in der UI
             print("LLM error:", e)
@@ -0,0 +1,74 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+
+class CachedSource(NamedTuple):
+    """Extrahierter Quelltext inkl. HTTP-Validatoren für bedingte Requests."""
+
+    text: str
+    title: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+
+class SourceCache:
+    """
+    Thread-sicherer LRU-Cache für extrahierte Quellen.
+    Begrenzt sowohl die Anzahl der Einträge als auch die Summe der Textlängen;
+    bei Überschreitung werden die am längsten unbenutzten Einträge verdrängt.
+    """
+
+    def __init__(self, max_entries: int = 128, max_chars: int = 20_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[str, CachedSource]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedSource]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedSource) -> None:
+        if len(entry.text) > self.max_chars:
+            return
+        if not entry.fetched_at:
+            entry = entry._replace(fetched_at=time.time())
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._chars -= len(old.text)
+            self._entries[key] = entry
+            self._chars += len(entry.text)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted.text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def hash_file(file_path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 über den Dateiinhalt (blockweise, ohne die Datei ganz zu laden)."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
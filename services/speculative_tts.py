@@ -0,0 +1,183 @@
+"""
+Spekulative Vorab-Synthese, während der Nutzer das Skript prüft.
+
+Sobald ein Skript angezeigt (oder bearbeitet) wird, werden seine Sprecherblöcke
+im Hintergrund synthetisiert. Schlüssel ist der Hash aus Stimme und Blocktext
+(DialogBlock.key): Eine Änderung verwirft nur die betroffenen Blöcke, alle
+anderen bleiben gültig. Beim Klick auf "Podcast Generieren" übernimmt
+GoogleTTSService.generate_audio die fertigen Blöcke und synthetisiert nur den
+Rest.
+
+Opt-in über die Umgebung:
+
+    SPECULATIVE_TTS=1                   aktiviert die Vorab-Synthese
+    SPECULATIVE_TTS_CHAR_BUDGET=8000    Zeichen je Nutzer, die spekulativ
+                                        synthetisiert werden dürfen, bis er
+                                        tatsächlich einen Podcast erzeugt
+    SPECULATIVE_TTS_WORKERS=2           Threads für die Vorab-Synthese
+    SPECULATIVE_TTS_TTL=900             Sekunden, nach denen unbenutzte
+                                        Vorab-Audios verworfen werden
+
+Vorab erzeugte Blöcke liegen unkomprimiert (48 kHz PCM) im Speicher, das
+Budget begrenzt also auch den RAM je Nutzer.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Hashable, Optional
+
+from pydub import AudioSegment
+
+from .cancellation import CancellationToken
+from .exceptions import OperationCancelledError
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_TTS = os.getenv("SPECULATIVE_TTS", "false").lower() in ("1", "true")
+CHAR_BUDGET = int(os.getenv("SPECULATIVE_TTS_CHAR_BUDGET", 8000))
+WORKERS = int(os.getenv("SPECULATIVE_TTS_WORKERS", 2))
+TTL_SECONDS = int(os.getenv("SPECULATIVE_TTS_TTL", 900))
+
+# Wie oft beim Warten auf einen laufenden Block der Abbruch geprüft wird
+_POLL_SECONDS = 0.2
+
+
+class _UserBlocks:
+    def __init__(self):
+        self.futures: dict[str, Future] = {}
+        self.sizes: dict[str, int] = {}
+        # Spekulativ verbrauchte Zeichen seit der letzten echten Generierung
+        self.chars_used = 0
+        # Beendet laufende Blöcke, wenn der Nutzer sein Skript verwirft
+        self.token = CancellationToken()
+        self.last_used = time.monotonic()
+
+
+class SpeculativeSynthesizer:
+    def __init__(
+        self,
+        tts_service,
+        char_budget: int = CHAR_BUDGET,
+        workers: int = WORKERS,
+        ttl: float = TTL_SECONDS,
+    ):
+        self.tts_service = tts_service
+        self.char_budget = char_budget
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="tts-speculative"
+        )
+        self._users: dict[Hashable, _UserBlocks] = {}
+        self._lock = threading.Lock()
+
+    def presynthesize(
+        self, user_key: Hashable, script_text: str, sprache, primary, secondary
+    ) -> int:
+        """
+        Plant die Synthese aller Blöcke des Skripts ein, die noch nicht
+        vorliegen. Blöcke, die nicht mehr im Skript stehen, werden verworfen.
+        Gibt die Anzahl neu eingeplanter Blöcke zurück.
+        """
+        blocks = self.tts_service.dialog_blocks(
+            script_text, sprache, primary, secondary
+        )
+        wanted = {block.key for block in blocks}
+        scheduled = 0
+
+        with self._lock:
+            self._expire_idle()
+            user = self._users.setdefault(user_key, _UserBlocks())
+            user.last_used = time.monotonic()
+            for key in list(user.futures):
+                if key not in wanted:
+                    self._drop(user, key)
+
+            for block in blocks:
+                if block.key in user.futures:
+                    continue
+                size = len(block.text)
+                if user.chars_used + size > self.char_budget:
+                    logger.info(f"Speculative TTS budget reached for {user_key}")
+                    break
+                user.chars_used += size
+                user.sizes[block.key] = size
+                user.futures[block.key] = self._executor.submit(
+                    self.tts_service.synthesize_block, block, user.token
+                )
+                scheduled += 1
+        return scheduled
+
+    def lookup(
+        self, user_key: Hashable, cancel_token: Optional[CancellationToken] = None
+    ):
+        """
+        Callback für generate_audio(presynthesized=...): liefert das Audio
+        eines Blocks, wartet auf einen gerade laufenden und gibt None zurück,
+        wenn der Block (noch) nicht begonnen wurde.
+        """
+
+        def presynthesized(key: str) -> Optional[AudioSegment]:
+            with self._lock:
+                user = self._users.get(user_key)
+                future = user.futures.pop(key, None) if user else None
+                if future is None:
+                    return None
+                size = user.sizes.pop(key)
+                if future.cancel():
+                    # Nie gestartet: kostet nichts, der Job synthetisiert selbst
+                    user.chars_used -= size
+                    return None
+
+            while True:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                try:
+                    return future.result(timeout=_POLL_SECONDS)
+                except TimeoutError:
+                    continue
+                except (CancelledError, OperationCancelledError):
+                    return None
+                except Exception as e:
+                    logger.warning(f"Speculative TTS block failed: {e}")
+                    return None
+
+        return presynthesized
+
+    def finish(self, user_key: Hashable) -> None:
+        """
+        Nach einer echten Generierung (oder beim Verwerfen des Skripts):
+        übrige Blöcke verwerfen und das Budget des Nutzers zurücksetzen.
+        """
+        with self._lock:
+            self._discard(user_key)
+
+    def chars_used(self, user_key: Hashable) -> int:
+        with self._lock:
+            user = self._users.get(user_key)
+            return user.chars_used if user else 0
+
+    def _expire_idle(self) -> None:
+        now = time.monotonic()
+        for user_key in [
+            k for k, u in self._users.items() if now - u.last_used > self.ttl
+        ]:
+            self._discard(user_key)
+
+    def _discard(self, user_key: Hashable) -> None:
+        user = self._users.pop(user_key, None)
+        if user is None:
+            return
+        user.token.cancel()
+        for future in user.futures.values():
+            future.cancel()
+
+    @staticmethod
+    def _drop(user: _UserBlocks, key: str) -> None:
+        future = user.futures.pop(key)
+        size = user.sizes.pop(key)
+        if future.cancel():
+            user.chars_used -= size
+        # Laufende oder fertige Blöcke bleiben im Budget: die Zeichen sind bezahlt
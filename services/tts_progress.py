@@ -0,0 +1,153 @@
+"""
+Fortschritt der Sprachsynthese.
+
+Der TTS-Service kennt vor dem ersten API-Call alle Chunks. Nach jedem Chunk
+meldet er ein TTSProgress an einen optionalen Callback; die Restzeit wird aus
+dem Durchsatz (Zeichen/s) der letzten Chunks geschätzt. Am Ende eines Jobs
+wird der Durchsatz protokolliert und in throughput_metrics() gesammelt.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Anzahl der letzten Chunks, aus denen der Durchsatz geschätzt wird
+THROUGHPUT_WINDOW = 5
+
+
+class TTSProgress(NamedTuple):
+    done_chunks: int
+    total_chunks: int
+    done_chars: int
+    total_chars: int
+    elapsed: float
+    # Geschätzte Restzeit in Sekunden (None, solange kein Chunk fertig ist)
+    eta: Optional[float]
+
+    @property
+    def fraction(self) -> float:
+        if not self.total_chars:
+            return 1.0
+        return self.done_chars / self.total_chars
+
+
+ProgressCallback = Callable[[TTSProgress], None]
+
+
+class ProgressTracker:
+    """Zählt fertige Chunks eines Jobs und meldet sie an den Callback."""
+
+    def __init__(
+        self,
+        chunk_sizes: list[int],
+        callback: Optional[ProgressCallback] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.total_chunks = len(chunk_sizes)
+        self.total_chars = sum(chunk_sizes)
+        self.done_chunks = 0
+        self.done_chars = 0
+        # Nur tatsächlich synthetisierte Zeichen (für den Durchsatz des Jobs)
+        self.synthesized_chars = 0
+        self._callback = callback
+        self._clock = clock
+        self._started = clock()
+        self._last = self._started
+        # (Zeichen, Sekunden) der letzten Chunks
+        self._window: deque[tuple[int, float]] = deque(maxlen=THROUGHPUT_WINDOW)
+
+    def throughput(self) -> Optional[float]:
+        """Zeichen pro Sekunde über die letzten Chunks."""
+        chars = sum(c for c, _ in self._window)
+        seconds = sum(s for _, s in self._window)
+        if not chars or seconds <= 0:
+            return None
+        return chars / seconds
+
+    def snapshot(self) -> TTSProgress:
+        rate = self.throughput()
+        remaining = self.total_chars - self.done_chars
+        return TTSProgress(
+            done_chunks=self.done_chunks,
+            total_chunks=self.total_chunks,
+            done_chars=self.done_chars,
+            total_chars=self.total_chars,
+            elapsed=self._clock() - self._started,
+            eta=remaining / rate if rate else None,
+        )
+
+    def start(self) -> None:
+        """Meldet 0 % (z.B. damit die UI sofort die Chunk-Anzahl zeigt)."""
+        self._report()
+
+    def chunk_done(self, chars: int, measured: bool = True) -> None:
+        """
+        measured=False für Chunks, die nicht synthetisiert werden mussten
+        (z.B. vorab erzeugt); sie zählen nicht in den Durchsatz.
+        """
+        now = self._clock()
+        if measured:
+            self._window.append((chars, now - self._last))
+            self.synthesized_chars += chars
+        self._last = now
+        self.done_chunks += 1
+        self.done_chars += chars
+        self._report()
+
+    def finish(self) -> TTSProgress:
+        """Protokolliert den Durchsatz des Jobs."""
+        progress = self.snapshot()
+        chars = self.synthesized_chars
+        _record_job(chars, progress.elapsed)
+        if progress.elapsed > 0:
+            logger.info(
+                f"TTS: {chars} Zeichen in {progress.total_chunks} "
+                f"Chunks, {progress.elapsed:.1f}s "
+                f"({chars / progress.elapsed:.0f} Zeichen/s)"
+            )
+        return progress
+
+    def _report(self) -> None:
+        if self._callback is None:
+            return
+        try:
+            self._callback(self.snapshot())
+        except Exception as e:
+            # Die Anzeige darf die Synthese nicht abbrechen
+            logger.warning(f"Progress callback failed: {e}")
+
+
+_jobs = {"jobs": 0, "chars": 0, "seconds": 0.0}
+_jobs_lock = threading.Lock()
+
+
+def _record_job(chars: int, seconds: float) -> None:
+    with _jobs_lock:
+        _jobs["jobs"] += 1
+        _jobs["chars"] += chars
+        _jobs["seconds"] += seconds
+
+
+def throughput_metrics() -> dict[str, float]:
+    """Anzahl Jobs, synthetisierte Zeichen und mittlerer Durchsatz (Zeichen/s)."""
+    with _jobs_lock:
+        seconds = _jobs["seconds"]
+        return {
+            "jobs": _jobs["jobs"],
+            "chars": _jobs["chars"],
+            "chars_per_second": _jobs["chars"] / seconds if seconds else 0.0,
+        }
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Restzeit für die Anzeige, z.B. 'noch ca. 1:05 min'."""
+    if seconds is None:
+        return "Restzeit wird berechnet …"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"noch ca. {seconds} s"
+    return f"noch ca. {seconds // 60}:{seconds % 60:02d} min"
@@ -1,7 +1,9 @@
+import hashlib
 import io
 import logging
 import re
 import time
+from typing import Callable, NamedTuple
 
 import nltk
 from dotenv import load_dotenv
@@ -12,11 +14,30 @@ from pydub import AudioSegment
 from database.models import PodcastStimme
 from interfaces.iservices import ITTSService
 
+from .cancellation import CancellationToken, check
 from .exceptions import TTSServiceError
+from .tts_progress import ProgressCallback, ProgressTracker
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+AUDIO_CONFIG = texttospeech.AudioConfig(
+    audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+    sample_rate_hertz=48000,
+    speaking_rate=0.92,
+    effects_profile_id=["headphone-class-device"],
+)
+
+
+class DialogBlock(NamedTuple):
+    """Aufeinanderfolgende Zeilen einer Stimme, aufgeteilt in API-Chunks."""
+
+    key: str
+    params: texttospeech.VoiceSelectionParams
+    text: str
+    chunks: list[str]
+    nltk_lang: str
+
 
 class GoogleTTSService(ITTSService):
     """
@@ -43,12 +64,65 @@ class GoogleTTSService(ITTSService):
         sprache: str,
         primary_voice: PodcastStimme,
         secondary_voice: PodcastStimme | None = None,
+        on_progress: ProgressCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+        presynthesized: Callable[[str], AudioSegment | None] | None = None,
     ) -> AudioSegment | None:
         """
         Wandelt ein Skript in ein Audio-Objekt um.
         Nutzt direkt die PodcastStimme-Objekte und wählt die ID basierend auf 'sprache'.
+        on_progress wird vor dem ersten und nach jedem Chunk mit einem
+        TTSProgress (Chunks, Zeichen, geschätzte Restzeit) aufgerufen.
+        Ein abgebrochenes cancel_token beendet die Synthese vor dem nächsten
+        Chunk mit OperationCancelledError.
+        presynthesized liefert zu einem DialogBlock.key bereits vorab erzeugtes
+        Audio (siehe services.speculative_tts) oder None.
         """
+        blocks = self.dialog_blocks(
+            script_text, sprache, primary_voice, secondary_voice
+        )
+        tracker = ProgressTracker(
+            [len(chunk) for block in blocks for chunk in block.chunks],
+            callback=on_progress,
+        )
+        tracker.start()
+
+        # API Calls & Verarbeitung
+        audio_segments = []
+
+        for block in blocks:
+            segment = presynthesized(block.key) if presynthesized else None
+            if segment is not None:
+                audio_segments.append(segment)
+                for chunk in block.chunks:
+                    tracker.chunk_done(len(chunk), measured=False)
+            else:
+                audio_segments.extend(
+                    self._synthesize_chunks(block, tracker, cancel_token)
+                )
+
+            audio_segments.append(AudioSegment.silent(duration=200))
+
+        tracker.finish()
+
+        if not audio_segments:
+            return None
 
+        check(cancel_token)
+        combined_audio = sum(audio_segments, AudioSegment.empty())
+        return combined_audio
+
+    def dialog_blocks(
+        self,
+        script_text: str,
+        sprache: str,
+        primary_voice: PodcastStimme,
+        secondary_voice: PodcastStimme | None = None,
+    ) -> list[DialogBlock]:
+        """
+        Zerlegt ein Skript in Sprecherblöcke (aufeinanderfolgende Zeilen
+        derselben Stimme) und diese in API-taugliche Chunks.
+        """
         # 1. Konfiguration basierend auf der Sprache wählen
         is_de = sprache.lower() == "deutsch"
         nltk_lang = "german" if is_de else "english"
@@ -64,13 +138,6 @@ class GoogleTTSService(ITTSService):
 
         logger.info(f"DEBUG: Voice params: {voice_params_map}")
 
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            sample_rate_hertz=48000,
-            speaking_rate=0.92,
-            effects_profile_id=["headphone-class-device"],
-        )
-
         # 2. Parsing & Batching
         dialog_blocks = []
         lines = script_text.split("\n")
@@ -106,49 +173,81 @@ class GoogleTTSService(ITTSService):
         if current_text_buffer:
             dialog_blocks.append((current_params, " ".join(current_text_buffer)))
 
-        # 3. API Calls & Verarbeitung
-        audio_segments = []
-
-        for params, text_block in dialog_blocks:
-            chunks = self._text_splitter(
-                text_block, max_chars=2000, nltk_lang=nltk_lang
+        # 3. Chunking vorab, damit der Fortschritt die Gesamtmenge kennt
+        return [
+            DialogBlock(
+                key=self._block_key(params, text_block),
+                params=params,
+                text=text_block,
+                chunks=self._text_splitter(
+                    text_block, max_chars=2000, nltk_lang=nltk_lang
+                ),
+                nltk_lang=nltk_lang,
             )
+            for params, text_block in dialog_blocks
+        ]
 
-            for chunk in chunks:
-                ssml_chunk = self._prepare_final_ssml(chunk, nltk_lang=nltk_lang)
+    def synthesize_block(
+        self, block: DialogBlock, cancel_token: CancellationToken | None = None
+    ) -> AudioSegment | None:
+        """Synthetisiert einen einzelnen Sprecherblock (ohne Pause danach)."""
+        segments = self._synthesize_chunks(block, None, cancel_token)
+        if not segments:
+            return None
+        return sum(segments, AudioSegment.empty())
 
-                for attempt in range(3):
-                    try:
-                        synthesis_input = texttospeech.SynthesisInput(ssml=ssml_chunk)
-                        response = self.client.synthesize_speech(
-                            input=synthesis_input,
-                            voice=params,
-                            audio_config=audio_config,
-                        )
-                        audio_segments.append(
-                            AudioSegment.from_file(
-                                io.BytesIO(response.audio_content), format="wav"
-                            )
-                        )
-                        break
-                    except (ResourceExhausted, ServiceUnavailable):
-                        if attempt < 2:
-                            time.sleep(2 * (attempt + 1))
-                        else:
-                            logger.error(f"TTS retries failed for chunk.")
-                    except Exception as e:
-                        logger.error(f"Unexpected error: {e}")
-                        break
-
-                time.sleep(0.1)
+    def _synthesize_chunks(
+        self,
+        block: DialogBlock,
+        tracker: ProgressTracker | None,
+        cancel_token: CancellationToken | None,
+    ) -> list[AudioSegment]:
+        audio_segments = []
 
-            audio_segments.append(AudioSegment.silent(duration=200))
+        for chunk in block.chunks:
+            check(cancel_token)
+            ssml_chunk = self._prepare_final_ssml(chunk, nltk_lang=block.nltk_lang)
+
+            for attempt in range(3):
+                try:
+                    synthesis_input = texttospeech.SynthesisInput(ssml=ssml_chunk)
+                    response = self.client.synthesize_speech(
+                        input=synthesis_input,
+                        voice=block.params,
+                        audio_config=AUDIO_CONFIG,
+                    )
+                    audio_segments.append(
+                        AudioSegment.from_file(
+                            io.BytesIO(response.audio_content), format="wav"
+                        )
+                    )
+                    break
+                except (ResourceExhausted, ServiceUnavailable):
+                    if attempt < 2:
+                        self._sleep(2 * (attempt + 1), cancel_token)
+                    else:
+                        logger.error("TTS retries failed for chunk.")
+                except Exception as e:
+                    logger.error(f"Unexpected error: {e}")
+                    break
+
+            if tracker is not None:
+                tracker.chunk_done(len(chunk))
+            self._sleep(0.1, cancel_token)
+
+        return audio_segments
 
-        if not audio_segments:
-            return None
+    @staticmethod
+    def _block_key(params, text: str) -> str:
+        # Stimme (inkl. Sprache) und Text bestimmen das Audio eindeutig
+        return hashlib.sha256(f"{params.name}\n{text}".encode("utf-8")).hexdigest()
 
-        combined_audio = sum(audio_segments, AudioSegment.empty())
-        return combined_audio
+    @staticmethod
+    def _sleep(seconds: float, cancel_token: CancellationToken | None) -> None:
+        if cancel_token is None:
+            time.sleep(seconds)
+        else:
+            cancel_token.sleep(seconds)
 
     @staticmethod
     def _text_splitter(text: str, max_chars: int, nltk_lang: str) -> list[str]:
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .exceptions import SourceFetchError
+from .html_extraction import HtmlStreamParser, document_to_text
+
+logger = logging.getLogger(__name__)
+
+# Verbindungs-Limits des gemeinsamen HTTP-Pools
+MAX_CONNECTIONS = int(os.getenv("URL_FETCH_MAX_CONNECTIONS", 32))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("URL_FETCH_MAX_PER_HOST", 4))
+FETCH_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+USER_AGENT = "Mozilla/5.0"
+
+# Mehr wird von einer Seite nie gelesen; der Rest des Bodys wird verworfen
+MAX_RESPONSE_BYTES = int(os.getenv("URL_FETCH_MAX_BYTES", 5 * 1024 * 1024))
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+TEXT_CONTENT_TYPES = {"text/plain"}
+
+
+class FetchResult(NamedTuple):
+    """Ergebnis eines URL-Abrufs (Text bereits aus dem HTML extrahiert)."""
+
+    url: str
+    status_code: int
+    text: str
+    title: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    truncated: bool = False
+
+
+def _content_type(response: httpx.Response) -> tuple[str, Optional[str]]:
+    """Returns (mime_type, charset) from the Content-Type header."""
+    header = response.headers.get("Content-Type", "text/html")
+    mime, _, params = header.partition(";")
+    charset = None
+    for param in params.split(";"):
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip("\"' ")
+    return mime.strip().lower(), charset
+
+
+class UrlFetcher:
+    """
+    Lädt mehrere URLs nebenläufig über einen gemeinsamen async HTTP-Client.
+
+    Der Client läuft in einem eigenen Event-Loop-Thread und wird von allen
+    Anfragen (auch verschiedener Nutzer) geteilt, damit Verbindungen und
+    TLS-Sessions wiederverwendet werden. Pro Host sind höchstens
+    MAX_CONNECTIONS_PER_HOST Requests gleichzeitig aktiv.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="url-fetcher", daemon=True
+                ).start()
+                self._loop = loop
+        return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Wird nur im Loop-Thread aufgerufen
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=FETCH_TIMEOUT,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
+        return self._host_limits[host]
+
+    async def _fetch(self, url: str, headers: dict) -> FetchResult:
+        async with self._host_limit(url):
+            async with self._get_client().stream("GET", url, headers=headers) as r:
+                validators = {
+                    "etag": r.headers.get("ETag"),
+                    "last_modified": r.headers.get("Last-Modified"),
+                }
+                if r.status_code == 304:
+                    return FetchResult(url, 304, "", **validators)
+                r.raise_for_status()
+
+                mime, charset = _content_type(r)
+                if mime not in HTML_CONTENT_TYPES | TEXT_CONTENT_TYPES:
+                    raise SourceFetchError(f"Nicht unterstützter Inhaltstyp: {mime}")
+
+                parser = (
+                    HtmlStreamParser(charset) if mime in HTML_CONTENT_TYPES else None
+                )
+                raw = bytearray()
+                received = 0
+                truncated = False
+                async for chunk in r.aiter_bytes():
+                    chunk = chunk[: MAX_RESPONSE_BYTES - received]
+                    received += len(chunk)
+                    if parser:
+                        parser.feed(chunk)
+                    else:
+                        raw += chunk
+                    if received >= MAX_RESPONSE_BYTES:
+                        truncated = True
+                        logger.warning(f"Antwort nach {received} Bytes gekürzt: {url}")
+                        break
+
+        if parser:
+            # Hauptinhalt im Thread-Pool extrahieren, damit der Loop frei bleibt
+            text, title = await asyncio.to_thread(
+                lambda: document_to_text(parser.close())
+            )
+        else:
+            text, title = raw.decode(charset or "utf-8", errors="ignore").strip(), ""
+        return FetchResult(
+            url, r.status_code, text, title, truncated=truncated, **validators
+        )
+
+    async def _fetch_all(
+        self, requests: list[tuple[str, dict]]
+    ) -> list[FetchResult | Exception]:
+        return await asyncio.gather(
+            *(self._fetch(url, headers) for url, headers in requests),
+            return_exceptions=True,
+        )
+
+    def fetch_many(
+        self, requests: list[tuple[str, dict]], timeout: Optional[float] = None
+    ) -> list[FetchResult | Exception]:
+        """
+        Lädt alle (url, extra_headers)-Paare gleichzeitig.
+        Gibt pro URL ein FetchResult oder die aufgetretene Exception zurück.
+        """
+        if not requests:
+            return []
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_all(requests), self._ensure_loop()
+        )
+        return future.result(timeout)
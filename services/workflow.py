@@ -1,5 +1,6 @@
 from datetime import date
 import os
+import threading
 import uuid
 import re
 
@@ -7,6 +8,9 @@ import re
 from .llm_service import LLMService
 from .tts_service import GoogleTTSService
 from .exceptions import TTSServiceError
+from .cancellation import CancellationToken, check
+from .speculative_tts import SPECULATIVE_TTS, SpeculativeSynthesizer
+from .audio_cleanup import podcast_files, schedule_removal
 from interfaces.iservices import IWorkflow, ILLMService, ITTSService
 from database.database import get_db
 from database.models import (
@@ -16,7 +20,7 @@ from database.models import (
     Podcast,
     AuftragsStatus,
 )
-from repositories import VoiceRepo, TextRepo, JobRepo, PodcastRepo
+from repositories import VoiceRepo, PodcastRepo, UnitOfWork
 
 
 import logging
@@ -28,6 +32,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("MAIN")
 
+# So viele Podcasts werden in der Übersicht angezeigt
+PODCAST_LIST_LIMIT = 10
+
 
 class PodcastWorkflow(IWorkflow):
     """Workflow: LLM → Skript → TTS → DB"""
@@ -37,6 +44,17 @@ class PodcastWorkflow(IWorkflow):
     ):
         self.llm_service = llm_service or LLMService()
         self.tts_service = tts_service or GoogleTTSService()
+        # Vorab-Synthese während der Skriptprüfung (opt-in, SPECULATIVE_TTS)
+        self.speculative = (
+            SpeculativeSynthesizer(self.tts_service) if SPECULATIVE_TTS else None
+        )
+
+        # Podcast-Anzahl pro Benutzer für die Limit-Prüfung; wird beim Anlegen
+        # und Löschen invalidiert. Die Version verhindert, dass ein Zählergebnis
+        # von vor einer Änderung nachträglich im Cache landet.
+        self._podcast_counts: dict[int, int] = {}
+        self._podcast_count_versions: dict[int, int] = {}
+        self._podcast_counts_lock = threading.Lock()
 
     # --------------------------------------------------
     # 1) LLM → Skript
@@ -51,6 +69,7 @@ class PodcastWorkflow(IWorkflow):
         hauptstimme: str,
         zweitstimme: str | None,
         source_text: str | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> str:
         config = {
             "language": sprache,
@@ -64,7 +83,9 @@ class PodcastWorkflow(IWorkflow):
         }
 
         # Skript vom LLM generieren lassen
-        script = self.llm_service.generate_script(thema=thema, config=config)
+        script = self.llm_service.generate_script(
+            thema=thema, config=config, cancel_token=cancel_token
+        )
 
         # XML-Tags entfernen
         clean_script = re.sub(r"<[^>]*>", "", script)
@@ -127,43 +148,38 @@ class PodcastWorkflow(IWorkflow):
         primary_role=None,
         secondary_role=None,
     ):
-        text_repo = TextRepo(session)
-        job_repo = JobRepo(session)
-        podcast_repo = PodcastRepo(session)
         try:
-            text = text_repo.add(
-                Textbeitrag(
-                    userId=user_id,
-                    # llmId entfernt
-                    userPrompt=user_prompt,
-                    erzeugtesSkript=script,
-                    titel=thema,
-                    erstelldatum=date.today(),
-                    sprache=sprache,
-                )
+            text = Textbeitrag(
+                userId=user_id,
+                # llmId entfernt
+                userPrompt=user_prompt,
+                erzeugtesSkript=script,
+                titel=thema,
+                erstelldatum=date.today(),
+                sprache=sprache,
             )
-            job = job_repo.add(
-                Konvertierungsauftrag(
-                    textId=text.textId,
-                    # modellId entfernt
-                    # IDs entfernt, Strings rein
-                    hauptstimmeName=primary_voice.name,
-                    zweitstimmeName=secondary_voice.name if secondary_voice else None,
-                    hauptstimmeRolle=primary_role,
-                    zweitstimmeRolle=secondary_role if secondary_voice else None,
-                    gewuenschteDauer=dauer,
-                    status=AuftragsStatus.IN_BEARBEITUNG,
-                )
+            job = Konvertierungsauftrag(
+                textbeitrag=text,
+                # modellId entfernt
+                # IDs entfernt, Strings rein
+                hauptstimmeName=primary_voice.name,
+                zweitstimmeName=secondary_voice.name if secondary_voice else None,
+                hauptstimmeRolle=primary_role,
+                zweitstimmeRolle=secondary_role if secondary_voice else None,
+                gewuenschteDauer=dauer,
+                status=AuftragsStatus.IN_BEARBEITUNG,
             )
-            podcast = podcast_repo.add(
-                Podcast(
-                    auftragId=job.auftragId,
-                    titel=thema,
-                    realdauer=dauer,
-                    dateipfadAudio=audio_path,
-                    erstelldatum=date.today(),
-                )
+            podcast = Podcast(
+                konvertierungsauftrag=job,
+                titel=thema,
+                realdauer=dauer,
+                dateipfadAudio=audio_path,
+                erstelldatum=date.today(),
             )
+            # Ein Flush vergibt alle IDs, ein Commit schreibt alles atomar
+            with UnitOfWork(session) as uow:
+                uow.stage(text, job, podcast)
+            self._invalidate_podcast_count(user_id)
             return text, job, podcast
         except Exception:
             logger.error("Fehler beim Speichern der Metadaten", exc_info=True)
@@ -209,37 +225,39 @@ class PodcastWorkflow(IWorkflow):
         finally:
             session.close()
 
-    def get_podcasts_data(self, user_id: int = None):
-        """Returns list of dicts for the UI cards, filtered by user_id if provided."""
+    def get_podcasts_data(
+        self,
+        user_id: int = None,
+        before_id: int = None,
+        limit: int = PODCAST_LIST_LIMIT,
+    ):
+        """
+        Returns list of dicts for the UI cards, filtered by user_id if provided.
+        One page of `limit` podcasts, older than before_id if given.
+        """
         session = get_db()
         try:
-            podcast_repo = PodcastRepo(session)
-            if user_id:
-                podcasts = podcast_repo.get_by_user_id(user_id)
-                podcasts.sort(key=lambda x: x.podcastId, reverse=True)
-                podcasts = podcasts[:10]
-            else:
+            if not user_id:
                 return []
+            rows = PodcastRepo(session).get_cards_by_user_id(
+                user_id, limit=limit, before_id=before_id
+            )
 
             result = []
-            for p in podcasts:
-                job = p.konvertierungsauftrag
-
+            for p in rows:
                 # Build speaker and role strings
                 speakers = []
                 roles = []
 
-                # NEU: Namen aus String-Spalten lesen
-                if job.hauptstimmeName:
-                    speakers.append(job.hauptstimmeName)
-                    roles.append(job.hauptstimmeRolle or "Sprecher")
+                if p.hauptstimmeName:
+                    speakers.append(p.hauptstimmeName)
+                    roles.append(p.hauptstimmeRolle or "Sprecher")
 
-                if job.zweitstimmeName:
-                    speakers.append(job.zweitstimmeName)
-                    roles.append(job.zweitstimmeRolle or "Sprecher")
+                if p.zweitstimmeName:
+                    speakers.append(p.zweitstimmeName)
+                    roles.append(p.zweitstimmeRolle or "Sprecher")
 
-                text = job.textbeitrag
-                sprache = text.sprache if text else "Deutsch"
+                sprache = p.sprache or "Deutsch"
 
                 speaker_str = " & ".join(speakers) if speakers else "Unbekannt"
                 roles_str = ", ".join(roles) if roles else ""
@@ -260,6 +278,33 @@ class PodcastWorkflow(IWorkflow):
         finally:
             session.close()
 
+    def count_podcasts(self, user_id: int = None) -> int:
+        """Anzahl der Podcasts eines Benutzers (gecacht bis zur nächsten Änderung)."""
+        if not user_id:
+            return 0
+        with self._podcast_counts_lock:
+            if user_id in self._podcast_counts:
+                return self._podcast_counts[user_id]
+            version = self._podcast_count_versions.get(user_id, 0)
+
+        session = get_db()
+        try:
+            count = PodcastRepo(session).count_by_user_id(user_id)
+        finally:
+            session.close()
+
+        with self._podcast_counts_lock:
+            if self._podcast_count_versions.get(user_id, 0) == version:
+                self._podcast_counts[user_id] = count
+        return count
+
+    def _invalidate_podcast_count(self, user_id):
+        with self._podcast_counts_lock:
+            self._podcast_counts.pop(user_id, None)
+            self._podcast_count_versions[user_id] = (
+                self._podcast_count_versions.get(user_id, 0) + 1
+            )
+
     def get_voices_for_ui(self):
         session = get_db()
         try:
@@ -280,37 +325,86 @@ class PodcastWorkflow(IWorkflow):
         finally:
             session.close()
 
-    def generate_audio_obj_step(self, script_text, sprache, hauptstimme, zweitstimme):
-        """Generates the audio object in MEMORY (does not save to disk)."""
+    def generate_audio_obj_step(
+        self,
+        script_text,
+        sprache,
+        hauptstimme,
+        zweitstimme,
+        on_progress=None,
+        cancel_token=None,
+        speculative_key=None,
+    ):
+        """
+        Generates the audio object in MEMORY (does not save to disk).
+        on_progress receives a TTSProgress after every synthesized chunk;
+        cancel_token stops the synthesis before the next chunk. With
+        speculative_key, blocks pre-synthesized for that user are reused.
+        """
         session = get_db()
         try:
-            voice_repo = VoiceRepo(session)
-            
-            # Sicher suchen
-            voices_p = voice_repo.get_voices_by_names([hauptstimme])
-            if not voices_p:
-                raise TTSServiceError(f"Hauptstimme '{hauptstimme}' nicht gefunden!")
-            db_p = voices_p[0]
-            
-            db_s = None
-            if zweitstimme and zweitstimme != "Keine":
-                voices_s = voice_repo.get_voices_by_names([zweitstimme])
-                if voices_s:
-                    db_s = voices_s[0]
+            db_p, db_s = self._resolve_voices(
+                VoiceRepo(session), hauptstimme, zweitstimme
+            )
 
-            return self.tts_service.generate_audio(
+            presynthesized = None
+            if self.speculative and speculative_key is not None:
+                presynthesized = self.speculative.lookup(speculative_key, cancel_token)
+
+            audio = self.tts_service.generate_audio(
                 script_text=script_text,
                 sprache=sprache,
                 primary_voice=db_p,
                 secondary_voice=db_s,
+                on_progress=on_progress,
+                cancel_token=cancel_token,
+                presynthesized=presynthesized,
             )
+            if presynthesized is not None:
+                self.speculative.finish(speculative_key)
+            return audio
         finally:
             session.close()
 
-    def save_audio_file(self, audio_segment) -> str:
-        """Saves an audio segment to the Output folder"""
+    def presynthesize_audio(
+        self, user_key, script_text, sprache, hauptstimme, zweitstimme
+    ) -> int:
+        """
+        Starts synthesizing the script's dialog blocks in the background
+        (opt-in, see services.speculative_tts). Returns the number of newly
+        scheduled blocks.
+        """
+        if not self.speculative or not script_text or not script_text.strip():
+            return 0
+        # Stimmen sind statisch, dafür wird keine DB-Session gebraucht
+        db_p, db_s = self._resolve_voices(VoiceRepo(), hauptstimme, zweitstimme)
+        return self.speculative.presynthesize(
+            user_key, script_text, sprache, db_p, db_s
+        )
+
+    @staticmethod
+    def _resolve_voices(voice_repo, hauptstimme, zweitstimme):
+        # Sicher suchen
+        voices_p = voice_repo.get_voices_by_names([hauptstimme])
+        if not voices_p:
+            raise TTSServiceError(f"Hauptstimme '{hauptstimme}' nicht gefunden!")
+        db_p = voices_p[0]
+
+        db_s = None
+        if zweitstimme and zweitstimme != "Keine":
+            voices_s = voice_repo.get_voices_by_names([zweitstimme])
+            if voices_s:
+                db_s = voices_s[0]
+        return db_p, db_s
+
+    def save_audio_file(self, audio_segment, cancel_token=None) -> str:
+        """
+        Saves an audio segment to the Output folder. If the job is cancelled
+        while encoding, the MP3 is removed again.
+        """
         if not audio_segment:
             raise TTSServiceError("Kein Audio zum Speichern vorhanden")
+        check(cancel_token)
 
         try:
             output_dir = os.path.join(
@@ -322,12 +416,17 @@ class PodcastWorkflow(IWorkflow):
             db_path = os.path.join("Output", filename)
 
             audio_segment.export(filepath, format="mp3")
-            logger.info(f"Audio erfolgreich gespeichert: {filepath}")
-            return db_path
         except Exception as e:
             logger.error(f"Fehler beim Speichern der Audiodatei: {e}")
             raise TTSServiceError(f"IO Error beim Speichern: {e}")
 
+        # Der Export selbst ist nicht unterbrechbar; danach wird verworfen
+        if cancel_token is not None and cancel_token.cancelled:
+            schedule_removal([filepath])
+            cancel_token.raise_if_cancelled()
+        logger.info(f"Audio erfolgreich gespeichert: {filepath}")
+        return db_path
+
     def save_podcast_db(
         self,
         user_id,
@@ -399,12 +498,12 @@ class PodcastWorkflow(IWorkflow):
         session = get_db()
         try:
             voice_repo = VoiceRepo(session)
-            
+
             voices_p = voice_repo.get_voices_by_names([hauptstimme])
             if not voices_p:
                 raise TTSServiceError(f"Stimme '{hauptstimme}' nicht gefunden")
             db_p = voices_p[0]
-            
+
             db_s = None
             if zweitstimme and zweitstimme != "Keine":
                 voices_s = voice_repo.get_voices_by_names([zweitstimme])
@@ -444,12 +543,12 @@ class PodcastWorkflow(IWorkflow):
         session = get_db()
         try:
             voice_repo = VoiceRepo(session)
-            
+
             voices_p = voice_repo.get_voices_by_names([hauptstimme])
             if not voices_p:
                 raise TTSServiceError(f"Stimme '{hauptstimme}' nicht gefunden")
             db_p = voices_p[0]
-            
+
             db_s = None
             if zweitstimme and zweitstimme != "Keine":
                 voices_s = voice_repo.get_voices_by_names([zweitstimme])
@@ -479,16 +578,24 @@ class PodcastWorkflow(IWorkflow):
             session.close()
 
     def delete_podcast(self, podcast_id: int, user_id: int) -> bool:
-        """Deletes a podcast by ID, verifying user ownership."""
+        """
+        Deletes a podcast (with its job, and its text if no other job uses
+        it) if the user owns it and queues its audio files for removal in
+        the background.
+        """
         session = get_db()
         try:
-            podcast_repo = PodcastRepo(session)
-            user_podcasts = podcast_repo.get_by_user_id(user_id)
-            if any(p.podcastId == podcast_id for p in user_podcasts):
-                podcast_repo.delete_by_id(podcast_id)
-                session.commit()
-                return True
-            return False
+            deleted = PodcastRepo(session).delete_owned(podcast_id, user_id)
+            if deleted is None:
+                return False
+            session.commit()
+            self._invalidate_podcast_count(user_id)
+            schedule_removal(
+                podcast_files(
+                    deleted.dateipfadAudio, deleted.titel, deleted.erstelldatum
+                )
+            )
+            return True
         finally:
             session.close()
 
@@ -506,7 +613,7 @@ if __name__ == "__main__":
             dauer=1,
             sprache="de",
             hauptstimme="Max",
-            zweitstimme="Sarah", # Korrigiert: Sarah mit h
+            zweitstimme="Sarah",  # Korrigiert: Sarah mit h
             speakers=2,
         )
         logger.info(f"Podcast erfolgreich erstellt: {audio_file}")
@@ -0,0 +1,211 @@
+"""
+Startup-Benchmark für den Podcast Generator.
+
+Misst die Importkosten beim Start (wie ``python -X importtime``, nach Paketen
+zusammengefasst), prüft, dass schwere Abhängigkeiten nicht schon beim Import
+der UI geladen werden, und optional die Zeit bis zur ersten ausgelieferten
+Seite von ``main.py``.
+
+    python startup_benchmark.py                 # Importprofil von frontend.ui
+    python startup_benchmark.py --serve         # zusätzlich Zeit bis zum ersten Request
+    python startup_benchmark.py --max-import-seconds 6 --max-first-request-seconds 15
+
+Das Import-Budget gilt auch ohne Option (IMPORT_BUDGET_SECONDS, per
+STARTUP_IMPORT_BUDGET_SECONDS anpassbar). tests/test_startup.py prüft immer
+die verzögerten Module und das Budget nur, wenn die Variable gesetzt ist. Der Exit-Code ist 1, wenn ein Budget überschritten oder ein
+verbotenes Modul beim Import geladen wurde (für CI).
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Werden erst auf dem Code-Pfad geladen, der sie braucht (Login, Generierung,
+# Quellenimport, Datenbank) und dürfen den Start der UI nicht verlangsamen.
+DEFERRED_MODULES = [
+    "sqlalchemy",
+    "flask",
+    "passlib",
+    "nltk",
+    "google.cloud.texttospeech",
+    "PyPDF2",
+    "lxml",
+    "requests",
+    "sshtunnel",
+]
+
+# Obergrenze für den Import der UI (Gradio allein braucht einige Sekunden)
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", 8))
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Parst die stderr-Ausgabe von ``python -X importtime``."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            records.append(
+                ImportRecord(
+                    module=name.strip(),
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    depth=(len(name) - len(name.lstrip()) - 1) // 2,
+                )
+            )
+        except ValueError:
+            continue
+    return records
+
+
+def by_package(records: list[ImportRecord]) -> dict[str, int]:
+    """Summiert die Eigenzeit (µs) je Top-Level-Paket."""
+    totals: dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_us
+    return dict(totals)
+
+
+def import_seconds(records: list[ImportRecord], target: str) -> float:
+    """Kumulierte Importzeit von target in Sekunden (0, falls nicht gefunden)."""
+    total = next((r for r in records if r.module == target), None)
+    return total.cumulative_us / 1e6 if total else 0.0
+
+
+def profile_import(target: str = "frontend.ui") -> list[ImportRecord]:
+    """Importiert target in einem frischen Interpreter mit -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def loaded_deferred_modules(target: str = "frontend.ui") -> list[str]:
+    """Gibt die DEFERRED_MODULES zurück, die beim Import von target geladen werden."""
+    code = (
+        f"import sys, {target}\n"
+        f"print('\\n'.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_request(timeout: float = 120.0) -> Optional[float]:
+    """Startet main.py und misst die Zeit bis zur ersten Antwort mit Status 200."""
+    port = _free_port()
+    env = dict(os.environ, HOST="127.0.0.1", PORT=str(port))
+    t0 = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - t0 < timeout:
+            if process.poll() is not None:
+                return None
+            try:
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}/", timeout=2
+                ) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - t0
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                time.sleep(0.1)
+        return None
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", default="frontend.ui")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument(
+        "--max-import-seconds",
+        type=float,
+        default=IMPORT_BUDGET_SECONDS,
+    )
+    parser.add_argument("--max-first-request-seconds", type=float, default=None)
+    args = parser.parse_args(argv)
+    failed = False
+
+    records = profile_import(args.target)
+    total_s = import_seconds(records, args.target)
+    print(f"Import von {args.target}: {total_s:.2f}s\n")
+
+    print(f"{'Paket':<30} {'Eigenzeit':>10}")
+    packages = sorted(by_package(records).items(), key=lambda kv: -kv[1])
+    for package, self_us in packages[: args.top]:
+        print(f"{package:<30} {self_us / 1000:>8.0f}ms")
+
+    print(f"\n{'Modul':<50} {'kumuliert':>10}")
+    for record in sorted(records, key=lambda r: -r.cumulative_us)[: args.top]:
+        print(f"{record.module:<50} {record.cumulative_us / 1000:>8.0f}ms")
+
+    deferred = loaded_deferred_modules(args.target)
+    if deferred:
+        failed = True
+        print(f"\nBeim Start geladen, obwohl verzögert: {', '.join(deferred)}")
+
+    if args.max_import_seconds and total_s > args.max_import_seconds:
+        failed = True
+        print(f"\nImport-Budget überschritten ({args.max_import_seconds:.1f}s)")
+
+    if args.serve:
+        first_request = time_to_first_request()
+        if first_request is None:
+            failed = True
+            print("\nmain.py hat keine Seite ausgeliefert")
+        else:
+            print(f"\nZeit bis zum ersten Request: {first_request:.2f}s")
+            budget = args.max_first_request_seconds
+            if budget and first_request > budget:
+                failed = True
+                print(f"Budget überschritten ({budget:.1f}s)")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
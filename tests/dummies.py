@@ -3,10 +3,14 @@ class DummySession:
         self.added = []
         self.commit_count = 0
         self.rolled_back = False
+        self.expire_on_commit = True
 
     def add(self, obj):
         self.added.append(obj)
 
+    def add_all(self, objs):
+        self.added.extend(objs)
+
     def commit(self):
         self.commit_count += 1
 
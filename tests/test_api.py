@@ -0,0 +1,179 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from frontend import api
+
+HEADERS = {"X-API-Key": "secret"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("PODCAST_API_KEY", "secret")
+    monkeypatch.setenv("API_USER_ID", "1")
+    monkeypatch.setattr(api, "jobs", api.JobStore(max_pending=2, ttl=60))
+    monkeypatch.setattr(
+        "frontend.controller.generate_script", lambda **kw: "Max: Hallo."
+    )
+    monkeypatch.setattr("frontend.controller.generate_audio_only", lambda **kw: "audio")
+    monkeypatch.setattr("frontend.controller.count_podcasts_for_user", lambda uid: 0)
+    monkeypatch.setattr(
+        "frontend.controller.save_generated_podcast",
+        lambda **kw: (
+            "Output/podcast_1.mp3",
+            {"id": 7, "titel": kw["thema"], "dauer": 5, "datum": "2026-01-02"},
+        ),
+    )
+    app = FastAPI()
+    app.include_router(api.router)
+    return TestClient(app)
+
+
+def _wait_for(client, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/api/jobs/{job_id}", headers=HEADERS).json()
+        if status["status"] not in ("queued", "running"):
+            return status
+        time.sleep(0.01)
+    raise AssertionError("Job wurde nicht fertig")
+
+
+def test_submit_poll_and_download(client):
+    """Submit antwortet sofort mit 202, das Ergebnis wird per Polling abgeholt."""
+    response = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    status = _wait_for(client, job_id)
+    assert status["status"] == "done"
+    assert status["result"]["podcast_id"] == 7
+
+    audio = client.get(
+        f"/api/jobs/{job_id}/audio", headers=HEADERS, follow_redirects=False
+    )
+    assert audio.status_code == 303
+    assert audio.headers["location"].startswith("/media/podcast_1.mp3?download=")
+
+
+def test_requires_api_key_and_valid_input(client):
+    assert client.post("/api/podcasts", json={"thema": "KI"}).status_code == 401
+    assert client.post("/api/podcasts", json={}, headers=HEADERS).status_code == 422
+    invalid_voice = {"thema": "KI", "speaker1": "Unbekannt"}
+    assert (
+        client.post("/api/podcasts", json=invalid_voice, headers=HEADERS).status_code
+        == 422
+    )
+    assert client.get("/api/jobs/unknown", headers=HEADERS).status_code == 404
+
+
+def test_requires_configured_api_user(client, monkeypatch):
+    for value in ("", "abc"):
+        monkeypatch.setenv("API_USER_ID", value)
+        response = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+        assert response.status_code == 503
+
+
+def test_enforces_api_podcast_quota(client, monkeypatch):
+    """Gespeicherte und offene Jobs zählen gegen API_MAX_PODCASTS."""
+    monkeypatch.setattr(api, "API_MAX_PODCASTS", 20)
+    count = 19
+    monkeypatch.setattr(
+        "frontend.controller.count_podcasts_for_user", lambda uid: count
+    )
+    generated = []
+    monkeypatch.setattr(
+        "frontend.controller.generate_script", lambda **kw: generated.append(kw)
+    )
+    monkeypatch.setattr(api._executor, "submit", lambda fn, job: None)
+
+    first = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+    assert first.status_code == 202
+    second = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+    assert second.status_code == 409
+
+    # Ist das Limit inzwischen erreicht, schlägt der Job vor der Generierung fehl
+    count = 20
+    job = api.jobs.get(first.json()["job_id"])
+    api.run_job(job)
+    assert job.status == "failed"
+    assert "Limit" in job.error
+    assert generated == []
+
+
+def test_api_quota_is_independent_of_ui_limit(client, monkeypatch):
+    monkeypatch.setattr("frontend.controller.count_podcasts_for_user", lambda uid: 500)
+    monkeypatch.setattr(api._executor, "submit", lambda fn, job: None)
+    response = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+    assert response.status_code == 202
+
+
+def test_rejects_submissions_when_queue_is_full(client, monkeypatch):
+    """Mehr als max_pending offene Jobs werden mit 429 abgewiesen."""
+    monkeypatch.setattr(api._executor, "submit", lambda fn, job: None)
+
+    for _ in range(2):
+        assert (
+            client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+        ).status_code == 202
+    response = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_submit_returns_503_while_backend_starts(client, monkeypatch):
+    monkeypatch.setattr(api, "is_starting", lambda: True)
+
+    response = client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert client.get("/api/health").json()["starting"] is True
+
+
+def test_shutdown_cancels_unfinished_jobs(client, monkeypatch):
+    """Beim Beenden erhalten laufende und wartende Jobs einen Endstatus."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from services.exceptions import OperationCancelledError
+
+    def slow_script(**kw):
+        while not kw["cancel_token"].cancelled:
+            time.sleep(0.01)
+        raise OperationCancelledError("abgebrochen")
+
+    monkeypatch.setattr("frontend.controller.generate_script", slow_script)
+    monkeypatch.setattr(api, "_executor", ThreadPoolExecutor(max_workers=1))
+
+    with client:
+        ids = [
+            client.post("/api/podcasts", json={"thema": "KI"}, headers=HEADERS).json()[
+                "job_id"
+            ]
+            for _ in range(2)
+        ]
+
+    assert [api.jobs.get(i).status for i in ids] == ["cancelled", "cancelled"]
+
+
+def test_metrics_expose_pool_queue_and_tts_counters(client, monkeypatch):
+    from services import tts_progress
+
+    monkeypatch.setattr(api, "is_ready", lambda: True)
+    monkeypatch.setattr(
+        "database.database.get_pool_metrics", lambda: {"checked_out": 1}
+    )
+    monkeypatch.setattr(
+        tts_progress, "_jobs", {"jobs": 1, "chars": 100, "seconds": 2.0}
+    )
+    monkeypatch.setattr(api, "queue_wait_metrics", lambda: {"audio": {"events": 3}})
+
+    assert client.get("/api/metrics").status_code == 401
+    metrics = client.get("/api/metrics", headers=HEADERS).json()
+
+    assert metrics["db_pool"] == {"checked_out": 1}
+    assert metrics["queue_wait"]["audio"]["events"] == 3
+    assert metrics["tts"]["chars_per_second"] == 50.0
@@ -0,0 +1,53 @@
+import types
+
+import gradio as gr
+from gradio.context import LocalContext
+
+from frontend import concurrency
+
+
+def test_queued_assigns_class_limits(monkeypatch):
+    """Events einer Klasse teilen sich concurrency_id und Limit aus der Umgebung."""
+    monkeypatch.setenv("GRADIO_LIMIT_AUDIO", "1")
+    with gr.Blocks() as demo:
+        btn = gr.Button()
+        out = gr.Textbox()
+        btn.click(**concurrency.queued("audio", lambda: "a"), outputs=out)
+        btn.click(**concurrency.queued("navigation", lambda: "n"), outputs=out)
+
+    limits = {(f.concurrency_id, f.concurrency_limit) for f in demo.fns.values()}
+    assert limits == {("audio", 1), ("navigation", 8)}
+
+
+def test_queue_wait_is_recorded_for_generators(monkeypatch):
+    """Die Wartezeit wird gemessen; Generator-Handler bleiben Generatoren."""
+    queue = types.SimpleNamespace(event_analytics={"e1": {"time": 100.0}})
+    monkeypatch.setattr(concurrency, "_current_queue", lambda: queue)
+    monkeypatch.setattr(concurrency.time, "time", lambda: 102.5)
+    monkeypatch.setattr(concurrency, "_wait_stats", {})
+    token = LocalContext.event_id.set("e1")
+
+    def handler(n):
+        yield from range(n)
+
+    fn = concurrency.queued("script", handler)["fn"]
+    try:
+        assert list(fn(3)) == [0, 1, 2]
+    finally:
+        LocalContext.event_id.reset(token)
+
+    metrics = concurrency.queue_wait_metrics()["script"]
+    assert metrics["events"] == 1
+    assert metrics["wait_max"] == 2.5
+
+
+def test_busy_when_all_slots_taken(monkeypatch):
+    """Sind alle Plätze einer Klasse belegt, meldet backlog die Wartenden."""
+    event_queue = types.SimpleNamespace(queue=["x"], current_concurrency=2)
+    queue = types.SimpleNamespace(event_queue_per_concurrency_id={"audio": event_queue})
+    monkeypatch.setattr(concurrency, "_current_queue", lambda: queue)
+
+    assert concurrency.backlog("audio") == 1
+    event_queue.queue, event_queue.current_concurrency = [], 1
+    assert concurrency.backlog("audio") is None
+    assert concurrency.backlog("login") is None
@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from frontend import controller
+
+
+@pytest.fixture
+def fresh_controller(monkeypatch):
+    """Setzt den Workflow-Singleton und den Warm-up-Zustand zurück."""
+    monkeypatch.setattr(controller, "_workflow", None)
+    monkeypatch.setattr(controller, "_warmup_thread", None)
+    monkeypatch.setattr(controller, "_ready", threading.Event())
+    monkeypatch.setattr(controller, "_warmup_done", threading.Event())
+    yield controller
+
+
+def test_available_voices_without_backend(fresh_controller):
+    """Die Stimmen für die UI kommen aus dem statischen Katalog."""
+    with patch.object(
+        controller, "get_workflow", side_effect=AssertionError("kein Backend")
+    ):
+        primary, secondary = controller.get_available_voices()
+
+    assert primary[0] == "Max"
+    assert "Mia" in secondary
+    assert not set(primary) & set(secondary)
+
+
+def test_workflow_is_built_once_under_concurrency(fresh_controller):
+    """Warm-up und erste Requests erzeugen nur einen Workflow."""
+
+    def slow_workflow(**kwargs):
+        time.sleep(0.05)
+        return MagicMock()
+
+    with (
+        patch("services.llm_service.LLMService"),
+        patch("services.tts_service.GoogleTTSService"),
+        patch("services.workflow.PodcastWorkflow", side_effect=slow_workflow) as cls,
+    ):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(controller.get_workflow()))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert cls.call_count == 1
+    assert len({id(r) for r in results}) == 1
+
+
+def test_warm_up_sets_readiness(fresh_controller):
+    """Nach dem Warm-up im Hintergrund ist das Backend bereit."""
+    with (
+        patch("database.database.init_db_connection") as init_db,
+        patch.object(controller, "get_workflow") as get_workflow,
+    ):
+        assert not controller.is_ready()
+        thread = controller.start_warm_up()
+        assert controller.start_warm_up() is thread
+        assert controller.wait_until_ready(timeout=5)
+
+    init_db.assert_called_once()
+    get_workflow.assert_called_once()
+
+
+def test_requests_wait_for_running_warm_up(fresh_controller):
+    """Anfragen während des Warm-ups warten darauf, statt zu blockieren."""
+    from frontend import ui_handlers
+
+    release = threading.Event()
+    with (
+        patch("database.database.init_db_connection", side_effect=release.wait),
+        patch.object(controller, "get_workflow"),
+        patch.object(ui_handlers, "BACKEND_STARTUP_WAIT", 0.01),
+        patch.object(ui_handlers.gr, "Info"),
+        patch.object(ui_handlers.gr, "Warning") as warning,
+    ):
+        controller.start_warm_up()
+        assert controller.is_starting()
+        assert not ui_handlers.wait_for_backend()
+        warning.assert_called_once()
+
+        release.set()
+        assert controller.wait_until_ready(timeout=5)
+        assert ui_handlers.wait_for_backend()
+
+
+def test_podcast_page_reports_more_only_if_older_podcasts_exist(monkeypatch):
+    """Eine Zeile mehr als die Seitengröße zeigt an, ob es weitere gibt."""
+    monkeypatch.setattr(controller, "PODCAST_PAGE_SIZE", 2)
+    workflow = MagicMock()
+    workflow.get_podcasts_data.side_effect = lambda user_id, before_id, limit: [
+        {"id": i} for i in (30, 20, 10)[:limit]
+    ]
+    monkeypatch.setattr(controller, "get_workflow", lambda: workflow)
+
+    page = controller.get_podcasts_for_user(1)
+    assert [p["id"] for p in page] == [30, 20]
+    assert page.has_more
+
+    workflow.get_podcasts_data.side_effect = lambda **kw: [{"id": 30}, {"id": 20}]
+    assert not controller.get_podcasts_for_user(1).has_more
@@ -1,15 +1,26 @@
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc, inspect, text
 from sqlalchemy.orm import sessionmaker
 from datetime import date
 from database.models import (
     Base,
+    Benutzer,
     AuftragsStatus,
     PodcastStimme,
     Textbeitrag,
     Konvertierungsauftrag,
     Podcast,
 )
+from database.migrations import (
+    LATEST_VERSION,
+    ensure_schema,
+    get_schema_version,
+    migrate,
+    schema_version,
+)
+from database.pool import engine_options, instrument_engine, pool_metrics
+from database.sqlite_backend import create_sqlite_engine
+from repositories.unit_of_work import UnitOfWork
 from repositories.user_repo import UserRepo
 from repositories.job_repo import JobRepo
 from repositories.podcast_repo import PodcastRepo
@@ -68,7 +79,7 @@ def test_text_repository(db_session):
 
 def test_job_repository_and_relationships(db_session):
     user = UserRepo(db_session).create_user("jobuser@example.com")
-    
+
     # Stimmen sind jetzt hardcoded, wir nehmen einfach Namen
     v_name_1 = "Max"
     v_name_2 = "Sarah"
@@ -176,7 +187,7 @@ def test_voice_repo(db_session):
     repo = VoiceRepo(db_session)
     voices = repo.get_all()
     names = [v.name for v in voices]
-    
+
     # Check ob die Standard-Stimmen da sind
     assert "Max" in names
     assert "Sarah" in names
@@ -185,3 +196,372 @@ def test_voice_repo(db_session):
     assert any(v.name == "Max" for v in slot1)
     # Sarah ist in Slot 2 (laut voices.py)
     assert not any(v.name == "Sarah" for v in slot1)
+
+
+def _add_podcasts(db_session, user_id, titles):
+    for titel in titles:
+        text = Textbeitrag(
+            userId=user_id,
+            erzeugtesSkript="...",
+            titel=titel,
+            erstelldatum=date.today(),
+            sprache="Englisch",
+            userPrompt="",
+        )
+        job = Konvertierungsauftrag(
+            textbeitrag=text,
+            hauptstimmeName="Max",
+            hauptstimmeRolle="Host",
+            gewuenschteDauer=5,
+            status=AuftragsStatus.ABGESCHLOSSEN,
+        )
+        db_session.add(
+            Podcast(
+                konvertierungsauftrag=job,
+                titel=titel,
+                realdauer=5,
+                dateipfadAudio=f"/tmp/{titel}.mp3",
+                erstelldatum=date.today(),
+            )
+        )
+    db_session.commit()
+
+
+def _add_second_user(db_session):
+    # Benutzer.status ist unique, daher zweiter Benutzer mit anderem Status
+    other = Benutzer(
+        smailAdresse="other", status="aktiv", registrierungsdatum=date.today()
+    )
+    db_session.add(other)
+    db_session.commit()
+    return other.userId
+
+
+def _record_statements(db_session):
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_podcast_cards_single_query_with_limit(db_session):
+    """Die Kartenansicht lädt alles mit einer Abfrage, neueste zuerst, mit LIMIT."""
+    owner_id = UserRepo(db_session).create_user("owner@example.com").userId
+    _add_podcasts(db_session, owner_id, ["A", "B", "C"])
+    _add_podcasts(db_session, _add_second_user(db_session), ["Fremd"])
+    db_session.expunge_all()
+
+    statements = _record_statements(db_session)
+    cards = PodcastRepo(db_session).get_cards_by_user_id(owner_id, limit=2)
+    details = [(c.titel, c.hauptstimmeName, c.sprache) for c in cards]
+
+    assert details == [("C", "Max", "Englisch"), ("B", "Max", "Englisch")]
+    assert len(statements) == 1
+    assert "LIMIT" in statements[0]
+
+
+def test_podcast_cards_keyset_pagination(db_session):
+    """Weitere Seiten werden über die letzte angezeigte podcastId geladen."""
+    owner_id = UserRepo(db_session).create_user("owner@example.com").userId
+    _add_podcasts(db_session, owner_id, ["A", "B", "C", "D", "E"])
+    repo = PodcastRepo(db_session)
+
+    first = repo.get_cards_by_user_id(owner_id, limit=2)
+    second = repo.get_cards_by_user_id(owner_id, limit=2, before_id=first[-1].podcastId)
+    last = repo.get_cards_by_user_id(owner_id, limit=2, before_id=second[-1].podcastId)
+
+    assert [c.titel for c in first + second + last] == ["E", "D", "C", "B", "A"]
+
+
+def test_podcast_count_by_user_id(db_session):
+    """Die Anzahl wird per COUNT in einer Abfrage ermittelt."""
+    owner_id = UserRepo(db_session).create_user("owner@example.com").userId
+    _add_podcasts(db_session, owner_id, ["A", "B", "C"])
+    _add_podcasts(db_session, _add_second_user(db_session), ["Fremd"])
+
+    statements = _record_statements(db_session)
+    repo = PodcastRepo(db_session)
+
+    assert repo.count_by_user_id(owner_id) == 3
+    assert repo.count_by_user_id(999) == 0
+    assert len(statements) == 2
+    assert all("count(" in s.lower() for s in statements)
+
+
+def _indexed_columns(engine, table):
+    return {tuple(i["column_names"]) for i in inspect(engine).get_indexes(table)}
+
+
+def test_migrations_create_schema_and_indexes():
+    """Eine leere Datenbank wird bis zur aktuellen Version migriert."""
+    engine = create_engine("sqlite:///:memory:")
+
+    assert ensure_schema(engine) == LATEST_VERSION
+    assert ("userId",) in _indexed_columns(engine, "Textbeitrag")
+    assert ("status",) in _indexed_columns(engine, "Konvertierungsauftrag")
+    assert ("erstelldatum",) in _indexed_columns(engine, "Podcast")
+
+    # Zweiter Start: nur Versionsprüfung, keine erneute Migration
+    assert ensure_schema(engine) == LATEST_VERSION
+    with engine.connect() as conn:
+        assert len(conn.execute(schema_version.select()).all()) == LATEST_VERSION
+
+
+def test_migrations_match_models():
+    """Basisschema plus Migrationen ergeben die Spalten der aktuellen Modelle."""
+    engine = create_engine("sqlite:///:memory:")
+    ensure_schema(engine)
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        assert columns == set(table.columns.keys())
+
+
+def test_migrations_upgrade_existing_database():
+    """Bestehende Datenbanken (ohne schema_version) erhalten die Indizes."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX "ix_Konvertierungsauftrag_textId"'))
+
+    with engine.connect() as conn:
+        assert get_schema_version(conn) == 0
+    assert migrate(engine) == LATEST_VERSION
+    assert ("textId",) in _indexed_columns(engine, "Konvertierungsauftrag")
+
+
+def test_podcast_delete_owned_removes_job_and_text(db_session):
+    """Löschen nur mit Besitz; Auftrag und Textbeitrag werden mitgelöscht."""
+    engine = db_session.get_bind()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+    owner_id = UserRepo(db_session).create_user("owner@example.com").userId
+    _add_podcasts(db_session, owner_id, ["A"])
+    podcast_id = db_session.query(Podcast.podcastId).scalar()
+    repo = PodcastRepo(db_session)
+
+    assert repo.delete_owned(podcast_id, owner_id + 1) is None
+    assert db_session.query(Podcast).count() == 1
+
+    statements = _record_statements(db_session)
+    deleted = repo.delete_owned(podcast_id, owner_id)
+    db_session.commit()
+
+    assert deleted.dateipfadAudio == "/tmp/A.mp3"
+    # Eine Besitz-Abfrage, danach nur noch Löschungen per ID
+    assert statements[0].startswith("SELECT")
+    assert all(s.startswith(("DELETE", "UPDATE")) for s in statements[1:])
+    for model in (Podcast, Konvertierungsauftrag, Textbeitrag):
+        assert db_session.query(model).count() == 0
+
+
+def test_podcast_delete_owned_keeps_other_jobs_of_the_text(db_session):
+    """Ein zweiter Auftrag auf demselben Text behält Text und Podcast."""
+    owner_id = UserRepo(db_session).create_user("owner@example.com").userId
+    _add_podcasts(db_session, owner_id, ["A"])
+    text = db_session.query(Textbeitrag).one()
+    db_session.add(
+        Podcast(
+            konvertierungsauftrag=Konvertierungsauftrag(
+                textbeitrag=text,
+                hauptstimmeName="Mia",
+                gewuenschteDauer=5,
+                status=AuftragsStatus.ABGESCHLOSSEN,
+            ),
+            titel="A2",
+            realdauer=5,
+            dateipfadAudio="/tmp/A2.mp3",
+            erstelldatum=date.today(),
+        )
+    )
+    db_session.commit()
+    first = db_session.query(Podcast).filter_by(titel="A").one().podcastId
+
+    assert PodcastRepo(db_session).delete_owned(first, owner_id) is not None
+    db_session.commit()
+
+    assert [p.titel for p in db_session.query(Podcast)] == ["A2"]
+    assert db_session.query(Konvertierungsauftrag).count() == 1
+    assert db_session.query(Textbeitrag).count() == 1
+
+
+def _count_commits(db_session):
+    commits = []
+    event.listen(db_session.get_bind(), "commit", lambda conn: commits.append(1))
+    return commits
+
+
+def test_unit_of_work_commits_once(db_session):
+    """Drei verknüpfte Objekte: ein Commit, IDs danach ohne erneutes SELECT."""
+    user_id = UserRepo(db_session).create_user("uow@example.com").userId
+    commits = _count_commits(db_session)
+    text = Textbeitrag(
+        userId=user_id,
+        erzeugtesSkript="...",
+        titel="UoW",
+        erstelldatum=date.today(),
+        sprache="de",
+    )
+    job = Konvertierungsauftrag(
+        textbeitrag=text, gewuenschteDauer=5, status=AuftragsStatus.ABGESCHLOSSEN
+    )
+    podcast = Podcast(
+        konvertierungsauftrag=job,
+        titel="UoW",
+        realdauer=5,
+        dateipfadAudio="/tmp/uow.mp3",
+        erstelldatum=date.today(),
+    )
+
+    with UnitOfWork(db_session) as uow:
+        uow.stage(text, job, podcast)
+    statements = _record_statements(db_session)
+
+    assert len(commits) == 1
+    assert podcast.podcastId is not None
+    assert podcast.auftragId == job.auftragId
+    assert job.textId == text.textId
+    assert statements == []
+
+
+def test_unit_of_work_rolls_back_on_error(db_session):
+    """Bei einem Fehler wird nichts geschrieben."""
+    user_id = UserRepo(db_session).create_user("rollback@example.com").userId
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(db_session) as uow:
+            uow.stage(
+                Textbeitrag(
+                    userId=user_id,
+                    erzeugtesSkript="...",
+                    titel="Weg",
+                    erstelldatum=date.today(),
+                    sprache="de",
+                )
+            )
+            uow.flush()
+            raise RuntimeError("Abbruch")
+
+    assert db_session.query(Textbeitrag).count() == 0
+
+
+def test_add_all_single_commit(db_session):
+    """add_all speichert beliebig viele Objekte mit einem Commit."""
+    user_id = UserRepo(db_session).create_user("bulk@example.com").userId
+    commits = _count_commits(db_session)
+
+    TextRepo(db_session).add_all(
+        [
+            Textbeitrag(
+                userId=user_id,
+                erzeugtesSkript="...",
+                titel=f"Import {i}",
+                erstelldatum=date.today(),
+                sprache="de",
+            )
+            for i in range(20)
+        ]
+    )
+
+    assert len(commits) == 1
+    assert db_session.query(Textbeitrag).count() == 20
+
+
+def test_engine_options_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    options = engine_options()
+
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is False
+    assert options["pool_recycle"] == 1800
+
+
+def test_pool_metrics_track_checkouts_and_timeouts(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.1")
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **engine_options())
+    instrument_engine(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert pool_metrics(engine)["checked_out"] == 1
+        # Der einzige Slot ist belegt -> Timeout statt unbegrenztem Warten
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    metrics = pool_metrics(engine)
+    assert metrics["checked_out"] == 0
+    assert metrics["checkouts"] == 1
+    assert metrics["timeouts"] == 1
+    assert metrics["peak_in_use"] == 1
+
+    # Nach dispose() (z.B. Tunnel-Neuaufbau) bleiben die Zähler erhalten
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.invalidate()
+    metrics = pool_metrics(engine)
+    assert metrics["checkouts"] == 2
+    assert metrics["invalidations"] == 1
+    engine.dispose()
+
+
+def test_sqlite_backend_wal_and_migrations(tmp_path):
+    """Das SQLite-Backend läuft im WAL-Modus mit denselben Migrationen."""
+    engine = create_sqlite_engine(str(tmp_path / "podcast.db"))
+    assert ensure_schema(engine) == LATEST_VERSION
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        user = UserRepo(session).create_user("sqlite@example.com")
+        session.commit()
+        user_id = user.userId
+        _add_podcasts(session, user_id, ["A", "B"])
+
+    # Mit aktiven Fremdschlüsseln löscht delete_owned Auftrag und Text selbst
+    with Session() as session:
+        assert PodcastRepo(session).count_by_user_id(user_id) == 2
+        podcast_id = PodcastRepo(session).get_cards_by_user_id(user_id)[0].podcastId
+        assert PodcastRepo(session).delete_owned(podcast_id, user_id) is not None
+        session.commit()
+        assert session.query(Konvertierungsauftrag).count() == 1
+    engine.dispose()
+
+
+def test_get_db_waits_for_running_initialization(monkeypatch, tmp_path):
+    """Während der Migration sieht get_db() keine halb initialisierte Engine."""
+    import threading
+    import time
+
+    from database import database
+
+    monkeypatch.setattr(database, "engine", None)
+    monkeypatch.setattr(database, "SessionLocal", None)
+    monkeypatch.setattr(database, "SQLITE_PATH", str(tmp_path / "podcast.db"))
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+
+    def slow_ensure_schema(engine):
+        time.sleep(0.2)
+        return ensure_schema(engine)
+
+    monkeypatch.setattr(database, "ensure_schema", slow_ensure_schema)
+    warm_up = threading.Thread(target=database.init_db_connection)
+    warm_up.start()
+    time.sleep(0.05)
+
+    session = database.get_db()
+    warm_up.join()
+    assert session.execute(text("SELECT 1")).scalar() == 1
+    session.close()
+    database.engine.dispose()
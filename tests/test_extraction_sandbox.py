@@ -0,0 +1,82 @@
+import itertools
+import os
+import time
+
+import pytest
+
+from services.exceptions import ExtractionError, ExtractionTimeoutError
+from services.extraction_sandbox import SandboxPool
+
+
+# Auftragsfunktionen müssen auf Modulebene liegen (spawn importiert sie neu)
+def _zaehlen():
+    yield from itertools.count()
+
+
+def _schlafen(sekunden):
+    time.sleep(sekunden)
+
+
+def _speicher_fressen(mb):
+    return len(bytearray(mb * 1024 * 1024))
+
+
+def _endlosschleife():
+    while True:
+        pass
+
+
+@pytest.fixture
+def sandbox():
+    pool = SandboxPool(workers=1, memory_mb=256, cpu_seconds=2, timeout=10)
+    yield pool
+    pool.close()
+
+
+def test_stream_stops_worker_when_closed(sandbox):
+    """Ein vorzeitig geschlossener Stream beendet den Auftrag im Worker."""
+    pid = sandbox.run(os.getpid)
+    stream = sandbox.stream(_zaehlen)
+    assert list(itertools.islice(stream, 3)) == [0, 1, 2]
+    stream.close()
+
+    # Der Worker hat sauber aufgehört und wird weiterverwendet
+    assert sandbox.run(os.getpid) == pid != os.getpid()
+
+
+def test_timeout_kills_hanging_worker(sandbox):
+    """Hängende Worker werden nach dem Zeitlimit beendet und ersetzt."""
+    pid = sandbox.run(os.getpid)
+    t0 = time.monotonic()
+    with pytest.raises(ExtractionTimeoutError):
+        sandbox.run(_schlafen, 30, timeout=0.5)
+
+    assert time.monotonic() - t0 < 5
+    assert sandbox.run(os.getpid) != pid
+
+
+def test_memory_limit_stops_allocation(sandbox):
+    """Ein Auftrag über dem Speicherlimit schlägt fehl, der Pool bleibt nutzbar."""
+    with pytest.raises(ExtractionError):
+        sandbox.run(_speicher_fressen, 1024)
+
+    assert sandbox.run(_speicher_fressen, 16) == 16 * 1024 * 1024
+
+
+def test_cpu_limit_kills_worker(sandbox):
+    """Endlosschleifen werden über das CPU-Limit beendet, nicht erst per Timeout."""
+    with pytest.raises(ExtractionError) as exc_info:
+        sandbox.run(_endlosschleife)
+
+    assert not isinstance(exc_info.value, ExtractionTimeoutError)
+
+
+def test_workers_are_recycled():
+    """Nach max_jobs_per_worker Aufträgen wird ein frischer Prozess gestartet."""
+    pool = SandboxPool(workers=1, max_jobs_per_worker=2)
+    try:
+        pids = [pool.run(os.getpid) for _ in range(3)]
+    finally:
+        pool.close()
+
+    assert pids[0] == pids[1] != pids[2]
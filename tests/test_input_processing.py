@@ -0,0 +1,418 @@
+import asyncio
+import time
+import zipfile
+
+import httpx
+import pytest
+
+from services import extractors, html_extraction, input_processing, url_fetcher
+from services.exceptions import SourceFetchError
+from services.source_cache import CachedSource, SourceCache
+from services.url_fetcher import UrlFetcher
+from services.extractors import HTML_MIME, PDF_MIME, sniff_mime
+from services.input_processing import (
+    condense_text,
+    extract_pdf_text,
+    extract_text_from_file,
+    split_sentences,
+)
+
+
+def _make_pdf(path, page_texts):
+    """Schreibt ein minimales PDF mit einer Textzeile pro Seite."""
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>"
+        )
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    path.write_bytes(bytes(out))
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def _leerer_cache():
+    """Jeder Test startet mit leerem Quellen-Cache."""
+    input_processing.source_cache.clear()
+    yield
+    input_processing.source_cache.clear()
+
+
+def _artikel(anzahl: int) -> str:
+    saetze = [
+        f"Die Energiewende verändert den Strommarkt in Region {chr(65 + i % 26)} "
+        f"durch neue Speicher und flexible Netze Nummer {i}."
+        for i in range(anzahl)
+    ]
+    return "\n\n".join(saetze)
+
+
+def test_condense_text_short_text_unchanged():
+    """Texte innerhalb des Budgets dürfen nicht verändert werden."""
+    text = "Ein kurzer Satz. Noch ein Satz."
+    assert condense_text(text, max_chars=100) == text
+
+
+def test_condense_text_respects_budget_and_order():
+    """Die Auswahl muss ins Budget passen und die Originalreihenfolge behalten."""
+    text = _artikel(400)
+    out = condense_text(text, max_chars=2000)
+
+    assert 0 < len(out) <= 2000
+    positions = [text.index(s) for s in out.split("\n")]
+    assert positions == sorted(positions)
+
+
+def test_condense_text_removes_navigation_and_duplicates():
+    """Menüpunkte und wiederholte Sätze sollen nicht im Ergebnis landen."""
+    duplikat = "Speicher und Netze machen die Energiewende im Strommarkt erst möglich."
+    text = "Home\nKontakt\nImpressum\n\n" + "\n\n".join([duplikat] * 20) + "\n\n"
+    text += _artikel(200)
+
+    out = condense_text(text, max_chars=3000)
+
+    assert "Impressum" not in out
+    assert out.count(duplikat) <= 1
+
+
+def test_split_sentences_joins_wrapped_pdf_lines():
+    """Harte Zeilenumbrüche innerhalb eines Satzes werden wieder zusammengefügt."""
+    text = (
+        "Dieser Satz wurde im PDF mitten im Text umbrochen und\n"
+        "geht hier weiter. Danach kommt ein zweiter Satz."
+    )
+    sentences = [s for _, s in split_sentences(text)]
+    assert sentences == [
+        "Dieser Satz wurde im PDF mitten im Text umbrochen und geht hier weiter.",
+        "Danach kommt ein zweiter Satz.",
+    ]
+
+
+def test_build_source_text_condenses_long_sources(monkeypatch):
+    """Lange Quellen werden verdichtet statt hart abgeschnitten."""
+    monkeypatch.setattr(
+        input_processing,
+        "extract_text_from_file_cached",
+        lambda path, *args: (_artikel(1000), "Titel"),
+    )
+
+    text, title = input_processing.build_source_text("quelle.pdf", None)
+
+    assert title == "Titel"
+    assert len(text) <= input_processing.MAX_SOURCE_CHARS
+    assert text.endswith(".")
+
+
+def test_extract_pdf_text_stops_at_budget(tmp_path):
+    """Die PDF-Extraktion bricht ab, sobald das Zeichenbudget gefüllt ist."""
+    pdf = _make_pdf(tmp_path / "lang.pdf", [f"Seite {i} Text" for i in range(100)])
+
+    text, timings = extract_pdf_text(pdf, max_chars=60)
+
+    assert len(text) <= 60
+    assert text.startswith("Seite 0 Text")
+    assert len(timings) < 10
+    assert all(seconds >= 0 for _, _, seconds in timings)
+
+
+def test_extract_pdf_text_parallel_matches_sequential(tmp_path, monkeypatch):
+    """Die seitenparallele Extraktion liefert denselben Text in Seitenreihenfolge."""
+    pdf = _make_pdf(tmp_path / "gross.pdf", [f"Seite {i} Text" for i in range(30)])
+    sequential, _ = extract_pdf_text(pdf, max_chars=10_000)
+
+    monkeypatch.setattr(input_processing, "PDF_PROBE_PAGES", 2)
+    monkeypatch.setattr(input_processing, "PARALLEL_PDF_MIN_PAGES", 5)
+    monkeypatch.setattr(input_processing, "PDF_PAGES_PER_TASK", 4)
+    parallel, timings = extract_pdf_text(pdf, max_chars=10_000)
+
+    assert parallel == sequential
+    assert [page for page, _, _ in timings] == list(range(1, 31))
+
+
+def test_source_cache_evicts_least_recently_used():
+    """Der Cache verdrängt bei vollem Zeichenbudget den ältesten Eintrag."""
+    cache = SourceCache(max_entries=10, max_chars=10)
+    cache.put("a", CachedSource("aaaa", "A"))
+    cache.put("b", CachedSource("bbbb", "B"))
+    cache.get("a")
+    cache.put("c", CachedSource("cccc", "C"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").text == "aaaa"
+    assert cache.get("c").text == "cccc"
+
+
+def test_file_cache_is_keyed_by_content(tmp_path, monkeypatch):
+    """Gleicher Inhalt unter anderem Dateinamen wird nur einmal extrahiert."""
+    first = tmp_path / "folien_v1.txt"
+    second = tmp_path / "folien_kopie.txt"
+    first.write_text("Gleicher Inhalt", encoding="utf-8")
+    second.write_text("Gleicher Inhalt", encoding="utf-8")
+
+    calls = []
+    original = input_processing.extract_text_from_file
+    monkeypatch.setattr(
+        input_processing,
+        "extract_text_from_file",
+        lambda path, **kwargs: calls.append(path) or original(path, **kwargs),
+    )
+
+    assert input_processing.extract_text_from_file_cached(str(first))[0] == (
+        "Gleicher Inhalt"
+    )
+    text, title = input_processing.extract_text_from_file_cached(str(second))
+
+    assert len(calls) == 1
+    assert text == "Gleicher Inhalt"
+    assert title == "Folien Kopie"
+
+
+def _mock_fetcher(monkeypatch, handler):
+    """Ersetzt den gemeinsamen URL-Fetcher durch einen mit Mock-Transport."""
+    fetcher = UrlFetcher(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(input_processing, "url_fetcher", fetcher)
+    return fetcher
+
+
+def test_url_cache_uses_conditional_get(monkeypatch):
+    """Gecachte URLs werden per If-None-Match revalidiert; 304 nutzt den Cache."""
+    monkeypatch.setattr(input_processing, "URL_FRESHNESS_SECONDS", 0)
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            html="<title>T</title><p>Inhalt</p>",
+            headers={"ETag": '"v1"'},
+        )
+
+    _mock_fetcher(monkeypatch, handler)
+
+    first = input_processing.fetch_text_from_url("https://example.org")
+    second = input_processing.fetch_text_from_url("https://example.org")
+
+    assert "Inhalt" in first[0]
+    assert second == first
+    assert seen_headers[1]["If-None-Match"] == '"v1"'
+
+
+def test_build_source_text_merges_files_and_urls(tmp_path, monkeypatch):
+    """Mehrere Dateien und URLs werden mit Quellenangabe zusammengeführt."""
+
+    def handler(request):
+        return httpx.Response(
+            200, html=f"<title>Seite {request.url.path}</title><p>Web-Inhalt.</p>"
+        )
+
+    _mock_fetcher(monkeypatch, handler)
+    a = tmp_path / "notizen_a.txt"
+    b = tmp_path / "notizen_b.txt"
+    a.write_text("Inhalt der ersten Datei.", encoding="utf-8")
+    b.write_text("Inhalt der zweiten Datei.", encoding="utf-8")
+
+    text, title = input_processing.build_source_text(
+        [str(a), str(b)], "https://example.org/eins\nhttps://example.org/zwei"
+    )
+
+    assert title == "Notizen A"
+    assert "[Quelle 1: Notizen A (notizen_a.txt)]" in text
+    assert "Inhalt der zweiten Datei." in text
+    assert "(https://example.org/zwei)]" in text
+    assert text.index("Quelle 1") < text.index("Quelle 4")
+
+
+def test_fetch_texts_from_urls_runs_concurrently(monkeypatch):
+    """Alle URLs werden gleichzeitig geladen: Gesamtzeit ≈ langsamste Quelle."""
+
+    async def handler(request):
+        await asyncio.sleep(0.3)
+        return httpx.Response(200, html="<p>ok</p>")
+
+    _mock_fetcher(monkeypatch, handler)
+    urls = [f"https://host{i}.example.org/" for i in range(5)]
+
+    start = time.perf_counter()
+    results = input_processing.fetch_texts_from_urls(urls)
+
+    assert [text for text, _ in results] == ["ok"] * 5
+    assert time.perf_counter() - start < 1.0
+
+
+def test_merge_sources_respects_budget():
+    """Das Gesamtbudget gilt auch über mehrere lange Quellen hinweg."""
+    sources = [(f"q{i}.txt", f"Q{i}", _artikel(100)) for i in range(3)]
+
+    merged = input_processing.merge_sources(sources, max_chars=3000)
+
+    assert len(merged) <= 3000
+    assert merged.count("[Quelle ") == 3
+
+
+def test_main_content_extraction_drops_navigation():
+    """Navigation, Footer und Cookie-Banner landen nicht im extrahierten Text."""
+    absatz = "Die Energiewende verändert den Strommarkt, die Netze und die Speicher. "
+    markup = (
+        "<html><head><title>Artikel</title></head><body>"
+        "<nav><a href='/'>Home</a><a href='/k'>Kontakt</a></nav>"
+        "<div class='cookie-banner'>Wir nutzen Cookies</div>"
+        f"<div class='content'><p>{absatz * 3}</p><p>{absatz * 2}</p></div>"
+        "<footer>Impressum</footer></body></html>"
+    )
+
+    text, title = html_extraction.html_to_text(markup)
+
+    assert title == "Artikel"
+    assert "Energiewende" in text
+    for boilerplate in ("Home", "Cookies", "Impressum"):
+        assert boilerplate not in text
+
+
+def test_fetch_stops_reading_at_max_bytes(monkeypatch):
+    """Riesige Seiten werden nur bis MAX_RESPONSE_BYTES gelesen."""
+    monkeypatch.setattr(url_fetcher, "MAX_RESPONSE_BYTES", 1000)
+
+    def handler(request):
+        body = b"<html><body>" + b"<p>Viel Text hier.</p>" * 100_000
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/html"})
+
+    fetcher = UrlFetcher(transport=httpx.MockTransport(handler))
+    (result,) = fetcher.fetch_many([("https://example.org/gross", {})])
+
+    assert result.truncated
+    assert 0 < len(result.text) < 1000
+
+
+def test_fetch_rejects_unsupported_content_type():
+    """Binärdaten (z.B. Videos) werden anhand des Content-Type abgelehnt."""
+
+    def handler(request):
+        return httpx.Response(
+            200, content=b"\x00" * 10, headers={"Content-Type": "video/mp4"}
+        )
+
+    fetcher = UrlFetcher(transport=httpx.MockTransport(handler))
+    (result,) = fetcher.fetch_many([("https://example.org/video", {})])
+
+    assert isinstance(result, SourceFetchError)
+
+
+def _make_docx(path, absaetze):
+    body = "".join(f"<w:p><w:r><w:t>{a}</w:t></w:r></w:p>" for a in absaetze)
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+        f'wordprocessingml/2006/main"><w:body>{body}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")
+        zf.writestr("word/document.xml", document)
+    return str(path)
+
+
+def _make_epub(path, kapitel):
+    manifest = "".join(
+        f'<item id="k{i}" href="text/k{i}.xhtml" media-type="application/xhtml+xml"/>'
+        for i in range(len(kapitel))
+    )
+    # Spine in umgekehrter Reihenfolge, um die Lesereihenfolge zu prüfen
+    spine = "".join(f'<itemref idref="k{i}"/>' for i in reversed(range(len(kapitel))))
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("mimetype", "application/epub+zip")
+        zf.writestr(
+            "META-INF/container.xml",
+            '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf"/></rootfiles>'
+            "</container>",
+        )
+        zf.writestr(
+            "OEBPS/content.opf",
+            '<package xmlns="http://www.idpf.org/2007/opf">'
+            f"<manifest>{manifest}</manifest><spine>{spine}</spine></package>",
+        )
+        for i, text in enumerate(kapitel):
+            zf.writestr(
+                f"OEBPS/text/k{i}.xhtml",
+                f"<html><body><h1>Kapitel {i}</h1><p>{text}</p></body></html>",
+            )
+    return str(path)
+
+
+def test_extractors_support_office_and_markup_formats(tmp_path):
+    """DOCX, EPUB, HTML und Markdown werden als Klartext gelesen."""
+    docx = _make_docx(tmp_path / "bericht.docx", ["Erster Absatz.", "Zweiter Absatz."])
+    epub = _make_epub(tmp_path / "buch.epub", ["Anfang der Reise.", "Ende der Reise."])
+    html = tmp_path / "seite.html"
+    html.write_text(
+        "<html><head><script>var x = 1;</script></head>"
+        "<body><nav>Menü</nav><p>Inhalt der Seite.</p></body></html>"
+    )
+    md = tmp_path / "notizen.md"
+    md.write_text(
+        "---\ntitle: Notizen\n---\n# Überschrift\n\n"
+        "Ein **fetter** [Link](https://example.org).\n\n```\ncode()\n```\n"
+    )
+
+    docx_text, title = extract_text_from_file(docx)
+    assert docx_text == "Erster Absatz.\nZweiter Absatz."
+    assert title == "Bericht"
+
+    epub_text, _ = extract_text_from_file(epub)
+    assert epub_text.index("Ende der Reise") < epub_text.index("Anfang der Reise")
+
+    html_text, _ = extract_text_from_file(str(html))
+    assert html_text == "Inhalt der Seite."
+
+    md_text, _ = extract_text_from_file(str(md))
+    assert md_text == "Überschrift\n\nEin fetter Link."
+
+
+def test_sniff_mime_prefers_magic_bytes(tmp_path):
+    """Der Inhalt entscheidet über das Format, nicht die Dateiendung."""
+    pdf = _make_pdf(tmp_path / "falsch.txt", ["Seite eins"])
+    html = tmp_path / "export.txt"
+    html.write_text("<!DOCTYPE html><html><body><p>Hallo</p></body></html>")
+    binary = tmp_path / "bild.txt"
+    binary.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+
+    assert sniff_mime(pdf) == PDF_MIME
+    assert sniff_mime(str(html)) == HTML_MIME
+    assert sniff_mime(str(binary)) is None
+    assert extract_text_from_file(str(binary))[0] == ""
+
+
+def test_text_extraction_stops_at_budget(tmp_path, monkeypatch):
+    """Große Textdateien werden nur blockweise bis zum Budget gelesen."""
+    monkeypatch.setattr(extractors, "TEXT_BLOCK_CHARS", 100)
+    datei = tmp_path / "gross.txt"
+    datei.write_text("x" * 1_000_000)
+
+    chunks = extractors.iter_text(str(datei))
+    assert len(next(chunks)) == 100
+
+    text, _ = extract_text_from_file(str(datei), max_chars=500)
+    assert text == "x" * 500
@@ -231,3 +231,27 @@ def test_timeout_is_handled(monkeypatch):
 
     with pytest.raises(LLMServiceError):
         service._ask_gemini("test")
+
+
+def test_cancel_skips_retry(monkeypatch):
+    """Ein Abbruch während der Retry-Pause verhindert den zweiten Versuch."""
+    from services.cancellation import CancellationToken
+    from services.exceptions import OperationCancelledError
+
+    service = LLMService(use_dummy=False)
+    token = CancellationToken()
+    calls = []
+
+    def fake_post(*args, **kwargs):
+        calls.append(1)
+        token.cancel()
+        r = type("R", (), {})()
+        r.status_code = 503
+        r.text = "unavailable"
+        return r
+
+    monkeypatch.setattr("services.llm_service.requests.post", fake_post)
+
+    with pytest.raises(OperationCancelledError):
+        service.generate_script("Thema", BASE_CONFIG, cancel_token=token)
+    assert len(calls) == 1
@@ -0,0 +1,59 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from frontend import media
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(media, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        media, "is_inside_output", lambda p: str(p).startswith(str(tmp_path))
+    )
+    (tmp_path / "podcast.mp3").write_bytes(bytes(range(256)) * 4)
+    app = FastAPI()
+    app.include_router(media.router)
+    return TestClient(app)
+
+
+def test_media_url_uses_file_name():
+    assert media.media_url("Output/ab cd.mp3") == "/media/ab%20cd.mp3"
+    assert media.media_url(None) is None
+
+
+def test_audio_player_streams_from_media_route():
+    player = media.audio_player_html("Output/ab cd.mp3")
+    assert 'src="/media/ab%20cd.mp3"' in player
+    assert "autoplay" in player
+    assert media.audio_player_html(None) == ""
+
+
+def test_media_supports_range_requests(client):
+    """Der Player kann springen, ohne die ganze Datei zu laden."""
+    full = client.get("/media/podcast.mp3")
+    assert full.status_code == 200
+    assert full.headers["content-type"] == "audio/mpeg"
+    assert len(full.content) == 1024
+
+    partial = client.get("/media/podcast.mp3", headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == bytes(range(10, 20))
+
+
+def test_media_only_serves_output_files(client):
+    assert client.get("/media/fehlt.mp3").status_code == 404
+    assert client.get("/media/..%2Fpasswd").status_code == 404
+
+
+def test_download_uses_friendly_name_without_copy(client, tmp_path):
+    """Der Download-Name kommt per Header, auf der Platte liegt nur die MP3."""
+    url = media.download_url("Output/podcast.mp3", "Mein Thema", "2026-10-19")
+    assert url == "/media/podcast.mp3?download=Podcast-Mein_Thema-2026-10-19.mp3"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="Podcast-Mein_Thema-2026-10-19.mp3"'
+    )
+    assert [p.name for p in tmp_path.iterdir()] == ["podcast.mp3"]
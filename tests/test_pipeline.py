@@ -20,15 +20,9 @@ from services.llm_service import LLMService
 @patch("services.workflow.LLMService")
 @patch("services.workflow.GoogleTTSService")
 @patch("services.workflow.VoiceRepo")
-@patch("services.workflow.TextRepo")
-@patch("services.workflow.JobRepo")
-@patch("services.workflow.PodcastRepo")
 @patch("uuid.uuid4")
 def test_workflow_run_pipeline_success(
     MockUUID,
-    MockPodcastRepo,
-    MockJobRepo,
-    MockTextRepo,
     MockVoiceRepo,
     MockTTSService,
     MockLLMService,
@@ -37,9 +31,6 @@ def test_workflow_run_pipeline_success(
     mock_session = MagicMock()
     MockGetDB.return_value = mock_session
     MockUUID.return_value = "1234"
-    MockTextRepo.return_value.add.side_effect = lambda x: x
-    MockJobRepo.return_value.add.side_effect = lambda x: x
-    MockPodcastRepo.return_value.add.side_effect = lambda x: x
 
     mock_voice_obj = MagicMock()
     mock_voice_obj.stimmeId = 1
@@ -72,6 +63,9 @@ def test_workflow_run_pipeline_success(
 
     mock_llm.generate_script.assert_called_once()
     mock_tts.generate_audio.assert_called_once()
-    MockTextRepo.return_value.add.assert_called_once()
+    # Text, Auftrag und Podcast werden gemeinsam mit einem Commit gespeichert
+    mock_session.add_all.assert_called_once()
+    assert len(mock_session.add_all.call_args.args[0]) == 3
+    mock_session.commit.assert_called_once()
 
     assert result_path == os.path.join("Output", "podcast_google_1234.mp3")
@@ -0,0 +1,73 @@
+import threading
+from types import SimpleNamespace
+
+from services.speculative_tts import SpeculativeSynthesizer
+
+
+class FakeTTS:
+    """Ein Block je Skriptzeile; die Synthese gibt den Blocktext zurück."""
+
+    def __init__(self):
+        self.synthesized = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def dialog_blocks(self, script_text, sprache, primary, secondary):
+        return [
+            SimpleNamespace(key=f"{sprache}:{line}", text=line)
+            for line in script_text.splitlines()
+        ]
+
+    def synthesize_block(self, block, cancel_token=None):
+        self.started.set()
+        self.release.wait(5)
+        self.synthesized.append(block.text)
+        return f"audio:{block.text}"
+
+
+def _presynthesize(spec, script, user="u1"):
+    return spec.presynthesize(user, script, "Deutsch", None, None)
+
+
+def test_edit_only_resynthesizes_changed_blocks():
+    """Nach einer Änderung wird nur die geänderte Zeile neu synthetisiert."""
+    tts = FakeTTS()
+    spec = SpeculativeSynthesizer(tts, char_budget=1000, workers=1)
+
+    assert _presynthesize(spec, "Max: Hallo\nSarah: Hi") == 2
+    assert _presynthesize(spec, "Max: Hallo\nSarah: Servus") == 1
+    spec._executor.shutdown(wait=True)
+
+    lookup = spec.lookup("u1")
+    assert lookup("Deutsch:Max: Hallo") == "audio:Max: Hallo"
+    assert lookup("Deutsch:Sarah: Servus") == "audio:Sarah: Servus"
+    assert lookup("Deutsch:Sarah: Hi") is None
+
+
+def test_budget_caps_speculative_characters_per_user():
+    tts = FakeTTS()
+    spec = SpeculativeSynthesizer(tts, char_budget=10, workers=1)
+
+    assert _presynthesize(spec, "aaaaa\nbbbbb\nccccc") == 2
+    assert spec.chars_used("u1") == 10
+    # Anderer Nutzer hat sein eigenes Budget
+    assert _presynthesize(spec, "ddddd", user="u2") == 1
+
+    spec.finish("u1")
+    assert spec.chars_used("u1") == 0
+
+
+def test_lookup_skips_blocks_that_have_not_started():
+    """Noch nicht begonnene Blöcke synthetisiert der Job selbst (kein Warten)."""
+    tts = FakeTTS()
+    tts.release.clear()
+    spec = SpeculativeSynthesizer(tts, char_budget=1000, workers=1)
+    _presynthesize(spec, "eins\nzwei")
+    assert tts.started.wait(5)
+
+    # "eins" blockiert den einzigen Worker, "zwei" wartet noch
+    assert spec.lookup("u1")("Deutsch:zwei") is None
+    tts.release.set()
+    assert spec.lookup("u1")("Deutsch:eins") == "audio:eins"
+    assert tts.synthesized == ["eins"]
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
 from services.tts_service import GoogleTTSService
 from database.models import PodcastStimme
+from pydub import AudioSegment
 
 
 @pytest.fixture
@@ -34,7 +35,7 @@ def voice_max():
         geschlecht="m",
         tts_voice_de="de-DE-Chirp3-HD-Achird",
         tts_voice_en="en-US-Chirp3-HD-Achird",
-        ui_slot=1
+        ui_slot=1,
     )
 
 
@@ -49,7 +50,7 @@ def voice_sara():
         geschlecht="w",
         tts_voice_de="de-DE-Chirp3-HD-Erinome",
         tts_voice_en="en-US-Chirp3-HD-Erinome",
-        ui_slot=2
+        ui_slot=2,
     )
 
 
@@ -163,3 +164,103 @@ def test_audio_generation_success(tts_service, voice_max):
 
     assert audio is not None
     assert len(audio) > 0
+
+
+def test_progress_callback(tts_service, voice_max, voice_sara):
+    """
+    Prüft die Fortschrittsmeldungen während der Synthese.
+
+    Vor dem ersten Chunk wird 0 % gemeldet, danach nach jedem Chunk die
+    Anzahl fertiger Chunks und Zeichen, bis alle Zeichen erreicht sind.
+    """
+    script = """
+    Max: Hallo Sarah.
+    Sarah: Hallo Max, wie geht es?
+    """
+    tts_service.client.synthesize_speech.return_value.audio_content = (
+        b"RIFF_DUMMY_AUDIO"
+    )
+    events = []
+
+    with patch("services.tts_service.time.sleep"):
+        tts_service.generate_audio(
+            script, "Deutsch", voice_max, voice_sara, on_progress=events.append
+        )
+
+    assert [(e.done_chunks, e.total_chunks) for e in events] == [(0, 2), (1, 2), (2, 2)]
+    assert events[0].eta is None
+    assert events[-1].done_chars == events[-1].total_chars
+    assert events[-1].fraction == 1.0
+
+
+def test_progress_eta_from_rolling_throughput():
+    """
+    Die Restzeit ergibt sich aus dem Durchsatz der letzten Chunks.
+    """
+    from services.tts_progress import ProgressTracker
+
+    now = [0.0]
+    tracker = ProgressTracker([100, 100, 200], clock=lambda: now[0])
+
+    now[0] = 2.0
+    tracker.chunk_done(100)  # 50 Zeichen/s
+
+    assert tracker.snapshot().eta == pytest.approx(300 / 50)
+
+
+def test_cancel_stops_before_next_chunk(tts_service, voice_max, voice_sara):
+    """
+    Ein Abbruch während der Synthese verhindert weitere API-Calls.
+
+    Das Token wird nach dem ersten Chunk gesetzt; der zweite Chunk wird
+    nicht mehr synthetisiert und die Methode endet mit OperationCancelledError.
+    """
+    from services.cancellation import CancellationToken
+    from services.exceptions import OperationCancelledError
+
+    script = """
+    Max: Hallo Sarah.
+    Sarah: Hallo Max, wie geht es?
+    """
+    token = CancellationToken()
+
+    def cancel_after_first(progress):
+        if progress.done_chunks == 1:
+            token.cancel()
+
+    with pytest.raises(OperationCancelledError):
+        tts_service.generate_audio(
+            script,
+            "Deutsch",
+            voice_max,
+            voice_sara,
+            on_progress=cancel_after_first,
+            cancel_token=token,
+        )
+
+    assert tts_service.client.synthesize_speech.call_count == 1
+
+
+def test_presynthesized_blocks_skip_api_calls(tts_service, voice_max, voice_sara):
+    """
+    Vorab erzeugte Sprecherblöcke werden übernommen, nur der Rest geht an die API.
+    """
+    script = """
+    Max: Hallo Sarah.
+    Sarah: Hallo Max, wie geht es?
+    """
+    tts_service.client.synthesize_speech.return_value.audio_content = (
+        b"RIFF_DUMMY_AUDIO"
+    )
+    blocks = tts_service.dialog_blocks(script, "Deutsch", voice_max, voice_sara)
+    ready = {blocks[0].key: AudioSegment.silent(duration=500)}
+
+    with patch("services.tts_service.time.sleep"):
+        audio = tts_service.generate_audio(
+            script, "Deutsch", voice_max, voice_sara, presynthesized=ready.get
+        )
+
+    calls = tts_service.client.synthesize_speech.call_args_list
+    assert len(calls) == 1
+    assert calls[0].kwargs["voice"].name == "de-DE-Chirp3-HD-Erinome"
+    assert len(audio) >= 500
@@ -0,0 +1,91 @@
+import sqlite3
+
+from sqlalchemy import create_engine, event, text
+
+from database.tunnel import TunnelManager, bind_engine
+
+
+class FakeForwarder:
+    """Nachbau der benötigten SSHTunnelForwarder-Schnittstelle."""
+
+    ports = iter(range(40000, 41000))
+
+    def __init__(self):
+        self.is_active = False
+        self.tunnel_is_up = {}
+        self.local_bind_port = None
+        self.restarts = 0
+
+    def start(self):
+        self.is_active = True
+        self.local_bind_port = next(self.ports)
+        self.tunnel_is_up = {("127.0.0.1", self.local_bind_port): True}
+
+    def check_tunnels(self):
+        pass
+
+    def restart(self):
+        self.restarts += 1
+        self.start()
+
+    def stop(self):
+        self.is_active = False
+
+    def drop(self):
+        self.is_active = False
+
+
+def test_tunnel_manager_round_robin():
+    """Mehrere Tunnel werden reihum als Endpunkt vergeben."""
+    manager = TunnelManager(FakeForwarder, count=2, check_interval=0)
+    manager.start()
+    ports = {manager.endpoint()[1] for _ in range(4)}
+    manager.stop()
+
+    assert len(ports) == 2
+
+
+def test_tunnel_manager_reconnects_dropped_tunnel():
+    """Ein ausgefallener Tunnel wird neu aufgebaut und der Pool geleert."""
+    forwarders = []
+
+    def factory():
+        forwarders.append(FakeForwarder())
+        return forwarders[-1]
+
+    reconnects = []
+    manager = TunnelManager(
+        factory, count=1, check_interval=0, on_reconnect=lambda: reconnects.append(1)
+    )
+    manager.start()
+    old_port = manager.endpoint()[1]
+
+    assert manager.check() == 0
+    forwarders[0].drop()
+    assert manager.check() == 1
+
+    assert forwarders[0].restarts == 1
+    assert manager.endpoint()[1] != old_port
+    assert reconnects == [1]
+    manager.stop()
+
+
+def test_bind_engine_connects_through_current_endpoint():
+    """Neue DB-Verbindungen verwenden den aktuellen Tunnel-Port."""
+    manager = TunnelManager(FakeForwarder, count=1, check_interval=0)
+    manager.start()
+    engine = create_engine("sqlite://")
+    bind_engine(engine, manager)
+
+    seen = []
+
+    @event.listens_for(engine, "do_connect")
+    def _capture(dialect, conn_rec, cargs, cparams):
+        seen.append((cparams.pop("host"), cparams.pop("port")))
+        return sqlite3.connect(":memory:")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert seen == [manager.endpoint()]
+    manager.stop()
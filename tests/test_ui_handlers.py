@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from frontend import ui_handlers
+from services import cancellation
+
+USER = {"id": 1}
+
+
+def _podcasts(ids):
+    return [{"id": i, "titel": f"P{i}"} for i in ids]
+
+
+def test_delete_removes_only_the_deleted_card():
+    """Beim Löschen bleibt die geladene Liste erhalten, ohne neue Abfrage."""
+    shown = _podcasts([30, 20, 10])
+    with (
+        patch.object(ui_handlers, "delete_podcast", return_value=True),
+        patch.object(ui_handlers, "get_podcasts_for_user") as get_podcasts,
+    ):
+        result = ui_handlers.delete_podcast_handler(20, USER, shown)
+
+    assert [p["id"] for p in result] == [30, 10]
+    get_podcasts.assert_not_called()
+
+
+def test_load_more_appends_older_page():
+    shown = ui_handlers.PodcastPage(_podcasts([40, 30]), has_more=True)
+    assert ui_handlers.has_more_podcasts(shown)
+
+    with patch.object(
+        ui_handlers,
+        "get_podcasts_for_user",
+        return_value=ui_handlers.PodcastPage(_podcasts([20])),
+    ) as get_podcasts:
+        podcasts, _ = ui_handlers.load_more_podcasts(shown, USER)
+
+    get_podcasts.assert_called_once_with(1, before_id=30)
+    assert [p["id"] for p in podcasts] == [40, 30, 20]
+    assert not ui_handlers.has_more_podcasts(podcasts)
+
+
+def test_cancel_button_cancels_the_sessions_job():
+    request = SimpleNamespace(session_hash="session-1")
+    session, token = ui_handlers._start_job(request)
+
+    ui_handlers.cancel_podcast_job(request)
+
+    assert token.cancelled
+    ui_handlers._end_job(session, token)
+    # Ohne laufenden Job passiert nichts
+    assert not cancellation.cancel("session-1")
+
+
+def test_library_handlers_wait_for_backend():
+    """Solange der Start läuft, fragen auch Liste und Löschen die DB nicht ab."""
+    with (
+        patch.object(ui_handlers, "wait_for_backend", return_value=False),
+        patch.object(ui_handlers, "get_podcasts_for_user") as get_podcasts,
+        patch.object(ui_handlers, "delete_podcast") as delete,
+    ):
+        ui_handlers.refresh_podcasts_for_user(USER)
+        ui_handlers.navigate_home_and_refresh_podcasts(USER)
+        ui_handlers.delete_podcast_handler(20, USER, _podcasts([20]))
+        ui_handlers.load_more_podcasts(_podcasts([20]), USER)
+
+    get_podcasts.assert_not_called()
+    delete.assert_not_called()
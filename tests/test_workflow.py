@@ -1,9 +1,13 @@
+from datetime import date
+
 import pytest
 from unittest.mock import MagicMock, patch
 
 import services.workflow as workflow_module
+from services import audio_cleanup
 from services.exceptions import TTSServiceError
 from database.models import PodcastStimme
+from tests.dummies import DummySession
 
 
 # ------------------------------------------------------------
@@ -151,22 +155,52 @@ def test_audiogenerierung_tts_fehler(workflow, mock_session, voice_max):
     mock_session.close.assert_called_once()
 
 
-def test_podcast_loeschen_erfolgreich(workflow, mock_session):
+def test_podcast_loeschen_erfolgreich(workflow, mock_session, tmp_path, monkeypatch):
     """
-    Testet das Löschen eines Podcasts, wenn er dem Benutzer gehört.
+    Testet das Löschen eines Podcasts, wenn er dem Benutzer gehört:
+    DB-Löschung mit Besitzprüfung und Entfernen der Audiodateien im Hintergrund.
     """
+    output_dir = tmp_path / "Output"
+    output_dir.mkdir()
+    monkeypatch.setattr(audio_cleanup, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setattr(audio_cleanup, "OUTPUT_DIR", str(output_dir))
+    mp3 = output_dir / "podcast_google_1.mp3"
+    kopie = output_dir / audio_cleanup.download_copy_name("Mein Thema", date.today())
+    mp3.write_bytes(b"mp3")
+    kopie.write_bytes(b"mp3")
+
     podcast_repo = MagicMock()
-    p = MagicMock()
-    p.podcastId = 1
-    podcast_repo.get_by_user_id.return_value = [p]
+    podcast_repo.delete_owned.return_value = MagicMock(
+        dateipfadAudio="Output/podcast_google_1.mp3",
+        titel="Mein Thema",
+        erstelldatum=date.today(),
+    )
 
     with patch.object(workflow_module, "PodcastRepo", return_value=podcast_repo):
         ok = workflow.delete_podcast(podcast_id=1, user_id=1)
+    audio_cleanup.wait_for_removals()
 
     assert ok is True
-    podcast_repo.delete_by_id.assert_called_once_with(1)
+    podcast_repo.delete_owned.assert_called_once_with(1, 1)
     mock_session.commit.assert_called_once()
     mock_session.close.assert_called_once()
+    assert not mp3.exists()
+    assert not kopie.exists()
+
+
+def test_podcast_loeschen_fremder_podcast(workflow, mock_session):
+    """
+    Gehört der Podcast einem anderen Benutzer, wird nichts gelöscht.
+    """
+    podcast_repo = MagicMock()
+    podcast_repo.delete_owned.return_value = None
+
+    with patch.object(workflow_module, "PodcastRepo", return_value=podcast_repo):
+        ok = workflow.delete_podcast(podcast_id=1, user_id=2)
+
+    assert ok is False
+    mock_session.commit.assert_not_called()
+    mock_session.close.assert_called_once()
 
 
 def test_podcast_xml_zeichen_loeschen_erfolgreich(workflow):
@@ -231,3 +265,40 @@ def test_generate_audio_passing_roles_and_stimmen_objekte(
     assert args[11] == "Co-Host"
 
     mock_session.close.assert_called_once()
+
+
+def test_podcast_anzahl_gecacht_und_nach_loeschen_invalidiert(workflow):
+    """
+    Die Podcast-Anzahl für die Limit-Prüfung wird gecacht und nach dem
+    Löschen neu gezählt.
+    """
+    podcast_repo = MagicMock()
+    podcast_repo.count_by_user_id.side_effect = [3, 2]
+    podcast_repo.delete_owned.return_value = MagicMock(dateipfadAudio="")
+
+    with patch.object(workflow_module, "PodcastRepo", return_value=podcast_repo):
+        assert workflow.count_podcasts(user_id=1) == 3
+        assert workflow.count_podcasts(user_id=1) == 3
+        assert podcast_repo.count_by_user_id.call_count == 1
+
+        workflow.delete_podcast(podcast_id=1, user_id=1)
+
+        assert workflow.count_podcasts(user_id=1) == 2
+        assert podcast_repo.count_by_user_id.call_count == 2
+
+
+def test_metadaten_mit_einem_commit_gespeichert(workflow, voice_max):
+    """
+    Textbeitrag, Auftrag und Podcast werden gemeinsam und mit genau einem
+    Commit gespeichert.
+    """
+    session = DummySession()
+
+    text, job, podcast = workflow._save_metadata(
+        session, 1, "", "Max: Hallo", "Thema", 5, "Deutsch", voice_max, None, "a.mp3"
+    )
+
+    assert session.commit_count == 1
+    assert session.added == [text, job, podcast]
+    assert podcast.konvertierungsauftrag is job
+    assert job.textbeitrag is text
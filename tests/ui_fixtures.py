@@ -46,9 +46,14 @@ class MockBackend:
         ]
         self.counter = 2
 
-    def get_podcasts(self, user_id):
+    def get_podcasts(self, user_id, before_id=None):
+        if before_id is not None:
+            return [p for p in self.podcasts if p["id"] < before_id]
         return self.podcasts
 
+    def count_podcasts(self, user_id):
+        return len(self.podcasts)
+
     def delete_podcast(self, pid, uid):
         initial_len = len(self.podcasts)
         self.podcasts = [p for p in self.podcasts if p["id"] != pid]
@@ -121,8 +126,12 @@ def mock_controller():
         "frontend.controller.process_source_input", side_effect=backend.process_source
     )
     p9 = patch("frontend.controller.delete_podcast", side_effect=backend.delete_podcast)
+    p10 = patch(
+        "frontend.controller.count_podcasts_for_user",
+        side_effect=backend.count_podcasts,
+    )
 
-    with p1, p2, p3, p4, p5, p6, p7, p8, p9:
+    with p1, p2, p3, p4, p5, p6, p7, p8, p9, p10:
         yield
 
 